@@ -1,30 +1,42 @@
 import random
 import tkinter as tk
 import ttkbootstrap as tb
-from tkinter import messagebox, ttk, simpledialog
-from datetime import datetime
-import json
+import argparse
 import os
-
-class ScrollableFrame(ttk.Frame):
-    def __init__(self, container, *args, **kwargs):
-        super().__init__(container, *args, **kwargs)
-        canvas = tk.Canvas(self)
-        scrollbar = ttk.Scrollbar(self, orient="vertical", command=canvas.yview)
-        self.scrollable_frame = ttk.Frame(canvas)
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(
-                scrollregion=canvas.bbox("all")
-            )
-        )
-        canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+import time
+from collections import deque
+from animation import Animator, lerp_color
+from dice_engine import CRIT_FAILURE, CRIT_SUCCESS, DiceEngine, is_summed
+from dice_expr import compile_expression
+from dice_prob import die_summary, roll_summary
+from dice_sim import merge_histograms, simulate_chunk, simulation_chunks, summarize
+from history_viewer import HistoryViewer
+from loop_monitor import LoopMonitor
+from roll_history import RollHistory
+from roll_log import RollLog
+from roll_stats import RollStats
+from save_scheduler import SaveScheduler
+from save_worker import SaveWorker
+from sheet_schema import SCHEMAS
+from sheet_view import SheetView
+from task_runner import TaskRunner
+from theme_cache import ThemeCache
+from character_store import (COMPACT_RECORDS, LazySheets, LazySystems, PendingChanges, ShardedCharacterStore,
+                             encode_edit, encode_rename)
+
+ROLL_LOG_TAIL = 1000  # rolagens de sessões anteriores carregadas no histórico
+ROLL_LOG_SYNC_MS = 2000
+SAVE_ERROR_POLL_MS = 250
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
 
 class DiceRollerApp:
-    def __init__(self, root):
+    def __init__(self, root, sync_save=False, save_timing=False, storage="json", debug=False,
+                 virtual_sheets=False):
+        self.startup_start = time.perf_counter()
+        self.debug = debug
+        self.virtual_sheets = virtual_sheets
         self.root = root
         self.root.title("Rolagem de Dados Avançada")
         self.root.geometry("600x900")
@@ -33,6 +45,16 @@ class DiceRollerApp:
         # Tema inicial escuro
         self.style = tb.Style("darkly")
         self.is_dark = True
+        self.themes = ThemeCache(self.style)
+        self.themes.build("darkly")
+        self.animator = Animator(self.root)
+
+        # Monitor do mainloop (F12 abre o diagnóstico); instrumenta antes de os métodos virarem command/bind
+        self.loop_monitor = LoopMonitor(self.root)
+        self.loop_monitor.instrument(self, ("roll_dice", "roll_expression", "reroll_dice", "show_history",
+                                            "clear_history", "toggle_theme", "save_character_data",
+                                            "write_character_data", "compact_character_data"))
+        self.root.bind("<F12>", self.loop_monitor.show)
 
         self.current_result = tk.StringVar()
         self.current_result.set("Selecione um dado e clique em Rolar!")
@@ -40,10 +62,47 @@ class DiceRollerApp:
         self.modifier = tk.IntVar(value=0)
         self.roll_mode = tk.StringVar(value="normal")
         self.num_dice = tk.IntVar(value=1)
-        self.history = []
+        self.history = RollHistory()
+        self.history_viewer = None
+
+        # Armazenamento: JSON (log + shards) ou SQLite opcional, importado do JSON na primeira vez
+        if storage == "sqlite":
+            from sqlite_store import SqliteCharacterStore, SqliteRollLog
+            self.roll_log = SqliteRollLog()
+            self.character_store = SqliteCharacterStore()
+        else:
+            self.roll_log = RollLog()
+            self.character_store = ShardedCharacterStore()
+
+        # Log persistente: carrega só o final das sessões anteriores
+        self.roll_stats = RollStats()
+        for result in self.roll_log.tail(ROLL_LOG_TAIL):
+            self.history.append(result)
+            self.roll_stats.add(result)
+
+        # Motor de rolagem em lote (as funções roll_d* ficam como fallback sem NumPy)
+        self.roll_functions = {
+            "d4": self.roll_d4,
+            "d6": self.roll_d6,
+            "d8": self.roll_d8,
+            "d10": self.roll_d10,
+            "d12": self.roll_d12,
+            "d20": self.roll_d20,
+            "d100": self.roll_d100,
+            "dpercent": self.roll_dpercent
+        }
+        self.engine = DiceEngine(roll_functions=self.roll_functions)
 
         # Carregar dados da ficha  
         self.load_character_data()
+        self.sheet_views = {}
+        self.pending_tabs = []  # builders de lazy_tabs ainda não montados
+        self.pending_edits = 0  # edições no diário desde a última compactação
+        self.pending_changes = PendingChanges()
+        self.save_worker = SaveWorker(self.character_store, sync=sync_save)
+        self.save_scheduler = SaveScheduler(self.root, self.write_character_data)
+        self.save_timing = save_timing
+        self.save_ui_times = deque(maxlen=1000)
         
         # --- Notebook para abas ---
         self.notebook = tb.Notebook(root)
@@ -61,7 +120,7 @@ class DiceRollerApp:
         self.theme_button = tb.Button(
             self.dice_frame,
             text="🌙 Alternar Tema",
-            bootstyle="secondary-outline",
+            style="Secondary.App.TButton",
             command=self.toggle_theme
         )
         self.theme_button.pack(pady=5)
@@ -76,6 +135,16 @@ class DiceRollerApp:
         )
         self.result_label.pack(pady=15, fill=tk.X)
 
+        # --- Probabilidade exata da rolagem configurada ---
+        prob_frame = tb.Frame(self.dice_frame)
+        prob_frame.pack(fill=tk.X)
+        tb.Label(prob_frame, text="Alvo:").pack(side="left")
+        self.target = tk.IntVar(value=10)
+        tb.Spinbox(prob_frame, from_=-999, to=9999, textvariable=self.target, width=5, bootstyle="info").pack(side="left", padx=5)
+        self.prob_text = tk.StringVar()
+        self.prob_label = tb.Label(prob_frame, textvariable=self.prob_text)
+        self.prob_label.pack(side="left", padx=5)
+
         # --- Seção de escolha do dado ---
         dice_frame = tb.Labelframe(self.dice_frame, text="Tipo de Dado", bootstyle="primary", padding=10)
         dice_frame.pack(fill=tk.X, pady=8)
@@ -104,7 +173,7 @@ class DiceRollerApp:
         self.radio_buttons = []
         for i, (text, val) in enumerate(dice_options):
             frame = left_frame if i < 4 else right_frame
-            rb = tb.Radiobutton(frame, text=text, variable=self.dice_type, value=val, bootstyle="info-round-toggle")
+            rb = tb.Radiobutton(frame, text=text, variable=self.dice_type, value=val, style="Dice.App.Toggle")
             rb.pack(anchor="w", pady=2, fill=tk.X)
             self.radio_buttons.append(rb)
 
@@ -112,8 +181,8 @@ class DiceRollerApp:
         quantity_frame = tb.Labelframe(self.dice_frame, text="Quantidade de Dados", bootstyle="primary", padding=10)
         quantity_frame.pack(fill=tk.X, pady=8)
 
-        tb.Label(quantity_frame, text="Número de dados (1-8):").pack(side="left")
-        self.dice_quantity = tb.Spinbox(quantity_frame, from_=1, to=8, textvariable=self.num_dice, width=5, bootstyle="success")
+        tb.Label(quantity_frame, text="Número de dados (1-1000):").pack(side="left")
+        self.dice_quantity = tb.Spinbox(quantity_frame, from_=1, to=1000, textvariable=self.num_dice, width=5, bootstyle="success")
         self.dice_quantity.pack(side="left", padx=8)
 
         # --- Modo de rolagem ---
@@ -125,7 +194,7 @@ class DiceRollerApp:
         mode_btn_frame.pack(fill=tk.X)
         
         for text, val in [("Normal", "normal"), ("Vantagem", "vantagem"), ("Desvantagem", "desvantagem")]:
-            rb = tb.Radiobutton(mode_btn_frame, text=text, variable=self.roll_mode, value=val, bootstyle="info-round-toggle")
+            rb = tb.Radiobutton(mode_btn_frame, text=text, variable=self.roll_mode, value=val, style="Dice.App.Toggle")
             rb.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=2)
             self.mode_buttons.append(rb)
 
@@ -137,110 +206,338 @@ class DiceRollerApp:
         self.modifier_spinbox = tb.Spinbox(modifier_frame, from_=-10, to=10, textvariable=self.modifier, width=5, bootstyle="warning")
         self.modifier_spinbox.pack(side="left", padx=8)
 
+        # --- Expressão de dados ---
+        expression_frame = tb.Labelframe(self.dice_frame, text="Expressão (ex.: 4d6kh3+2, 2d20kl1, 3d8+1d6-2)", bootstyle="primary", padding=10)
+        expression_frame.pack(fill=tk.X, pady=8)
+
+        self.expression = tk.StringVar()
+        expression_entry = tb.Entry(expression_frame, textvariable=self.expression)
+        expression_entry.pack(side="left", fill=tk.X, expand=True)
+        expression_entry.bind("<Return>", lambda e: self.roll_expression())
+        self.expression_button = tb.Button(expression_frame, text="🎲 Rolar Expressão", style="Success.App.TButton", command=self.roll_expression)
+        self.expression_button.pack(side="left", padx=8)
+
         # --- Botões principais ---
         button_frame = tb.Frame(self.dice_frame)
         button_frame.pack(pady=20, fill=tk.X)
 
-        self.roll_button = tb.Button(button_frame, text="🎲 Rolar", bootstyle="success-outline", command=self.roll_dice, width=10)
+        self.roll_button = tb.Button(button_frame, text="🎲 Rolar", style="Success.App.TButton", command=self.roll_dice, width=10)
         self.roll_button.pack(side=tk.LEFT, padx=5, expand=True)
 
-        self.reroll_button = tb.Button(button_frame, text="🔄 Rerolar (Desvantagem)", bootstyle="info-outline", command=self.reroll_dice, state="disabled")
+        self.reroll_button = tb.Button(button_frame, text="🔄 Rerolar (Desvantagem)", style="Info.App.TButton", command=self.reroll_dice, state="disabled")
         self.reroll_button.pack(side=tk.LEFT, padx=5, expand=True)
 
-        self.reset_button = tb.Button(button_frame, text="⏹ Resetar", bootstyle="danger-outline", command=self.reset_dice, width=10)
+        self.reset_button = tb.Button(button_frame, text="⏹ Resetar", style="Danger.App.TButton", command=self.reset_dice, width=10)
         self.reset_button.pack(side=tk.LEFT, padx=5, expand=True)
 
         # --- Histórico ---
         secondary_button_frame = tb.Frame(self.dice_frame)
         secondary_button_frame.pack(pady=10, fill=tk.X)
 
-        self.history_button = tb.Button(secondary_button_frame, text="📜 Histórico", bootstyle="secondary-outline", command=self.show_history)
+        self.history_button = tb.Button(secondary_button_frame, text="📜 Histórico", style="Secondary.App.TButton", command=self.show_history)
         self.history_button.pack(side=tk.LEFT, padx=5, expand=True)
 
-        self.clear_history_button = tb.Button(secondary_button_frame, text="🗑 Limpar Histórico", bootstyle="danger-outline", command=self.clear_history)
+        self.clear_history_button = tb.Button(secondary_button_frame, text="🗑 Limpar Histórico", style="Danger.App.TButton", command=self.clear_history)
         self.clear_history_button.pack(side=tk.LEFT, padx=5, expand=True)
 
-
-
-        # --- Conteúdo da aba de ficha ---
-        self.setup_character_tab()
+        # --- Estatísticas do dado/modo selecionado ---
+        stats_frame = tb.Labelframe(self.dice_frame, text="Estatísticas", bootstyle="primary", padding=10)
+        stats_frame.pack(fill=tk.X, pady=8)
+        self.stats_text = tk.StringVar()
+        tb.Label(stats_frame, textvariable=self.stats_text, wraplength=500).pack(anchor="w")
+        self.stats_histogram = tk.StringVar()
+        tb.Label(stats_frame, textvariable=self.stats_histogram, wraplength=500, font=("Courier", 9)).pack(anchor="w")
+        self.keep_stats = tk.BooleanVar(value=True)
+        tb.Checkbutton(stats_frame, text="Manter estatísticas ao limpar o histórico", variable=self.keep_stats,
+                       bootstyle="info-round-toggle").pack(anchor="w", pady=(5, 0))
+
+        # --- Simulação da rolagem configurada (fora da thread da interface) ---
+        sim_frame = tb.Labelframe(self.dice_frame, text="Simulação", bootstyle="primary", padding=10)
+        sim_frame.pack(fill=tk.X, pady=8)
+        sim_controls = tb.Frame(sim_frame)
+        sim_controls.pack(fill=tk.X)
+        tb.Label(sim_controls, text="Rolagens:").pack(side="left")
+        self.sim_rolls = tk.IntVar(value=1_000_000)
+        tb.Spinbox(sim_controls, from_=1000, to=1_000_000_000, increment=1_000_000, textvariable=self.sim_rolls,
+                   width=11, bootstyle="info").pack(side="left", padx=5)
+        self.sim_button = tb.Button(sim_controls, text="Simular", style="Success.App.TButton", command=self.run_simulation)
+        self.sim_button.pack(side="left", padx=5)
+        self.sim_cancel_button = tb.Button(sim_controls, text="Cancelar", style="Danger.App.TButton",
+                                           command=self.cancel_simulation, state="disabled")
+        self.sim_cancel_button.pack(side="left", padx=5)
+        self.sim_progress = tb.Progressbar(sim_frame, bootstyle="info-striped", maximum=1)
+        self.sim_progress.pack(fill=tk.X, pady=5)
+        self.sim_text = tk.StringVar()
+        tb.Label(sim_frame, textvariable=self.sim_text, wraplength=500).pack(anchor="w")
+        self.tasks = TaskRunner(self.root)
+        self.simulation = None
+        self.sim_start = 0.0
+
+        for var in (self.dice_type, self.num_dice, self.roll_mode, self.modifier, self.target):
+            var.trace_add("write", lambda *args: self.update_probability())
+        self.update_probability()
+        for var in (self.dice_type, self.roll_mode):
+            var.trace_add("write", lambda *args: self.update_stats_panel())
+        self.update_stats_panel()
+
+        # --- Conteúdo da aba de ficha (montado só quando a aba é aberta) ---
+        self.lazy_tabs(self.notebook, {self.character_frame: self.setup_character_tab})
+        if self.debug:
+            self.root.after_idle(self.report_startup)
+        self.root.after_idle(self.themes.prebuild)  # o tema claro é montado depois de a janela aparecer
+
+        self.root.after(ROLL_LOG_SYNC_MS, self.sync_roll_log)
+        self.root.after(SAVE_ERROR_POLL_MS, self.poll_save_errors)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def sync_roll_log(self):
+        """fsync periódico do log, para não deixar rolagens só no buffer"""
+        self.roll_log.sync()
+        self.root.after(ROLL_LOG_SYNC_MS, self.sync_roll_log)
+
+    def on_close(self):
+        self.save_scheduler.flush()
+        if self.pending_changes:
+            self.compact_character_data()
+        self.tasks.shutdown()
+        self.save_worker.close()
+        if self.save_timing:
+            print(self.save_timing_report())
+        self.roll_log.close()
+        self.root.destroy()
 
     def load_character_data(self):
-        """Carrega dados das fichas de personagem de um arquivo JSON único"""
+        """
+        Prepara o acesso às fichas, reaplicando o diário que sobrou de uma
+        queda. Cada sistema só é lido quando sua aba ou combobox é usada.
+        """
         try:
-            if os.path.exists("character_data.json"):
-                with open("character_data.json", "r") as f:
-                    data = json.load(f)
-                self.demi_data = data.get('demi', {})
-                self.nahobino_data = data.get('nahobino', {})
-                self.samurai_data = data.get('samurai', {})
-                self.persona_user_data = data.get('persona_user', {})
-                self.cyberpunk_data = data.get('cyberpunk', {})
-                self.warhammer_data = data.get('warhammer', {})
-            else:
-                self.demi_data = {}
-                self.nahobino_data = {}
-                self.samurai_data = {}
-                self.cyberpunk_data = {}
-                self.warhammer_data = {}
+            self.character_data = self.character_store.load()
         except Exception as e:
             print(f"Erro ao carregar dados: {e}")
-            self.demi_data = {}
-            self.nahobino_data = {}
-            self.samurai_data = {}
-            self.cyberpunk_data = {}
-            self.warhammer_data = {}
-
-    def save_character_data(self):
-        """Salva dados das fichas de personagem em um arquivo JSON único"""
+            self.character_data = LazySystems(lambda system: LazySheets(None))
+
+    def save_character_data(self, system, name, *fields):
+        """
+        Registra no diário o valor atual da ficha `name` (ou só de `fields`,
+        ex.: 'attributes', 'dex'); se a ficha não existe mais, registra a
+        remoção. Na compactação só os shards das fichas tocadas são gravados.
+        """
+        start = time.perf_counter()
+        path = (system, name) + fields
+        node = self.character_data[system]
         try:
-            data = {
-                'demi': self.demi_data,
-                'nahobino': self.nahobino_data,
-                'samurai': self.samurai_data,
-                'persona_user': self.persona_user_data,
-                'cyberpunk': self.cyberpunk_data,
-                'warhammer': self.warhammer_data
-            }
-            with open("character_data.json", "w") as f:
-                json.dump(data, f)
-        except Exception as e:
+            for key in path[1:]:
+                node = node[key]
+        except KeyError:
+            line = encode_edit(path, delete=True)
+        else:
+            line = encode_edit(path, node)
+        self.save_worker.submit_edit(line)
+        self.pending_edits += 1
+        self.pending_changes.touch(system, name)
+        self.save_scheduler.mark_dirty(system)
+        self.save_ui_times.append(time.perf_counter() - start)
+
+    def rename_character_data(self, system, old_name, new_name):
+        """Renomear só atualiza o índice; o shard da ficha não é reescrito"""
+        self.save_worker.submit_edit(encode_rename(system, old_name, new_name))
+        self.pending_edits += 1
+        self.pending_changes.rename(system, old_name, new_name)
+        self.save_scheduler.mark_dirty(system)
+
+    def write_character_data(self, dirty_systems):
+        """Chamado pelo SaveScheduler depois de uma rajada: compacta o diário se ele já cresceu"""
+        if self.pending_edits >= COMPACT_RECORDS:
+            self.compact_character_data()
+
+    def compact_character_data(self):
+        """Envia um snapshot das fichas alteradas para a thread de gravação, que reescreve os shards e zera o diário"""
+        self.save_worker.submit(self.pending_changes.collect(self.character_data))
+        self.pending_edits = 0
+
+    def poll_save_errors(self):
+        """Mostra na UI os erros que a thread de gravação reportou"""
+        for e in self.save_worker.poll_errors():
+            from tkinter import messagebox  # só carregado no primeiro diálogo
             messagebox.showerror("Erro", f"Erro ao salvar dados: {e}")
+        self.root.after(SAVE_ERROR_POLL_MS, self.poll_save_errors)
+
+    def save_timing_report(self):
+        times = self.save_ui_times
+        if not times:
+            return "Nenhuma edição de ficha nesta sessão"
+        mode = "síncrono" if self.save_worker.sync else "thread"
+        return (f"Tempo de UI por edição ({mode}): {len(times)} edições, "
+                f"média {sum(times) / len(times) * 1000:.2f} ms, máx {max(times) * 1000:.2f} ms")
+
+    def update_probability(self):
+        """Mostra média, desvio padrão e P(≥ alvo) do total da rolagem configurada"""
+        try:
+            dice = self.dice_type.get()
+            quantity = self.num_dice.get()
+            mode = self.roll_mode.get()
+            modifier = self.modifier.get()
+            target = self.target.get()
+        except tk.TclError:
+            return  # Spinbox vazio ou com texto inválido durante a digitação
+        if quantity < 1:
+            return
+        if not is_summed(dice, quantity):
+            # Cada dado aparece com o modificador: a distribuição é a de um dado
+            mean, stddev, each, any_die = die_summary(dice, quantity, mode, modifier, target)
+            text = f"Por dado: Média {mean:.2f} | Desvio {stddev:.2f} | P(≥ {target}) = {each * 100:.2f}%"
+            if quantity > 1:
+                text += f" | P(algum ≥ {target}) = {any_die * 100:.2f}%"
+            self.prob_text.set(text)
+            return
+        # Exata até EXACT_MAX_DICE dados; acima, aproximação normal (≈), que não trava a interface
+        mean, stddev, at_least, exact = roll_summary(dice, quantity, mode, modifier, target)
+        approx = "" if exact else "≈ "
+        self.prob_text.set(
+            f"Média {approx}{mean:.2f} | Desvio {approx}{stddev:.2f} | "
+            f"P(≥ {target}) {approx or '= '}{at_least * 100:.2f}%"
+        )
+
+    def run_simulation(self):
+        """
+        Monte Carlo da rolagem configurada em todos os núcleos: cada chunk
+        roda num processo com a sua semente e devolve só um histograma.
+        """
+        try:
+            dice = self.dice_type.get()
+            quantity = self.num_dice.get()
+            mode = self.roll_mode.get()
+            modifier = self.modifier.get()
+            rolls = self.sim_rolls.get()
+        except tk.TclError:
+            return
+        if quantity < 1 or rolls < 1:
+            return
+        self.cancel_simulation()
+        workers = os.cpu_count() or 1
+        chunks = simulation_chunks(dice, quantity, mode, modifier, rolls, workers)
+        self.sim_progress.configure(value=0, maximum=len(chunks))
+        self.sim_text.set(f"Simulando {rolls:,} rolagens em {workers} processos...".replace(",", "."))
+        self.sim_cancel_button.configure(state="normal")
+        self.sim_start = time.perf_counter()
+        self.sim_config = (dice, quantity)
+        self.simulation = self.tasks.map_chunks(
+            simulate_chunk, chunks, merge_histograms, kind="process",
+            on_result=self.show_simulation,
+            on_error=self.simulation_failed,
+            on_progress=lambda done, total: self.sim_progress.configure(value=done)
+        )
+
+    def cancel_simulation(self):
+        if self.simulation is not None:
+            self.simulation.cancel()
+            self.simulation = None
+            self.sim_text.set("Simulação cancelada.")
+        self.sim_cancel_button.configure(state="disabled")
+
+    def show_simulation(self, histogram):
+        self.simulation = None
+        self.sim_cancel_button.configure(state="disabled")
+        try:
+            target = self.target.get()
+        except tk.TclError:
+            target = 0
+        samples, mean, stddev, at_least = summarize(histogram, target)
+        elapsed = time.perf_counter() - self.sim_start
+        # Sem soma, o histograma tem uma amostra por dado (ver simulate_chunk)
+        summed = is_summed(*self.sim_config)
+        rolls = samples if summed else samples // self.sim_config[1]
+        per_die = "" if summed else " (por dado)"
+        self.sim_text.set(f"{rolls:,} rolagens em {elapsed:.2f} s{per_die}: média {mean:.2f} | desvio {stddev:.2f} | "
+                          f"P(≥ {target}) = {at_least * 100:.2f}%".replace(",", "."))
+
+    def simulation_failed(self, error):
+        self.simulation = None
+        self.sim_cancel_button.configure(state="disabled")
+        self.sim_text.set(f"Erro na simulação: {error}")
+
+    def update_stats_panel(self):
+        dice = self.dice_type.get()
+        mode = self.roll_mode.get()
+        self.stats_text.set(self.roll_stats.summary(dice, mode))
+        self.stats_histogram.set(self.roll_stats.histogram_text(dice, mode))
 
     def toggle_theme(self):
-        """Alterna entre 'darkly' e 'flatly' e ajusta estilos dos widgets."""
-        if self.is_dark:
-            self.style.theme_use("flatly")
-            self.is_dark = False
-            self.result_label.configure(foreground="black")
-            for rb in self.radio_buttons + self.mode_buttons:
-                self.smooth_transition(rb, "dark-round-toggle")
-            self.roll_button.configure(bootstyle="success")
-            self.reroll_button.configure(bootstyle="info")
-            self.reset_button.configure(bootstyle="danger")
-            self.history_button.configure(bootstyle="secondary")
-            self.clear_history_button.configure(bootstyle="danger")
-            self.theme_button.configure(text="🌞 Alternar Tema", bootstyle="secondary")
-        else:
-            self.style.theme_use("darkly")
-            self.is_dark = True
-            self.result_label.configure(foreground="white")
-            for rb in self.radio_buttons + self.mode_buttons:
-                self.smooth_transition(rb, "info-round-toggle")
-            self.roll_button.configure(bootstyle="success-outline")
-            self.reroll_button.configure(bootstyle="info-outline")
-            self.reset_button.configure(bootstyle="danger-outline")
-            self.history_button.configure(bootstyle="secondary-outline")
-            self.clear_history_button.configure(bootstyle="danger-outline")
-            self.theme_button.configure(text="🌙 Alternar Tema", bootstyle="secondary-outline")
-
-    def smooth_transition(self, widget, new_style, steps=8, delay=18):
-        def step(count=0):
-            if count >= steps:
-                widget.configure(bootstyle=new_style)
+        """Alterna entre 'darkly' e 'flatly': com os estilos já montados é um theme_use só."""
+        start = time.perf_counter()
+        old_fg = self.style.colors.fg
+        old_result_fg = "#ffffff" if self.is_dark else "#000000"
+        self.is_dark = not self.is_dark
+        self.themes.use("darkly" if self.is_dark else "flatly")
+        self.theme_button.configure(text="🌙 Alternar Tema" if self.is_dark else "🌞 Alternar Tema")
+        self.fade_colors(old_fg, old_result_fg)
+        if self.debug:
+            print(f"Troca de tema: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    def fade_colors(self, old_fg, old_result_fg, duration=0.15):
+        """
+        Transição de cor do texto depois da troca de tema. Todos os toggles
+        usam o mesmo estilo ttk, então cada quadro é um style.configure, não
+        um configure por widget.
+        """
+        new_fg = self.style.colors.fg
+        new_result_fg = "#ffffff" if self.is_dark else "#000000"
+        self.animator.animate(
+            "toggle_foreground", duration,
+            lambda t: self.style.configure("Dice.App.Toggle", foreground=lerp_color(old_fg, new_fg, t))
+        )
+        self.animator.animate(
+            "result_label", duration,
+            lambda t: self.result_label.configure(foreground=lerp_color(old_result_fg, new_result_fg, t))
+        )
+
+    def benchmark_theme(self, count):
+        """Alterna o tema `count` vezes (incluindo o redesenho) e mostra a latência"""
+        times = []
+        for _ in range(count):
+            start = time.perf_counter()
+            self.toggle_theme()
+            self.root.update_idletasks()
+            times.append((time.perf_counter() - start) * 1000)
+        times.sort()
+        print(f"Troca de tema ({count}x): mín {times[0]:.2f} ms, mediana {times[len(times) // 2]:.2f} ms, "
+              f"máx {times[-1]:.2f} ms")
+        self.on_close()
+
+    def lazy_tabs(self, notebook, builders):
+        """
+        Monta cada aba de `builders` ({frame: função}) no primeiro
+        <<NotebookTabChanged>> que a seleciona, em vez de tudo na inicialização.
+        """
+        pending = {str(frame): builder for frame, builder in builders.items()}
+        self.pending_tabs.append(pending)
+
+        def on_tab_changed(event=None):
+            tab = notebook.select()
+            builder = pending.pop(tab, None)
+            if builder is None:
                 return
-            self.root.after(delay, lambda: step(count + 1))
-        step()
+            start = time.perf_counter()
+            before = count_widgets(self.root) if self.debug else 0
+            builder()
+            if self.debug:
+                print(f"Aba '{notebook.tab(tab, 'text')}' montada em {(time.perf_counter() - start) * 1000:.1f} ms "
+                      f"(+{count_widgets(self.root) - before} widgets)")
+
+        notebook.bind("<<NotebookTabChanged>>", on_tab_changed, add="+")
+        on_tab_changed()
+
+    def build_pending_tabs(self):
+        """Monta todas as abas que ainda não foram abertas (usado pelo --profile-startup)"""
+        while any(self.pending_tabs):
+            for pending in self.pending_tabs:
+                while pending:
+                    pending.pop(next(iter(pending)))()
+
+    def report_startup(self):
+        print(f"Inicialização: {(time.perf_counter() - self.startup_start) * 1000:.1f} ms, "
+              f"{count_widgets(self.root)} widgets")
 
     def setup_character_tab(self):
         char_notebook = tb.Notebook(self.character_frame)
@@ -259,1730 +556,102 @@ class DiceRollerApp:
         smt_frame = tb.Frame(char_notebook, padding=10)
         char_notebook.add(smt_frame, text="SMT")
 
-        self.setup_cyberpunk_tab(cyberpunk_frame)
-        self.setup_warhammer_tab(warhammer_frame)
-        self.setup_smt_tab(smt_frame)
+        self.lazy_tabs(char_notebook, {
+            cyberpunk_frame: lambda: self.setup_sheet_tab(cyberpunk_frame, 'cyberpunk'),
+            warhammer_frame: lambda: self.setup_sheet_tab(warhammer_frame, 'warhammer'),
+            smt_frame: lambda: self.setup_smt_tab(smt_frame)
+        })
 
     # --- SMT TAB ---
     def setup_smt_tab(self, parent):
         smt_notebook = tb.Notebook(parent)
         smt_notebook.pack(fill=tk.BOTH, expand=True)
 
-        demi_frame = tb.Frame(smt_notebook, padding=10)
-        nahobino_frame = tb.Frame(smt_notebook, padding=10)
-        samurai_frame = tb.Frame(smt_notebook, padding=10)
-        persona_user_frame = tb.Frame(smt_notebook, padding=10)
-
-        smt_notebook.add(demi_frame, text="Demi-fiend")
-        smt_notebook.add(nahobino_frame, text="Nahobino")
-        smt_notebook.add(samurai_frame, text="Samurai")
-        smt_notebook.add(persona_user_frame, text="Persona-User")
-
-        self.setup_demi_fiend_tab(demi_frame)
-        self.setup_nahobino_tab(nahobino_frame)
-        self.setup_samurai_tab(samurai_frame)
-        self.setup_persona_user_tab(persona_user_frame)
-
-    def setup_demi_fiend_tab(self, parent):
-        frame = ScrollableFrame(parent)
-        frame.pack(fill=tk.BOTH, expand=True)
-        sf = frame.scrollable_frame
-
-        # Initialize variables
-        self.cyberpunk_life = tk.IntVar(value=50)
-        self.cyberpunk_max_life = tk.IntVar(value=50)
-        self.cyberpunk_humanity = tk.IntVar(value=100)
-        self.cyberpunk_money = tk.IntVar(value=1000)
-        self.cyberpunk_level = tk.IntVar(value=1)
-
-        # Initialize attributes first
-        self.demi_pv = tk.IntVar(value=100)
-        self.demi_pm = tk.IntVar(value=50)
-        self.demi_level = tk.IntVar(value=1)
-        self.demi_attrs = {}
-        for name in ["Força", "Vitalidade", "Magia", "Agilidade", "Sorte"]:
-            self.demi_attrs[name] = tk.IntVar(value=10)
-        self.magatamas = []
-        self.magatama_var = tk.StringVar()
-        self.demi_skills_listbox = tk.Listbox()
-        self.demi_passive_listbox = tk.Listbox()
-        self.demi_inventory_listbox = tk.Listbox()
-        self.demi_key_listbox = tk.Listbox()
-
-        # Combobox para seleção de ficha
-        tb.Label(sf, text="Ficha atual:").pack()
-        self.demi_chars_var = tk.StringVar()
-        self.demi_chars_combo = ttk.Combobox(sf, textvariable=self.demi_chars_var, state="readonly")
-        self.demi_chars_combo.pack()
-        self.demi_chars_combo.bind("<<ComboboxSelected>>", self.load_demi_character)
-
-        tb.Button(sf, text="Nova Ficha", command=self.new_demi_character, bootstyle="success-outline").pack(pady=2)
-
-        # Magatamas
-        magatama_frame = tb.Labelframe(sf, text="Magatamas", bootstyle="warning")
-        magatama_frame.pack(fill=tk.X, pady=5)
-        tb.Label(magatama_frame, text="Equipada:").pack(side=tk.LEFT)
-        self.magatama_combo = ttk.Combobox(magatama_frame, textvariable=self.magatama_var, values=self.magatamas, state="readonly", width=20)
-        self.magatama_combo.pack(side=tk.LEFT, padx=5)
-        self.magatama_combo.bind("<<ComboboxSelected>>", lambda e: self.save_current_demi())
-        magatama_entry = tb.Entry(magatama_frame, width=18)
-        magatama_entry.pack(side=tk.LEFT, padx=5)
-        tb.Button(magatama_frame, text="Adicionar", bootstyle="success-outline",
-                  command=lambda: self.add_magatama(magatama_entry)).pack(side=tk.LEFT, padx=5)
-        tb.Button(magatama_frame, text="Remover", bootstyle="danger-outline",
-                  command=self.remove_magatama).pack(side=tk.LEFT, padx=5)
-
-        # PV/PM
-        pv_pm_frame = tb.Labelframe(sf, text="PV / PM", bootstyle="danger")
-        pv_pm_frame.pack(fill=tk.X, pady=5)
-        tb.Label(pv_pm_frame, text="PV:").pack(side=tk.LEFT)
-        tb.Spinbox(pv_pm_frame, from_=0, to=999, textvariable=self.demi_pv, width=6,
-                   command=lambda: self.save_current_demi()).pack(side=tk.LEFT, padx=5)
-        tb.Label(pv_pm_frame, text="PM:").pack(side=tk.LEFT)
-        tb.Spinbox(pv_pm_frame, from_=0, to=999, textvariable=self.demi_pm, width=6,
-                   command=lambda: self.save_current_demi()).pack(side=tk.LEFT, padx=5)
-        tb.Label(pv_pm_frame, text="Level:").pack(side=tk.LEFT)
-        tb.Spinbox(pv_pm_frame, from_=1, to=99, textvariable=self.demi_level, width=4,
-                   command=lambda: self.save_current_demi()).pack(side=tk.LEFT, padx=5)
-
-        # Atributos
-        attr_frame = tb.Labelframe(sf, text="Atributos", bootstyle="info")
-        attr_frame.pack(fill=tk.X, pady=5)
-        for name in ["Força", "Vitalidade", "Magia", "Agilidade", "Sorte"]:
-            tb.Label(attr_frame, text=f"{name}:").pack(side=tk.LEFT, padx=2)
-            tb.Spinbox(attr_frame, from_=1, to=99, textvariable=self.demi_attrs[name], width=4,
-                       command=lambda n=name, v=self.demi_attrs[name]: self.update_demi_attribute(n, v.get())).pack(side=tk.LEFT, padx=2)
-
-        # Skills
-        skills_frame = tb.Labelframe(sf, text="Skills", bootstyle="primary")
-        skills_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        self.demi_skills_listbox = tk.Listbox(skills_frame, height=6)
-        self.demi_skills_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        controls_frame = tb.Frame(skills_frame)
-        controls_frame.pack(side=tk.LEFT, fill=tk.Y, padx=5)
-        skill_entry = tb.Entry(controls_frame, width=18)
-        skill_entry.pack(fill=tk.X, pady=2)
-        tb.Button(controls_frame, text="Adicionar", bootstyle="success-outline",
-                  command=lambda: self.add_demi_skill(skill_entry)).pack(fill=tk.X, pady=2)
-        tb.Button(controls_frame, text="Remover", bootstyle="danger-outline",
-                  command=self.remove_demi_skill).pack(fill=tk.X, pady=2)
-
-        # Habilidades Passivas
-        passive_frame = tb.Labelframe(sf, text="Habilidades Passivas", bootstyle="info")
-        passive_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        self.demi_passive_listbox = tk.Listbox(passive_frame, height=6)
-        self.demi_passive_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        controls_frame = tb.Frame(passive_frame)
-        controls_frame.pack(side=tk.LEFT, fill=tk.Y, padx=5)
-        passive_entry = tb.Entry(controls_frame, width=18)
-        passive_entry.pack(fill=tk.X, pady=2)
-        tb.Button(controls_frame, text="Adicionar", bootstyle="success-outline",
-                  command=lambda: self.add_demi_passive(passive_entry)).pack(fill=tk.X, pady=2)
-        tb.Button(controls_frame, text="Remover", bootstyle="danger-outline",
-                  command=self.remove_demi_passive).pack(fill=tk.X, pady=2)
-
-        # Inventário
-        inv_frame = tb.Labelframe(sf, text="Inventário", bootstyle="success")
-        inv_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        self.demi_inventory_listbox = tk.Listbox(inv_frame, height=6)
-        self.demi_inventory_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        controls_frame = tb.Frame(inv_frame)
-        controls_frame.pack(side=tk.LEFT, fill=tk.Y, padx=5)
-        inv_entry = tb.Entry(controls_frame, width=18)
-        inv_entry.pack(fill=tk.X, pady=2)
-        tb.Button(controls_frame, text="Adicionar", bootstyle="success-outline",
-                  command=lambda: self.add_demi_item(inv_entry)).pack(fill=tk.X, pady=2)
-        tb.Button(controls_frame, text="Remover", bootstyle="danger-outline",
-                  command=self.remove_demi_item).pack(fill=tk.X, pady=2)
-
-        # Itens chave
-        key_frame = tb.Labelframe(sf, text="Itens Chave", bootstyle="warning")
-        key_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        self.demi_key_listbox = tk.Listbox(key_frame, height=6)
-        self.demi_key_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        key_entry = tb.Entry(key_frame, width=18)
-        key_entry.pack(side=tk.LEFT, padx=5)
-        tb.Button(key_frame, text="Adicionar", bootstyle="success-outline",
-                  command=lambda: self.add_demi_key_item(key_entry)).pack(side=tk.LEFT, padx=5)
-        tb.Button(key_frame, text="Remover", bootstyle="danger-outline",
-                  command=self.remove_demi_key_item).pack(side=tk.LEFT, padx=5)
-        self.update_demi_chars_list()
-
-    def update_demi_chars_list(self):
-        self.demi_chars_combo['values'] = list(self.demi_data.keys())
-        if self.demi_chars_combo['values']:
-            self.demi_chars_combo.current(0)
-            self.load_demi_character()
-
-    def new_demi_character(self):
-        name = simpledialog.askstring("Nova Ficha Demi-fiend", "Nome da nova ficha:")
-        if name and name.strip():
-            if name in self.demi_data:
-                messagebox.showerror("Erro", "Já existe uma ficha com este nome!")
-                return
-            self.demi_data[name] = {
-                'pv': 100,
-                'pm': 50,
-                'level': 1,
-                'attributes': {k: 10 for k in ["Força", "Vitalidade", "Magia", "Agilidade", "Sorte"]},
-                'magatamas': [],
-                'magatama_equipped': "",
-                'skills': [],
-                'passives': [],
-                'inventory': [],
-                'key_items': []
-            }
-            self.save_character_data()
-            self.update_demi_chars_list()
-            self.demi_chars_combo.set(name)
-            self.load_demi_character()
-            messagebox.showinfo("Sucesso", f"Ficha '{name}' criada e salva!")
-
-    def load_demi_character(self, event=None):
-        name = self.demi_chars_combo.get()
-        if name in self.demi_data:
-            data = self.demi_data[name]
-            self.demi_pv.set(data['pv'])
-            self.demi_pm.set(data['pm'])
-            self.demi_level.set(data.get('level', 1))
-
-            for attr in self.demi_attrs:
-                self.demi_attrs[attr].set(data['attributes'].get(attr, 10))
-
-            self.magatamas = data['magatamas']
-            self.magatama_combo['values'] = self.magatamas
-            self.magatama_var.set(data['magatama_equipped'])
-
-            self.demi_skills_listbox.delete(0, tk.END)
-            for skill in data['skills']:
-                self.demi_skills_listbox.insert(tk.END, skill)
-
-            self.demi_passive_listbox.delete(0, tk.END)
-            for passive in data['passives']:
-                self.demi_passive_listbox.insert(tk.END, passive)
-
-            self.demi_inventory_listbox.delete(0, tk.END)
-            for item in data['inventory']:
-                self.demi_inventory_listbox.insert(tk.END, item)
-
-            self.demi_key_listbox.delete(0, tk.END)
-            for key_item in data['key_items']:
-                self.demi_key_listbox.insert(tk.END, key_item)
-
-    def save_current_demi(self):
-        name = self.demi_chars_combo.get()
-        if name in self.demi_data:
-            self.demi_data[name]['pv'] = self.demi_pv.get()
-            self.demi_data[name]['pm'] = self.demi_pm.get()
-            self.demi_data[name]['level'] = self.demi_level.get()
-            self.demi_data[name]['attributes'] = {attr: self.demi_attrs[attr].get() for attr in self.demi_attrs}
-            self.demi_data[name]['magatamas'] = self.magatamas
-            self.demi_data[name]['magatama_equipped'] = self.magatama_var.get()
-            self.demi_data[name]['skills'] = list(self.demi_skills_listbox.get(0, tk.END))
-            self.demi_data[name]['passives'] = list(self.demi_passive_listbox.get(0, tk.END))
-            self.demi_data[name]['inventory'] = list(self.demi_inventory_listbox.get(0, tk.END))
-            self.demi_data[name]['key_items'] = list(self.demi_key_listbox.get(0, tk.END))
-            self.save_character_data()
-
-    def update_demi_attribute(self, attr, value):
-        name = self.demi_chars_combo.get()
-        if name in self.demi_data:
-            self.demi_data[name]['attributes'][attr] = value
-            self.save_character_data()
-
-    def add_magatama(self, entry):
-        name = entry.get().strip()
-        if name and name not in self.magatamas:
-            self.magatamas.append(name)
-            self.magatama_combo['values'] = self.magatamas
-            entry.delete(0, tk.END)
-            self.save_current_demi()
-
-    def add_demi_skill(self, entry):
-        skill = entry.get().strip()
-        if skill:
-            self.demi_skills_listbox.insert(tk.END, skill)
-            entry.delete(0, tk.END)
-            self.save_current_demi()
-
-    def add_demi_passive(self, entry):
-        passive = entry.get().strip()
-        if passive:
-            self.demi_passive_listbox.insert(tk.END, passive)
-            entry.delete(0, tk.END)
-            self.save_current_demi()
-
-    def add_demi_item(self, entry):
-        item = entry.get().strip()
-        if item:
-            self.demi_inventory_listbox.insert(tk.END, item)
-            entry.delete(0, tk.END)
-            self.save_current_demi()
-
-    def add_demi_key_item(self, entry):
-        key_item = entry.get().strip()
-        if key_item:
-            self.demi_key_listbox.insert(tk.END, key_item)
-            entry.delete(0, tk.END)
-            self.save_current_demi()
-
-    def remove_demi_skill(self):
-        selection = self.demi_skills_listbox.curselection()
-        if selection:
-            self.demi_skills_listbox.delete(selection[0])
-            self.save_current_demi()
-
-    def remove_demi_passive(self):
-        selection = self.demi_passive_listbox.curselection()
-        if selection:
-            self.demi_passive_listbox.delete(selection[0])
-            self.save_current_demi()
-
-    def remove_demi_item(self):
-        selection = self.demi_inventory_listbox.curselection()
-        if selection:
-            self.demi_inventory_listbox.delete(selection[0])
-            self.save_current_demi()
-
-    def remove_demi_key_item(self):
-        selection = self.demi_key_listbox.curselection()
-        if selection:
-            self.demi_key_listbox.delete(selection[0])
-            self.save_current_demi()
-
-    def remove_magatama(self):
-        selected = self.magatama_var.get()
-        if selected and selected in self.magatamas:
-            self.magatamas.remove(selected)
-            self.magatama_combo['values'] = self.magatamas
-            if self.magatamas:
-                self.magatama_var.set(self.magatamas[0])
-            else:
-                self.magatama_var.set("")
-            self.save_current_demi()
-
-    def setup_nahobino_tab(self, parent):
-        frame = ScrollableFrame(parent)
-        frame.pack(fill=tk.BOTH, expand=True)
-        sf = frame.scrollable_frame
-
-        tb.Label(sf, text="Ficha atual:").pack()
-        self.nahobino_chars_var = tk.StringVar()
-        self.nahobino_chars_combo = ttk.Combobox(sf, textvariable=self.nahobino_chars_var, state="readonly")
-        self.nahobino_chars_combo.pack()
-        self.nahobino_chars_combo.bind("<<ComboboxSelected>>", self.load_nahobino_character)
-
-        # Initialize attributes first
-        self.nahobino_pv = tk.IntVar(value=100)
-        self.nahobino_pm = tk.IntVar(value=50)
-        self.nahobino_level = tk.IntVar(value=1)
-        self.nahobino_attrs = {}
-        for name in ["Força", "Vitalidade", "Magia", "Agilidade", "Sorte"]:
-            self.nahobino_attrs[name] = tk.IntVar(value=10)
-        self.nahobino_essences = []
-        self.nahobino_essence_var = tk.StringVar()
-        self.nahobino_skills_listbox = tk.Listbox()
-        self.nahobino_passive_listbox = tk.Listbox()
-        self.nahobino_inventory_listbox = tk.Listbox()
-        self.nahobino_key_listbox = tk.Listbox()
-
-        tb.Button(sf, text="Nova Ficha", command=self.new_nahobino_character, bootstyle="success-outline").pack(pady=2)
-
-        pv_pm_frame = tb.Labelframe(sf, text="PV / PM", bootstyle="danger")
-        pv_pm_frame.pack(fill=tk.X, pady=5)
-        tb.Label(pv_pm_frame, text="PV:").pack(side=tk.LEFT)
-        tb.Spinbox(pv_pm_frame, from_=0, to=999, textvariable=self.nahobino_pv, width=6,
-                   command=lambda: self.save_current_nahobino()).pack(side=tk.LEFT, padx=5)
-        tb.Label(pv_pm_frame, text="PM:").pack(side=tk.LEFT)
-        tb.Spinbox(pv_pm_frame, from_=0, to=999, textvariable=self.nahobino_pm, width=6,
-                   command=lambda: self.save_current_nahobino()).pack(side=tk.LEFT, padx=5)
-        tb.Label(pv_pm_frame, text="Level:").pack(side=tk.LEFT)
-        tb.Spinbox(pv_pm_frame, from_=1, to=99, textvariable=self.nahobino_level, width=4,
-                   command=lambda: self.save_current_nahobino()).pack(side=tk.LEFT, padx=5)
-
-        attr_frame = tb.Labelframe(sf, text="Atributos", bootstyle="info")
-        attr_frame.pack(fill=tk.X, pady=5)
-        for name in ["Força", "Vitalidade", "Magia", "Agilidade", "Sorte"]:
-            tb.Label(attr_frame, text=f"{name}:").pack(side=tk.LEFT, padx=2)
-            tb.Spinbox(attr_frame, from_=1, to=99, textvariable=self.nahobino_attrs[name], width=4,
-                       command=lambda n=name, v=self.nahobino_attrs[name]: self.update_nahobino_attribute(n, v.get())).pack(side=tk.LEFT, padx=2)
-
-        essence_frame = tb.Labelframe(sf, text="Essências", bootstyle="warning")
-        essence_frame.pack(fill=tk.X, pady=5)
-        self.nahobino_essences = []
-        self.nahobino_essence_var = tk.StringVar()
-        self.nahobino_essence_combo = ttk.Combobox(essence_frame, textvariable=self.nahobino_essence_var, values=self.nahobino_essences, state="readonly", width=20)
-        self.nahobino_essence_combo.pack(side=tk.LEFT, padx=5)
-        self.nahobino_essence_combo.bind("<<ComboboxSelected>>", lambda e: self.save_current_nahobino())
-        essence_entry = tb.Entry(essence_frame, width=18)
-        essence_entry.pack(side=tk.LEFT, padx=5)
-        tb.Button(essence_frame, text="Adicionar", bootstyle="success-outline",
-                  command=lambda: self.add_nahobino_essence(essence_entry)).pack(side=tk.LEFT, padx=5)
-        tb.Button(essence_frame, text="Remover", bootstyle="danger-outline",
-                  command=self.remove_nahobino_essence).pack(side=tk.LEFT, padx=5)
-
-        skills_frame = tb.Labelframe(sf, text="Skills", bootstyle="primary")
-        skills_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        self.nahobino_skills_listbox = tk.Listbox(skills_frame, height=6)
-        self.nahobino_skills_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        controls_frame = tb.Frame(skills_frame)
-        controls_frame.pack(side=tk.LEFT, fill=tk.Y, padx=5)
-        skill_entry = tb.Entry(controls_frame, width=18)
-        skill_entry.pack(fill=tk.X, pady=2)
-        tb.Button(controls_frame, text="Adicionar", bootstyle="success-outline",
-                  command=lambda: self.add_nahobino_skill(skill_entry)).pack(fill=tk.X, pady=2)
-        tb.Button(controls_frame, text="Remover", bootstyle="danger-outline",
-                  command=self.remove_nahobino_skill).pack(fill=tk.X, pady=2)
-
-        passive_frame = tb.Labelframe(sf, text="Habilidades Passivas", bootstyle="info")
-        passive_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        self.nahobino_passive_listbox = tk.Listbox(passive_frame, height=6)
-        self.nahobino_passive_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        passive_entry = tb.Entry(passive_frame, width=18)
-        passive_entry.pack(side=tk.LEFT, padx=5)
-        tb.Button(passive_frame, text="Adicionar", bootstyle="success-outline",
-                  command=lambda: self.add_nahobino_passive(passive_entry)).pack(side=tk.LEFT, padx=5)
-        tb.Button(passive_frame, text="Remover", bootstyle="danger-outline",
-                  command=self.remove_nahobino_passive).pack(side=tk.LEFT, padx=5)
-
-        inv_frame = tb.Labelframe(sf, text="Inventário", bootstyle="success")
-        inv_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        self.nahobino_inventory_listbox = tk.Listbox(inv_frame, height=6)
-        self.nahobino_inventory_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        inv_entry = tb.Entry(inv_frame, width=18)
-        inv_entry.pack(side=tk.LEFT, padx=5)
-        tb.Button(inv_frame, text="Adicionar", bootstyle="success-outline",
-                  command=lambda: self.add_nahobino_item(inv_entry)).pack(side=tk.LEFT, padx=5)
-        tb.Button(inv_frame, text="Remover", bootstyle="danger-outline",
-                  command=self.remove_nahobino_item).pack(side=tk.LEFT, padx=5)
-
-        key_frame = tb.Labelframe(sf, text="Itens Chave", bootstyle="warning")
-        key_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        self.nahobino_key_listbox = tk.Listbox(key_frame, height=6)
-        self.nahobino_key_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        key_entry = tb.Entry(key_frame, width=18)
-        key_entry.pack(side=tk.LEFT, padx=5)
-        tb.Button(key_frame, text="Adicionar", bootstyle="success-outline",
-                  command=lambda: self.add_nahobino_key_item(key_entry)).pack(side=tk.LEFT, padx=5)
-        tb.Button(key_frame, text="Remover", bootstyle="danger-outline",
-                  command=self.remove_nahobino_key_item).pack(side=tk.LEFT, padx=5)
-
-    def update_nahobino_chars_list(self):
-        self.nahobino_chars_combo['values'] = list(self.nahobino_data.keys())
-        if self.nahobino_chars_combo['values']:
-            self.nahobino_chars_combo.current(0)
-            self.load_nahobino_character()
-
-    def new_nahobino_character(self):
-        name = simpledialog.askstring("Nova Ficha Nahobino", "Nome da nova ficha:")
-        if name and name.strip():
-            if name in self.nahobino_data:
-                messagebox.showerror("Erro", "Já existe uma ficha com este nome!")
-                return
-            self.nahobino_data[name] = {
-                'pv': 100,
-                'pm': 50,
-                'level': 1,
-                'attributes': {k: 10 for k in ["Força", "Vitalidade", "Magia", "Agilidade", "Sorte"]},
-                'essences': [],
-                'essence_equipped': "",
-                'skills': [],
-                'passives': [],
-                'inventory': [],
-                'key_items': []
-            }
-            self.save_character_data()
-            self.update_nahobino_chars_list()
-            self.nahobino_chars_combo.set(name)
-            self.load_nahobino_character()
-            messagebox.showinfo("Sucesso", f"Ficha '{name}' criada e salva!")
-
-    def load_nahobino_character(self, event=None):
-        name = self.nahobino_chars_combo.get()
-        if name in self.nahobino_data:
-            data = self.nahobino_data[name]
-            self.nahobino_pv.set(data.get('pv', 100))
-            self.nahobino_pm.set(data.get('pm', 50))
-            self.nahobino_level.set(data.get('level', 1))
-            for attr in self.nahobino_attrs:
-                self.nahobino_attrs[attr].set(data['attributes'].get(attr, 10))
-            self.nahobino_essences = data.get('essences', [])
-            self.nahobino_essence_combo['values'] = self.nahobino_essences
-            self.nahobino_essence_var.set(data.get('essence_equipped', ''))
-            self.nahobino_skills_listbox.delete(0, tk.END)
-            for skill in data['skills']:
-                self.nahobino_skills_listbox.insert(tk.END, skill)
-            self.nahobino_passive_listbox.delete(0, tk.END)
-            for passive in data['passives']:
-                self.nahobino_passive_listbox.insert(tk.END, passive)
-            self.nahobino_inventory_listbox.delete(0, tk.END)
-            for item in data['inventory']:
-                self.nahobino_inventory_listbox.insert(tk.END, item)
-            self.nahobino_key_listbox.delete(0, tk.END)
-            for key_item in data['key_items']:
-                self.nahobino_key_listbox.insert(tk.END, key_item)
-
-    def save_current_nahobino(self):
-        name = self.nahobino_chars_combo.get()
-        if name in self.nahobino_data:
-            self.nahobino_data[name]['pv'] = self.nahobino_pv.get()
-            self.nahobino_data[name]['pm'] = self.nahobino_pm.get()
-            self.nahobino_data[name]['level'] = self.nahobino_level.get()
-            self.nahobino_data[name]['attributes'] = {attr: self.nahobino_attrs[attr].get() for attr in self.nahobino_attrs}
-            self.nahobino_data[name]['essences'] = self.nahobino_essences
-            self.nahobino_data[name]['essence_equipped'] = self.nahobino_essence_var.get()
-            self.nahobino_data[name]['skills'] = list(self.nahobino_skills_listbox.get(0, tk.END))
-            self.nahobino_data[name]['passives'] = list(self.nahobino_passive_listbox.get(0, tk.END))
-            self.nahobino_data[name]['inventory'] = list(self.nahobino_inventory_listbox.get(0, tk.END))
-            self.nahobino_data[name]['key_items'] = list(self.nahobino_key_listbox.get(0, tk.END))
-            self.save_character_data()
-
-    def update_nahobino_attribute(self, attr, value):
-        name = self.nahobino_chars_combo.get()
-        if name in self.nahobino_data:
-            self.nahobino_data[name]['attributes'][attr] = value
-            self.save_character_data()
-
-    def add_nahobino_essence(self, entry):
-        name = entry.get().strip()
-        if name and name not in self.nahobino_essences:
-            self.nahobino_essences.append(name)
-            self.nahobino_essence_combo['values'] = self.nahobino_essences
-            entry.delete(0, tk.END)
-            self.save_current_nahobino()
-
-    def add_nahobino_skill(self, entry):
-        skill = entry.get().strip()
-        if skill:
-            self.nahobino_skills_listbox.insert(tk.END, skill)
-            entry.delete(0, tk.END)
-            self.save_current_nahobino()
-
-    def add_nahobino_passive(self, entry):
-        passive = entry.get().strip()
-        if passive:
-            self.nahobino_passive_listbox.insert(tk.END, passive)
-            entry.delete(0, tk.END)
-            self.save_current_nahobino()
-
-    def add_nahobino_item(self, entry):
-        item = entry.get().strip()
-        if item:
-            self.nahobino_inventory_listbox.insert(tk.END, item)
-            entry.delete(0, tk.END)
-            self.save_current_nahobino()
-
-    def add_nahobino_key_item(self, entry):
-        key_item = entry.get().strip()
-        if key_item:
-            self.nahobino_key_listbox.insert(tk.END, key_item)
-            entry.delete(0, tk.END)
-            self.save_current_nahobino()
-
-    def remove_nahobino_skill(self):
-        selection = self.nahobino_skills_listbox.curselection()
-        if selection:
-            self.nahobino_skills_listbox.delete(selection[0])
-            self.save_current_nahobino()
-
-    def remove_nahobino_passive(self):
-        selection = self.nahobino_passive_listbox.curselection()
-        if selection:
-            self.nahobino_passive_listbox.delete(selection[0])
-            self.save_current_nahobino()
-
-    def remove_nahobino_item(self):
-        selection = self.nahobino_inventory_listbox.curselection()
-        if selection:
-            self.nahobino_inventory_listbox.delete(selection[0])
-            self.save_current_nahobino()
-
-    def remove_nahobino_key_item(self):
-        selection = self.nahobino_key_listbox.curselection()
-        if selection:
-            self.nahobino_key_listbox.delete(selection[0])
-            self.save_current_nahobino()
-
-    def remove_nahobino_essence(self):
-        selected = self.nahobino_essence_var.get()
-        if selected and selected in self.nahobino_essences:
-            self.nahobino_essences.remove(selected)
-            self.nahobino_essence_combo['values'] = self.nahobino_essences
-            if self.nahobino_essences:
-                self.nahobino_essence_var.set(self.nahobino_essences[0])
-            else:
-                self.nahobino_essence_var.set("")
-            self.save_current_nahobino()
-
-    def setup_samurai_tab(self, parent):
-        frame = ScrollableFrame(parent)
-        frame.pack(fill=tk.BOTH, expand=True)
-        sf = frame.scrollable_frame
-
-        # Initialize attributes first
-        self.samurai_pv = tk.IntVar(value=100)
-        self.samurai_pm = tk.IntVar(value=50)
-        self.samurai_level = tk.IntVar(value=1)
-        self.samurai_attrs = {}
-        self.samurai_skills_listbox = tk.Listbox()
-        self.samurai_passive_listbox = tk.Listbox()
-        self.samurai_inventory_listbox = tk.Listbox()
-        self.samurai_key_listbox = tk.Listbox()
-
-        tb.Label(sf, text="Ficha atual:").pack(anchor="w", pady=(5, 0))
-        self.samurai_chars_var = tk.StringVar()
-        self.samurai_chars_combo = ttk.Combobox(sf, textvariable=self.samurai_chars_var, state="readonly")
-        self.samurai_chars_combo.pack(fill=tk.X, pady=(0, 5))
-        self.samurai_chars_combo.bind("<<ComboboxSelected>>", self.load_samurai_character)
-
-        tb.Button(sf, text="Nova Ficha", command=self.new_samurai_character, bootstyle="success-outline").pack(pady=5)
-
-        pv_pm_frame = tb.Labelframe(sf, text="PV / PM", bootstyle="danger")
-        pv_pm_frame.pack(fill=tk.X, pady=5)
-        tb.Label(pv_pm_frame, text="PV:").grid(row=0, column=0, sticky="w", padx=5, pady=5)
-        tb.Spinbox(pv_pm_frame, from_=0, to=999, textvariable=self.samurai_pv, width=6,
-                   command=lambda: self.save_current_samurai()).grid(row=0, column=1, sticky="w", padx=5, pady=5)
-        tb.Label(pv_pm_frame, text="PM:").grid(row=0, column=2, sticky="w", padx=5, pady=5)
-        tb.Spinbox(pv_pm_frame, from_=0, to=999, textvariable=self.samurai_pm, width=6,
-                   command=lambda: self.save_current_samurai()).grid(row=0, column=3, sticky="w", padx=5, pady=5)
-        tb.Label(pv_pm_frame, text="Level:").grid(row=0, column=4, sticky="w", padx=5, pady=5)
-        tb.Spinbox(pv_pm_frame, from_=1, to=99, textvariable=self.samurai_level, width=4,
-                   command=lambda: self.save_current_samurai()).grid(row=0, column=5, sticky="w", padx=5, pady=5)
-
-        attr_frame = tb.Labelframe(sf, text="Atributos", bootstyle="info")
-        attr_frame.pack(fill=tk.X, pady=5)
-        row = 0
-        for name in ["Força", "Vitalidade", "Magia", "Agilidade", "Sorte"]:
-            var = tk.IntVar(value=10)
-            tb.Label(attr_frame, text=f"{name}:").grid(row=row, column=0, sticky="w", padx=5, pady=2)
-            tb.Spinbox(attr_frame, from_=1, to=99, textvariable=var, width=4,
-                       command=lambda n=name, v=var: self.update_samurai_attribute(n, v.get())).grid(row=row, column=1, sticky="w", padx=5, pady=2)
-            self.samurai_attrs[name] = var
-            row += 1
-
-        # Skills
-        skills_frame = tb.Labelframe(sf, text="Skills", bootstyle="primary")
-        skills_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        self.samurai_skills_listbox = tk.Listbox(skills_frame, height=6)
-        self.samurai_skills_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        skill_entry = tb.Entry(skills_frame, width=18)
-        skill_entry.pack(side=tk.LEFT, padx=5)
-        tb.Button(skills_frame, text="Adicionar", bootstyle="success-outline",
-                  command=lambda: self.add_samurai_skill(skill_entry)).pack(side=tk.LEFT, padx=5)
-        tb.Button(skills_frame, text="Remover", bootstyle="danger-outline",
-                  command=self.remove_samurai_skill).pack(side=tk.LEFT, padx=5)
-
-        # Habilidades Passivas
-        passive_frame = tb.Labelframe(sf, text="Habilidades Passivas", bootstyle="info")
-        passive_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        self.samurai_passive_listbox = tk.Listbox(passive_frame, height=6)
-        self.samurai_passive_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        passive_entry = tb.Entry(passive_frame, width=18)
-        passive_entry.pack(side=tk.LEFT, padx=5)
-        tb.Button(passive_frame, text="Adicionar", bootstyle="success-outline",
-                  command=lambda: self.add_samurai_passive(passive_entry)).pack(side=tk.LEFT, padx=5)
-        tb.Button(passive_frame, text="Remover", bootstyle="danger-outline",
-                  command=self.remove_samurai_passive).pack(side=tk.LEFT, padx=5)
-
-        # Inventário
-        inv_frame = tb.Labelframe(sf, text="Inventário", bootstyle="success")
-        inv_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        self.samurai_inventory_listbox = tk.Listbox(inv_frame, height=6)
-        self.samurai_inventory_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        inv_entry = tb.Entry(inv_frame, width=18)
-        inv_entry.pack(side=tk.LEFT, padx=5)
-        tb.Button(inv_frame, text="Adicionar", bootstyle="success-outline",
-                  command=lambda: self.add_samurai_item(inv_entry)).pack(side=tk.LEFT, padx=5)
-        tb.Button(inv_frame, text="Remover", bootstyle="danger-outline",
-                  command=self.remove_samurai_item).pack(side=tk.LEFT, padx=5)
-
-        # Itens chave
-        key_frame = tb.Labelframe(sf, text="Itens Chave", bootstyle="warning")
-        key_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        self.samurai_key_listbox = tk.Listbox(key_frame, height=6)
-        self.samurai_key_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        key_entry = tb.Entry(key_frame, width=18)
-        key_entry.pack(side=tk.LEFT, padx=5)
-        tb.Button(key_frame, text="Adicionar", bootstyle="success-outline",
-                  command=lambda: self.add_samurai_key_item(key_entry)).pack(side=tk.LEFT, padx=5)
-        tb.Button(key_frame, text="Remover", bootstyle="danger-outline",
-                  command=self.remove_samurai_key_item).pack(side=tk.LEFT, padx=5)
-        self.update_samurai_chars_list()
-
-    def update_samurai_chars_list(self):
-        self.samurai_chars_combo['values'] = list(self.samurai_data.keys())
-        if self.samurai_chars_combo['values']:
-            self.samurai_chars_combo.current(0)
-            self.load_samurai_character()
-
-    def remove_samurai_skill(self):
-        selection = self.samurai_skills_listbox.curselection()
-        if selection:
-            self.samurai_skills_listbox.delete(selection[0])
-            self.save_current_samurai()
-
-    def remove_samurai_passive(self):
-        selection = self.samurai_passive_listbox.curselection()
-        if selection:
-            self.samurai_passive_listbox.delete(selection[0])
-            self.save_current_samurai()
-
-    def remove_samurai_item(self):
-        selection = self.samurai_inventory_listbox.curselection()
-        if selection:
-            self.samurai_inventory_listbox.delete(selection[0])
-            self.save_current_samurai()
-
-    def remove_samurai_key_item(self):
-        selection = self.samurai_key_listbox.curselection()
-        if selection:
-            self.samurai_key_listbox.delete(selection[0])
-            self.save_current_samurai()
-
-    def setup_persona_user_tab(self, parent):
-        frame = ScrollableFrame(parent)
-        frame.pack(fill=tk.BOTH, expand=True)
-        sf = frame.scrollable_frame
-
-        # Initialize attributes first
-        self.persona_user_pv = tk.IntVar(value=100)
-        self.persona_user_pm = tk.IntVar(value=50)
-        self.persona_user_level = tk.IntVar(value=1)
-        self.persona_user_attrs = {}
-        for name in ["Força", "Vitalidade", "Magia", "Agilidade", "Sorte"]:
-            self.persona_user_attrs[name] = tk.IntVar(value=10)
-        self.persona_user_personas = []
-        self.persona_user_persona_var = tk.StringVar()
-        self.persona_user_skills_listbox = tk.Listbox()
-        self.persona_user_passive_listbox = tk.Listbox()
-        self.persona_user_inventory_listbox = tk.Listbox()
-        self.persona_user_key_listbox = tk.Listbox()
-
-        tb.Label(sf, text="Ficha atual:").pack()
-        self.persona_user_chars_var = tk.StringVar()
-        self.persona_user_chars_combo = ttk.Combobox(sf, textvariable=self.persona_user_chars_var, state="readonly")
-        self.persona_user_chars_combo.pack()
-        self.persona_user_chars_combo.bind("<<ComboboxSelected>>", self.load_persona_user_character)
-
-        tb.Button(sf, text="Nova Ficha", command=self.new_persona_user_character, bootstyle="success-outline").pack(pady=2)
-
-        # Personas
-        persona_frame = tb.Labelframe(sf, text="Personas", bootstyle="warning")
-        persona_frame.pack(fill=tk.X, pady=5)
-        tb.Label(persona_frame, text="Equipada:").pack(side=tk.LEFT)
-        self.persona_user_persona_combo = ttk.Combobox(persona_frame, textvariable=self.persona_user_persona_var, values=self.persona_user_personas, state="readonly", width=20)
-        self.persona_user_persona_combo.pack(side=tk.LEFT, padx=5)
-        self.persona_user_persona_combo.bind("<<ComboboxSelected>>", lambda e: self.save_current_persona_user())
-        persona_entry = tb.Entry(persona_frame, width=18)
-        persona_entry.pack(side=tk.LEFT, padx=5)
-        tb.Button(persona_frame, text="Adicionar", bootstyle="success-outline",
-                  command=lambda: self.add_persona_user_persona(persona_entry)).pack(side=tk.LEFT, padx=5)
-        tb.Button(persona_frame, text="Remover", bootstyle="danger-outline",
-                  command=self.remove_persona_user_persona).pack(side=tk.LEFT, padx=5)
-
-        # PV/PM
-        pv_pm_frame = tb.Labelframe(sf, text="PV / PM", bootstyle="danger")
-        pv_pm_frame.pack(fill=tk.X, pady=5)
-        tb.Label(pv_pm_frame, text="PV:").pack(side=tk.LEFT)
-        tb.Spinbox(pv_pm_frame, from_=0, to=999, textvariable=self.persona_user_pv, width=6,
-                   command=lambda: self.save_current_persona_user()).pack(side=tk.LEFT, padx=5)
-        tb.Label(pv_pm_frame, text="PM:").pack(side=tk.LEFT)
-        tb.Spinbox(pv_pm_frame, from_=0, to=999, textvariable=self.persona_user_pm, width=6,
-                   command=lambda: self.save_current_persona_user()).pack(side=tk.LEFT, padx=5)
-        tb.Label(pv_pm_frame, text="Level:").pack(side=tk.LEFT)
-        tb.Spinbox(pv_pm_frame, from_=1, to=99, textvariable=self.persona_user_level, width=4,
-                   command=lambda: self.save_current_persona_user()).pack(side=tk.LEFT, padx=5)
-
-        # Atributos
-        attr_frame = tb.Labelframe(sf, text="Atributos", bootstyle="info")
-        attr_frame.pack(fill=tk.X, pady=5)
-        for name in ["Força", "Vitalidade", "Magia", "Agilidade", "Sorte"]:
-            tb.Label(attr_frame, text=f"{name}:").pack(side=tk.LEFT, padx=2)
-            tb.Spinbox(attr_frame, from_=1, to=99, textvariable=self.persona_user_attrs[name], width=4,
-                       command=lambda n=name, v=self.persona_user_attrs[name]: self.update_persona_user_attribute(n, v.get())).pack(side=tk.LEFT, padx=2)
-
-        # Skills
-        skills_frame = tb.Labelframe(sf, text="Skills", bootstyle="primary")
-        skills_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        self.persona_user_skills_listbox = tk.Listbox(skills_frame, height=6)
-        self.persona_user_skills_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        controls_frame = tb.Frame(skills_frame)
-        controls_frame.pack(side=tk.LEFT, fill=tk.Y, padx=5)
-        skill_entry = tb.Entry(controls_frame, width=18)
-        skill_entry.pack(fill=tk.X, pady=2)
-        tb.Button(controls_frame, text="Adicionar", bootstyle="success-outline",
-                  command=lambda: self.add_persona_user_skill(skill_entry)).pack(fill=tk.X, pady=2)
-        tb.Button(controls_frame, text="Remover", bootstyle="danger-outline",
-                  command=self.remove_persona_user_skill).pack(fill=tk.X, pady=2)
-
-        # Habilidades Passivas
-        passive_frame = tb.Labelframe(sf, text="Habilidades Passivas", bootstyle="info")
-        passive_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        self.persona_user_passive_listbox = tk.Listbox(passive_frame, height=6)
-        self.persona_user_passive_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        controls_frame = tb.Frame(passive_frame)
-        controls_frame.pack(side=tk.LEFT, fill=tk.Y, padx=5)
-        passive_entry = tb.Entry(controls_frame, width=18)
-        passive_entry.pack(fill=tk.X, pady=2)
-        tb.Button(controls_frame, text="Adicionar", bootstyle="success-outline",
-                  command=lambda: self.add_persona_user_passive(passive_entry)).pack(fill=tk.X, pady=2)
-        tb.Button(controls_frame, text="Remover", bootstyle="danger-outline",
-                  command=self.remove_persona_user_passive).pack(fill=tk.X, pady=2)
-
-        # Inventário
-        inv_frame = tb.Labelframe(sf, text="Inventário", bootstyle="success")
-        inv_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        self.persona_user_inventory_listbox = tk.Listbox(inv_frame, height=6)
-        self.persona_user_inventory_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        controls_frame = tb.Frame(inv_frame)
-        controls_frame.pack(side=tk.LEFT, fill=tk.Y, padx=5)
-        inv_entry = tb.Entry(controls_frame, width=18)
-        inv_entry.pack(fill=tk.X, pady=2)
-        tb.Button(controls_frame, text="Adicionar", bootstyle="success-outline",
-                  command=lambda: self.add_persona_user_item(inv_entry)).pack(fill=tk.X, pady=2)
-        tb.Button(controls_frame, text="Remover", bootstyle="danger-outline",
-                  command=self.remove_persona_user_item).pack(fill=tk.X, pady=2)
-
-        # Itens chave
-        key_frame = tb.Labelframe(sf, text="Itens Chave", bootstyle="warning")
-        key_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        self.persona_user_key_listbox = tk.Listbox(key_frame, height=6)
-        self.persona_user_key_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        key_entry = tb.Entry(key_frame, width=18)
-        key_entry.pack(side=tk.LEFT, padx=5)
-        tb.Button(key_frame, text="Adicionar", bootstyle="success-outline",
-                  command=lambda: self.add_persona_user_key_item(key_entry)).pack(side=tk.LEFT, padx=5)
-        tb.Button(key_frame, text="Remover", bootstyle="danger-outline",
-                  command=self.remove_persona_user_key_item).pack(side=tk.LEFT, padx=5)
-        self.update_persona_user_chars_list()
-
-    def update_persona_user_chars_list(self):
-        self.persona_user_chars_combo['values'] = list(self.persona_user_data.keys())
-        if self.persona_user_chars_combo['values']:
-            self.persona_user_chars_combo.current(0)
-            self.load_persona_user_character()
-
-    def new_persona_user_character(self):
-        name = simpledialog.askstring("Nova Ficha Persona-User", "Nome da nova ficha:")
-        if name and name.strip():
-            if name in self.persona_user_data:
-                messagebox.showerror("Erro", "Já existe uma ficha com este nome!")
-                return
-            self.persona_user_data[name] = {
-                'pv': 100,
-                'pm': 50,
-                'level': 1,
-                'attributes': {k: 10 for k in ["Força", "Vitalidade", "Magia", "Agilidade", "Sorte"]},
-                'personas': [],
-                'persona_equipped': "",
-                'skills': [],
-                'passives': [],
-                'inventory': [],
-                'key_items': []
-            }
-            self.save_character_data()
-            self.update_persona_user_chars_list()
-            self.persona_user_chars_combo.set(name)
-            self.load_persona_user_character()
-            messagebox.showinfo("Sucesso", f"Ficha '{name}' criada e salva!")
-
-    def load_persona_user_character(self, event=None):
-        name = self.persona_user_chars_combo.get()
-        if name in self.persona_user_data:
-            data = self.persona_user_data[name]
-            self.persona_user_pv.set(data['pv'])
-            self.persona_user_pm.set(data['pm'])
-            self.persona_user_level.set(data.get('level', 1))
-
-            for attr in self.persona_user_attrs:
-                self.persona_user_attrs[attr].set(data['attributes'].get(attr, 10))
-
-            self.persona_user_personas = data['personas']
-            self.persona_user_persona_combo['values'] = self.persona_user_personas
-            self.persona_user_persona_var.set(data['persona_equipped'])
-
-            self.persona_user_skills_listbox.delete(0, tk.END)
-            for skill in data['skills']:
-                self.persona_user_skills_listbox.insert(tk.END, skill)
-
-            self.persona_user_passive_listbox.delete(0, tk.END)
-            for passive in data['passives']:
-                self.persona_user_passive_listbox.insert(tk.END, passive)
-
-            self.persona_user_inventory_listbox.delete(0, tk.END)
-            for item in data['inventory']:
-                self.persona_user_inventory_listbox.insert(tk.END, item)
-
-            self.persona_user_key_listbox.delete(0, tk.END)
-            for key_item in data['key_items']:
-                self.persona_user_key_listbox.insert(tk.END, key_item)
-
-    def save_current_persona_user(self):
-        name = self.persona_user_chars_combo.get()
-        if name in self.persona_user_data:
-            self.persona_user_data[name]['pv'] = self.persona_user_pv.get()
-            self.persona_user_data[name]['pm'] = self.persona_user_pm.get()
-            self.persona_user_data[name]['level'] = self.persona_user_level.get()
-            self.persona_user_data[name]['attributes'] = {attr: self.persona_user_attrs[attr].get() for attr in self.persona_user_attrs}
-            self.persona_user_data[name]['personas'] = self.persona_user_personas
-            self.persona_user_data[name]['persona_equipped'] = self.persona_user_persona_var.get()
-            self.persona_user_data[name]['skills'] = list(self.persona_user_skills_listbox.get(0, tk.END))
-            self.persona_user_data[name]['passives'] = list(self.persona_user_passive_listbox.get(0, tk.END))
-            self.persona_user_data[name]['inventory'] = list(self.persona_user_inventory_listbox.get(0, tk.END))
-            self.persona_user_data[name]['key_items'] = list(self.persona_user_key_listbox.get(0, tk.END))
-            self.save_character_data()
-
-    def update_persona_user_attribute(self, attr, value):
-        name = self.persona_user_chars_combo.get()
-        if name in self.persona_user_data:
-            self.persona_user_data[name]['attributes'][attr] = value
-            self.save_character_data()
-
-    def add_persona_user_persona(self, entry):
-        name = entry.get().strip()
-        if name and name not in self.persona_user_personas:
-            self.persona_user_personas.append(name)
-            self.persona_user_persona_combo['values'] = self.persona_user_personas
-            entry.delete(0, tk.END)
-            self.save_current_persona_user()
-
-    def add_persona_user_skill(self, entry):
-        skill = entry.get().strip()
-        if skill:
-            self.persona_user_skills_listbox.insert(tk.END, skill)
-            entry.delete(0, tk.END)
-            self.save_current_persona_user()
-
-    def add_persona_user_passive(self, entry):
-        passive = entry.get().strip()
-        if passive:
-            self.persona_user_passive_listbox.insert(tk.END, passive)
-            entry.delete(0, tk.END)
-            self.save_current_persona_user()
-
-    def add_persona_user_item(self, entry):
-        item = entry.get().strip()
-        if item:
-            self.persona_user_inventory_listbox.insert(tk.END, item)
-            entry.delete(0, tk.END)
-            self.save_current_persona_user()
-
-    def add_persona_user_key_item(self, entry):
-        key_item = entry.get().strip()
-        if key_item:
-            self.persona_user_key_listbox.insert(tk.END, key_item)
-            entry.delete(0, tk.END)
-            self.save_current_persona_user()
-
-    def remove_persona_user_skill(self):
-        selection = self.persona_user_skills_listbox.curselection()
-        if selection:
-            self.persona_user_skills_listbox.delete(selection[0])
-            self.save_current_persona_user()
-
-    def remove_persona_user_passive(self):
-        selection = self.persona_user_passive_listbox.curselection()
-        if selection:
-            self.persona_user_passive_listbox.delete(selection[0])
-            self.save_current_persona_user()
-
-    def remove_persona_user_item(self):
-        selection = self.persona_user_inventory_listbox.curselection()
-        if selection:
-            self.persona_user_inventory_listbox.delete(selection[0])
-            self.save_current_persona_user()
-
-    def remove_persona_user_key_item(self):
-        selection = self.persona_user_key_listbox.curselection()
-        if selection:
-            self.persona_user_key_listbox.delete(selection[0])
-            self.save_current_persona_user()
-
-    def remove_persona_user_persona(self):
-        selected = self.persona_user_persona_var.get()
-        if selected and selected in self.persona_user_personas:
-            self.persona_user_personas.remove(selected)
-            self.persona_user_persona_combo['values'] = self.persona_user_personas
-            if self.persona_user_personas:
-                self.persona_user_persona_var.set(self.persona_user_personas[0])
-            else:
-                self.persona_user_persona_var.set("")
-            self.save_current_persona_user()
-
-    def new_samurai_character(self):
-        name = simpledialog.askstring("Nova Ficha Samurai", "Nome da nova ficha:")
-        if name and name.strip():
-            if name in self.samurai_data:
-                messagebox.showerror("Erro", "Já existe uma ficha com este nome!")
-                return
-            self.samurai_data[name] = {
-                'pv': 100,
-                'pm': 50,
-                'level': 1,
-                'attributes': {k: 10 for k in ["Força", "Vitalidade", "Magia", "Agilidade", "Sorte"]},
-                'skills': [],
-                'passives': [],
-                'inventory': [],
-                'key_items': []
-            }
-            self.save_character_data()
-            self.update_samurai_chars_list()
-            self.samurai_chars_combo.set(name)
-            self.load_samurai_character()
-            messagebox.showinfo("Sucesso", f"Ficha '{name}' criada e salva!")
-
-    def load_samurai_character(self, event=None):
-        name = self.samurai_chars_combo.get()
-        if name in self.samurai_data:
-            data = self.samurai_data[name]
-            self.samurai_pv.set(data['pv'])
-            self.samurai_pm.set(data['pm'])
-            self.samurai_level.set(data.get('level', 1))
-            for attr in self.samurai_attrs:
-                self.samurai_attrs[attr].set(data['attributes'][attr])
-            self.samurai_skills_listbox.delete(0, tk.END)
-            for skill in data['skills']:
-                self.samurai_skills_listbox.insert(tk.END, skill)
-            self.samurai_passive_listbox.delete(0, tk.END)
-            for passive in data['passives']:
-                self.samurai_passive_listbox.insert(tk.END, passive)
-            self.samurai_inventory_listbox.delete(0, tk.END)
-            for item in data['inventory']:
-                self.samurai_inventory_listbox.insert(tk.END, item)
-            self.samurai_key_listbox.delete(0, tk.END)
-            for key_item in data['key_items']:
-                self.samurai_key_listbox.insert(tk.END, key_item)
-
-    def save_current_samurai(self):
-        name = self.samurai_chars_combo.get()
-        if name in self.samurai_data:
-            self.samurai_data[name]['pv'] = self.samurai_pv.get()
-            self.samurai_data[name]['pm'] = self.samurai_pm.get()
-            self.samurai_data[name]['level'] = self.samurai_level.get()
-            self.samurai_data[name]['attributes'] = {attr: self.samurai_attrs[attr].get() for attr in self.samurai_attrs}
-            self.samurai_data[name]['skills'] = list(self.samurai_skills_listbox.get(0, tk.END))
-            self.samurai_data[name]['passives'] = list(self.samurai_passive_listbox.get(0, tk.END))
-            self.samurai_data[name]['inventory'] = list(self.samurai_inventory_listbox.get(0, tk.END))
-            self.samurai_data[name]['key_items'] = list(self.samurai_key_listbox.get(0, tk.END))
-            self.save_character_data()
-
-    def update_samurai_attribute(self, attr, value):
-        name = self.samurai_chars_combo.get()
-        if name in self.samurai_data:
-            self.samurai_data[name]['attributes'][attr] = value
-            self.save_character_data()
-
-    def add_samurai_skill(self, entry):
-        skill = entry.get().strip()
-        if skill:
-            self.samurai_skills_listbox.insert(tk.END, skill)
-            entry.delete(0, tk.END)
-            self.save_current_samurai()
-
-    def add_samurai_passive(self, entry):
-        passive = entry.get().strip()
-        if passive:
-            self.samurai_passive_listbox.insert(tk.END, passive)
-            entry.delete(0, tk.END)
-            self.save_current_samurai()
-
-    def add_samurai_item(self, entry):
-        item = entry.get().strip()
-        if item:
-            self.samurai_inventory_listbox.insert(tk.END, item)
-            entry.delete(0, tk.END)
-            self.save_current_samurai()
-
-    def add_samurai_key_item(self, entry):
-        key_item = entry.get().strip()
-        if key_item:
-            self.samurai_key_listbox.insert(tk.END, key_item)
-            entry.delete(0, tk.END)
-            self.save_current_samurai()
-
-    # --- CYBERPUNK COM SCROLL ---
-    def setup_cyberpunk_tab(self, parent):
-        frame = ScrollableFrame(parent)
-        frame.pack(fill=tk.BOTH, expand=True)
-        sf = frame.scrollable_frame
-
-        # Initialize variables
-        self.cyberpunk_level = tk.IntVar(value=1)
-        self.cyberpunk_humanity = tk.IntVar(value=100)
-
-        chars_frame = tb.Labelframe(sf, text="Gerenciamento de Fichas", bootstyle="info")
-        chars_frame.pack(fill=tk.X, pady=5)
-        chars_control_frame = tb.Frame(chars_frame)
-        chars_control_frame.pack(fill=tk.X, pady=5)
-        tb.Label(chars_control_frame, text="Ficha atual:").pack(side=tk.LEFT)
-        self.cyberpunk_chars = tk.StringVar()
-        self.cyberpunk_chars_combo = ttk.Combobox(chars_control_frame, textvariable=self.cyberpunk_chars, state="readonly")
-        self.cyberpunk_chars_combo.pack(side=tk.LEFT, padx=5)
-        self.cyberpunk_chars_combo.bind("<<ComboboxSelected>>", self.load_cyberpunk_character)
-        tb.Button(chars_control_frame, text="Nova Ficha", command=self.new_cyberpunk_character, bootstyle="success-outline").pack(side=tk.LEFT, padx=2)
-        tb.Button(chars_control_frame, text="Renomear", command=self.rename_cyberpunk_character, bootstyle="info-outline").pack(side=tk.LEFT, padx=2)
-        tb.Button(chars_control_frame, text="Excluir", command=self.delete_cyberpunk_character, bootstyle="danger-outline").pack(side=tk.LEFT, padx=2)
-
-        attributes_frame = tb.Labelframe(sf, text="Atributos", bootstyle="info")
-        attributes_frame.pack(fill=tk.X, pady=5)
-        self.cyberpunk_attrs = {}
-        self.cyberpunk_mods = {}
-        attributes = [
-            ("Força", "forca", 5, -2),
-            ("Destreza", "dex", 22, 6),
-            ("Constituição", "con", 9, 1),
-            ("Sabedoria", "sab", 10, 1),
-            ("Inteligência", "int", 11, 2),
-            ("Tecnologia", "tech", 10, 1),
-            ("Carisma", "car", 4, -3)
-        ]
-        for name, key, default_val, default_mod in attributes:
-            attr_frame = tb.Frame(attributes_frame)
-            attr_frame.pack(fill=tk.X, pady=2)
-            tb.Label(attr_frame, text=f"{name}:").pack(side=tk.LEFT)
-            attr_var = tk.IntVar(value=default_val)
-            tb.Spinbox(attr_frame, from_=1, to=30, textvariable=attr_var, width=5,
-                       command=lambda k=key, v=attr_var: self.update_cyberpunk_attribute(k, v.get())).pack(side=tk.LEFT, padx=2)
-            self.cyberpunk_attrs[key] = attr_var
-            tb.Label(attr_frame, text="(").pack(side=tk.LEFT)
-            mod_var = tk.IntVar(value=default_mod)
-            tb.Spinbox(attr_frame, from_=-10, to=10, textvariable=mod_var, width=3,
-                       command=lambda k=key, v=mod_var: self.update_cyberpunk_modifier(k, v.get())).pack(side=tk.LEFT)
-            self.cyberpunk_mods[key] = mod_var
-            tb.Label(attr_frame, text=")").pack(side=tk.LEFT)
-
-        life_frame = tb.Labelframe(sf, text="Vida / Humanidade / Dinheiro", bootstyle="danger")
-        life_frame.pack(fill=tk.X, pady=5)
-        tb.Label(life_frame, text="Vida Atual:").pack(side=tk.LEFT)
-        self.cyberpunk_life = tk.IntVar(value=50)
-        tb.Spinbox(life_frame, from_=0, to=100, textvariable=self.cyberpunk_life, width=5,
-                   command=lambda: self.update_cyberpunk_life()).pack(side=tk.LEFT, padx=5)
-        tb.Label(life_frame, text="Vida Máxima:").pack(side=tk.LEFT)
-        self.cyberpunk_max_life = tk.IntVar(value=50)
-        tb.Spinbox(life_frame, from_=1, to=100, textvariable=self.cyberpunk_max_life, width=5,
-                   command=lambda: self.update_cyberpunk_max_life()).pack(side=tk.LEFT, padx=5)
-        tb.Label(life_frame, text="Humanidade:").pack(side=tk.LEFT)
-        self.cyberpunk_humanity = tk.IntVar(value=100)
-        tb.Spinbox(life_frame, from_=0, to=100, textvariable=self.cyberpunk_humanity, width=5,
-                   command=lambda: self.update_cyberpunk_humanity()).pack(side=tk.LEFT, padx=5)
-        tb.Label(life_frame, text="Dinheiro:").pack(side=tk.LEFT)
-        self.cyberpunk_money = tk.IntVar(value=1000)
-        tb.Spinbox(life_frame, from_=0, to=100000, textvariable=self.cyberpunk_money, width=8,
-                   command=lambda: self.update_cyberpunk_money()).pack(side=tk.LEFT, padx=5)
-        tb.Label(life_frame, text="Level:").pack(side=tk.LEFT)
-        tb.Spinbox(life_frame, from_=1, to=99, textvariable=self.cyberpunk_level, width=4,
-                   command=lambda: self.update_cyberpunk_level()).pack(side=tk.LEFT, padx=5)
-
-        cyberware_frame = tb.Labelframe(sf, text="Próteses e Implantes", bootstyle="warning")
-        cyberware_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        cyberware_control_frame = tb.Frame(cyberware_frame)
-        cyberware_control_frame.pack(fill=tk.X, pady=5)
-        tb.Label(cyberware_control_frame, text="Nova prótese:").pack(side=tk.LEFT)
-        self.new_cyberware = tk.StringVar()
-        cyberware_entry = tb.Entry(cyberware_control_frame, textvariable=self.new_cyberware)
-        cyberware_entry.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
-        tb.Button(cyberware_control_frame, text="Adicionar", command=self.add_cyberware, bootstyle="success-outline").pack(side=tk.LEFT, padx=5)
-        tb.Button(cyberware_control_frame, text="Remover", command=self.remove_cyberware, bootstyle="danger-outline").pack(side=tk.LEFT, padx=5)
-        cyberware_list_frame = tb.Frame(cyberware_frame)
-        cyberware_list_frame.pack(fill=tk.BOTH, expand=True)
-        self.cyberware_listbox = tk.Listbox(cyberware_list_frame, height=6)
-        self.cyberware_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-
-        inventory_frame = tb.Labelframe(sf, text="Inventário", bootstyle="primary")
-        inventory_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        inventory_control_frame = tb.Frame(inventory_frame)
-        inventory_control_frame.pack(fill=tk.X, pady=5)
-        tb.Label(inventory_control_frame, text="Novo item:").pack(side=tk.LEFT)
-        self.new_inventory_item = tk.StringVar()
-        inventory_entry = tb.Entry(inventory_control_frame, textvariable=self.new_inventory_item)
-        inventory_entry.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
-        tb.Button(inventory_control_frame, text="Adicionar", command=self.add_inventory_item, bootstyle="success-outline").pack(side=tk.LEFT, padx=5)
-        tb.Button(inventory_control_frame, text="Remover", command=self.remove_inventory_item, bootstyle="danger-outline").pack(side=tk.LEFT, padx=5)
-        inventory_list_frame = tb.Frame(inventory_frame)
-        inventory_list_frame.pack(fill=tk.BOTH, expand=True)
-        self.inventory_listbox = tk.Listbox(inventory_list_frame, height=6)
-        self.inventory_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-
-        self.cyberpunk_humanity.set(100)
-        self.cyberpunk_money.set(1000)
-        self.cyberpunk_life.set(50)
-        self.cyberpunk_max_life.set(50)
-        self.cyberpunk_level = tk.IntVar(value=1)
-
-        if hasattr(self, 'cyberpunk_data') and self.cyberpunk_data and self.cyberpunk_chars_combo['values']:
-            self.cyberpunk_chars_combo.current(0)
-            self.load_cyberpunk_character()
-
-    # Missing Cyberpunk methods
-    def update_cyberpunk_chars_list(self):
-        self.cyberpunk_chars_combo['values'] = list(self.cyberpunk_data.keys())
-        if self.cyberpunk_chars_combo['values']:
-            self.cyberpunk_chars_combo.current(0)
-            self.load_cyberpunk_character()
-
-    def new_cyberpunk_character(self):
-        name = simpledialog.askstring("Nova Ficha Cyberpunk", "Nome da nova ficha:")
-        if name and name.strip():
-            if name in self.cyberpunk_data:
-                messagebox.showerror("Erro", "Já existe uma ficha com este nome!")
-                return
-            self.cyberpunk_data[name] = {
-                'attributes': {'forca': 5, 'dex': 22, 'con': 9, 'sab': 10, 'int': 11, 'tech': 10, 'car': 4},
-                'modifiers': {'forca': -2, 'dex': 6, 'con': 1, 'sab': 1, 'int': 2, 'tech': 1, 'car': -3},
-                'life': 50,
-                'max_life': 50,
-                'humanity': 100,
-                'money': 1000,
-                'level': 1,
-                'cyberware': [],
-                'inventory': []
-            }
-            self.save_character_data()
-            self.update_cyberpunk_chars_list()
-            self.cyberpunk_chars.set(name)
-            self.load_cyberpunk_character()
-            messagebox.showinfo("Sucesso", f"Ficha '{name}' criada e salva!")
-
-    def load_cyberpunk_character(self, event=None):
-        name = self.cyberpunk_chars.get()
-        if name in self.cyberpunk_data:
-            data = self.cyberpunk_data[name]
-            for attr in self.cyberpunk_attrs:
-                self.cyberpunk_attrs[attr].set(data['attributes'][attr])
-            for mod in self.cyberpunk_mods:
-                self.cyberpunk_mods[mod].set(data['modifiers'][mod])
-            self.cyberpunk_life.set(data['life'])
-            self.cyberpunk_max_life.set(data['max_life'])
-            self.cyberpunk_humanity.set(data['humanity'])
-            self.cyberpunk_money.set(data['money'])
-            self.cyberpunk_level.set(data.get('level', 1))
-            self.cyberware_listbox.delete(0, tk.END)
-            for item in data['cyberware']:
-                self.cyberware_listbox.insert(tk.END, item)
-            self.inventory_listbox.delete(0, tk.END)
-            for item in data['inventory']:
-                self.inventory_listbox.insert(tk.END, item)
-
-    def rename_cyberpunk_character(self):
-        current_name = self.cyberpunk_chars.get()
-        if not current_name:
-            messagebox.showerror("Erro", "Nenhuma ficha selecionada!")
-            return
-        new_name = simpledialog.askstring("Renomear Ficha", f"Novo nome para '{current_name}':")
-        if new_name and new_name.strip() and new_name != current_name:
-            if new_name in self.cyberpunk_data:
-                messagebox.showerror("Erro", "Já existe uma ficha com este nome!")
-                return
-            self.cyberpunk_data[new_name] = self.cyberpunk_data.pop(current_name)
-            self.save_character_data()
-            self.update_cyberpunk_chars_list()
-            self.cyberpunk_chars.set(new_name)
-            messagebox.showinfo("Sucesso", f"Ficha renomeada para '{new_name}'!")
-
-    def delete_cyberpunk_character(self):
-        current_name = self.cyberpunk_chars.get()
-        if not current_name:
-            messagebox.showerror("Erro", "Nenhuma ficha selecionada!")
-            return
-        if messagebox.askyesno("Confirmar", f"Deseja excluir a ficha '{current_name}'?"):
-            del self.cyberpunk_data[current_name]
-            self.save_character_data()
-            self.update_cyberpunk_chars_list()
-            messagebox.showinfo("Sucesso", f"Ficha '{current_name}' excluída!")
-
-    def update_cyberpunk_attribute(self, attr, value):
-        name = self.cyberpunk_chars.get()
-        if name in self.cyberpunk_data:
-            self.cyberpunk_data[name]['attributes'][attr] = value
-            self.save_character_data()
-
-    def update_cyberpunk_modifier(self, attr, value):
-        name = self.cyberpunk_chars.get()
-        if name in self.cyberpunk_data:
-            self.cyberpunk_data[name]['modifiers'][attr] = value
-            self.save_character_data()
-
-    def add_cyberware(self):
-        item = self.new_cyberware.get().strip()
-        if item:
-            self.cyberware_listbox.insert(tk.END, item)
-            self.new_cyberware.set("")
-            name = self.cyberpunk_chars.get()
-            if name in self.cyberpunk_data:
-                self.cyberpunk_data[name]['cyberware'] = list(self.cyberware_listbox.get(0, tk.END))
-            self.save_character_data()
-
-    def remove_cyberware(self):
-        selection = self.cyberware_listbox.curselection()
-        if selection:
-            self.cyberware_listbox.delete(selection[0])
-            name = self.cyberpunk_chars.get()
-            if name in self.cyberpunk_data:
-                self.cyberpunk_data[name]['cyberware'] = list(self.cyberware_listbox.get(0, tk.END))
-                self.save_character_data()
-
-    def add_inventory_item(self):
-        item = self.new_inventory_item.get().strip()
-        if item:
-            self.inventory_listbox.insert(tk.END, item)
-            self.new_inventory_item.set("")
-            name = self.cyberpunk_chars.get()
-            if name in self.cyberpunk_data:
-                self.cyberpunk_data[name]['inventory'] = list(self.inventory_listbox.get(0, tk.END))
-                self.save_character_data()
-
-    def remove_inventory_item(self):
-        selection = self.inventory_listbox.curselection()
-        if selection:
-            self.inventory_listbox.delete(selection[0])
-            name = self.cyberpunk_chars.get()
-            if name in self.cyberpunk_data:
-                self.cyberpunk_data[name]['inventory'] = list(self.inventory_listbox.get(0, tk.END))
-                self.save_character_data()
-
-    def update_cyberpunk_life(self):
-        name = self.cyberpunk_chars.get()
-        if name in self.cyberpunk_data:
-            self.cyberpunk_data[name]['life'] = self.cyberpunk_life.get()
-            self.save_character_data()
-
-    def update_cyberpunk_max_life(self):
-        name = self.cyberpunk_chars.get()
-        if name in self.cyberpunk_data:
-            self.cyberpunk_data[name]['max_life'] = self.cyberpunk_max_life.get()
-            self.save_character_data()
-
-    def update_cyberpunk_humanity(self):
-        name = self.cyberpunk_chars.get()
-        if name in self.cyberpunk_data:
-            self.cyberpunk_data[name]['humanity'] = self.cyberpunk_humanity.get()
-            self.save_character_data()
-
-    def update_cyberpunk_money(self):
-        name = self.cyberpunk_chars.get()
-        if name in self.cyberpunk_data:
-            self.cyberpunk_data[name]['money'] = self.cyberpunk_money.get()
-            self.save_character_data()
-
-    def update_cyberpunk_level(self):
-        name = self.cyberpunk_chars.get()
-        if name in self.cyberpunk_data:
-            self.cyberpunk_data[name]['level'] = self.cyberpunk_level.get()
-            self.save_character_data()
-
-    # --- WARHAMMER COM SCROLL ---
-    def setup_warhammer_tab(self, parent):
-        frame = ScrollableFrame(parent)
-        frame.pack(fill=tk.BOTH, expand=True)
-        sf = frame.scrollable_frame
-
-        chars_frame = tb.Labelframe(sf, text="Gerenciamento de Fichas", bootstyle="info")
-        chars_frame.pack(fill=tk.X, pady=5)
-        chars_control_frame = tb.Frame(chars_frame)
-        chars_control_frame.pack(fill=tk.X, pady=5)
-        tb.Label(chars_control_frame, text="Ficha atual:").pack(side=tk.LEFT)
-        self.warhammer_chars_var = tk.StringVar()
-        self.warhammer_chars_combo = ttk.Combobox(chars_control_frame, textvariable=self.warhammer_chars_var, state="readonly")
-        self.warhammer_chars_combo.pack(side=tk.LEFT, padx=5)
-        self.warhammer_chars_combo.bind("<<ComboboxSelected>>", self.load_warhammer_character)
-        tb.Button(chars_control_frame, text="Nova Ficha", command=self.new_warhammer_character, bootstyle="success-outline").pack(side=tk.LEFT, padx=2)
-        tb.Button(chars_control_frame, text="Renomear", command=self.rename_warhammer_character, bootstyle="info-outline").pack(side=tk.LEFT, padx=2)
-        tb.Button(chars_control_frame, text="Excluir", command=self.delete_warhammer_character, bootstyle="danger-outline").pack(side=tk.LEFT, padx=2)
-
-        attributes_frame = tb.Labelframe(sf, text="Atributos", bootstyle="info")
-        attributes_frame.pack(fill=tk.X, pady=5)
-        self.warhammer_attrs = {}
-        attributes = [
-            ("Movimento", "mov", 4),
-            ("Habilidade com Arma", "hab_arma", 30),
-            ("Precisão de Tiro", "prec_tiro", 30),
-            ("Força", "forca", 3),
-            ("Resiliência", "res", 3),
-            ("Ferimentos", "fer", 1),
-            ("Iniciativa", "ini", 30),
-            ("Ataques", "ataq", 1),
-            ("Liderança", "lid", 6)
-        ]
-        for name, key, default_val in attributes:
-            attr_frame = tb.Frame(attributes_frame)
-            attr_frame.pack(fill=tk.X, pady=2)
-            tb.Label(attr_frame, text=f"{name}:").pack(side=tk.LEFT)
-            var = tk.IntVar(value=default_val)
-            tb.Spinbox(attr_frame, from_=1, to=100, textvariable=var, width=5,
-                       command=lambda k=key, v=var: self.update_warhammer_attribute(k, v.get())).pack(side=tk.LEFT, padx=2)
-            self.warhammer_attrs[key] = var
-
-        life_frame = tb.Labelframe(sf, text="Vida do Personagem", bootstyle="danger")
-        life_frame.pack(fill=tk.X, pady=5)
-        tb.Label(life_frame, text="Vida Atual:").pack(side=tk.LEFT)
-        self.warhammer_current_life = tk.IntVar(value=10)
-        tb.Spinbox(life_frame, from_=0, to=100, textvariable=self.warhammer_current_life, width=5,
-                   command=lambda: self.update_warhammer_current_life()).pack(side=tk.LEFT, padx=5)
-        tb.Label(life_frame, text="Vida Máxima:").pack(side=tk.LEFT)
-        self.warhammer_max_life = tk.IntVar(value=10)
-        tb.Spinbox(life_frame, from_=1, to=100, textvariable=self.warhammer_max_life, width=5,
-                   command=lambda: self.update_warhammer_max_life()).pack(side=tk.LEFT, padx=5)
-        self.warhammer_level = tk.IntVar(value=1)
-        tb.Label(life_frame, text="Level:").pack(side=tk.LEFT)
-        tb.Spinbox(life_frame, from_=1, to=99, textvariable=self.warhammer_level, width=4,
-                   command=lambda: self.update_warhammer_level()).pack(side=tk.LEFT, padx=5)
-
-        skills_frame = tb.Labelframe(sf, text="Perícias (Marque até 4)", bootstyle="primary")
-        skills_frame.pack(fill=tk.X, pady=5)
-        skills = [
-            "Lógica", "Carisma", "Conhecimento", "Medicina", 
-            "Pilotagem", "Explosivos", "Intimidar", "Procurar", "Tecnologia"
-        ]
-        self.warhammer_skills_vars = {}
-        for skill in skills:
-            var = tk.BooleanVar(value=False)
-            cb = tb.Checkbutton(skills_frame, text=skill, variable=var,
-                           bootstyle="primary-square-toggle",
-                           command=lambda s=skill, v=var: self.update_warhammer_skill(s, v.get()))
-            cb.pack(anchor="w", pady=2)
-            self.warhammer_skills_vars[skill] = var
-
-        armor_frame = tb.Labelframe(sf, text="Armaduras", bootstyle="warning")
-        armor_frame.pack(fill=tk.X, pady=5)
-        armors = [
-            ("Couro", 1),
-            ("Couro Reforçado", 2),
-            ("Cota de Malha", 3),
-            ("Placas", 4)
-        ]
-        self.warhammer_armor_var = tk.StringVar(value="Couro")
-        for armor, value in armors:
-            tb.Radiobutton(armor_frame, text=f"{armor} (Proteção: {value})",
-                       variable=self.warhammer_armor_var, value=armor,
-                       bootstyle="info-round-toggle",
-                       command=lambda: self.save_character_data()).pack(anchor="w", pady=1)
-
-        weapons_frame = tb.Labelframe(sf, text="Armas", bootstyle="danger")
-        weapons_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        self.weapons_listbox = tk.Listbox(weapons_frame, height=6)
-        self.weapons_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        weapon_entry = tb.Entry(weapons_frame, width=18)
-        weapon_entry.pack(side=tk.LEFT, padx=5)
-        tb.Button(weapons_frame, text="Adicionar", bootstyle="success-outline",
-              command=lambda: self.add_weapon(weapon_entry)).pack(side=tk.LEFT, padx=5)
-        tb.Button(weapons_frame, text="Remover", bootstyle="danger-outline",
-              command=self.remove_weapon).pack(side=tk.LEFT, padx=5)
-
-        equipment_frame = tb.Labelframe(sf, text="Equipamentos", bootstyle="success")
-        equipment_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        self.equipment_listbox = tk.Listbox(equipment_frame, height=6)
-        self.equipment_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        equipment_entry = tb.Entry(equipment_frame, width=18)
-        equipment_entry.pack(side=tk.LEFT, padx=5)
-        tb.Button(equipment_frame, text="Adicionar", bootstyle="success-outline",
-              command=lambda: self.add_equipment(equipment_entry)).pack(side=tk.LEFT, padx=5)
-        tb.Button(equipment_frame, text="Remover", bootstyle="danger-outline",
-              command=self.remove_equipment).pack(side=tk.LEFT, padx=5)
-
-        notes_frame = tb.Labelframe(sf, text="Observações", bootstyle="secondary")
-        notes_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        self.warhammer_notes = tk.Text(notes_frame, height=6)
-        self.warhammer_notes.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        self.warhammer_level = tk.IntVar(value=1)
-        tb.Button(notes_frame, text="Salvar Observações", command=self.save_notes, bootstyle="primary-outline").pack(pady=5)
-
-        self.update_warhammer_chars_list()
-        if self.warhammer_chars_combo['values']:
-            self.warhammer_chars_combo.current(0)
-            self.load_warhammer_character()
-
-    # Missing Warhammer methods
-    def update_warhammer_chars_list(self):
-        self.warhammer_chars_combo['values'] = list(self.warhammer_data.keys())
-        if self.warhammer_chars_combo['values']:
-            self.warhammer_chars_var.set(self.warhammer_chars_combo['values'][0])
-            self.load_warhammer_character()
-
-    def new_warhammer_character(self):
-        name = simpledialog.askstring("Nova Ficha Warhammer", "Nome da nova ficha:")
-        if name and name.strip():
-            if name in self.warhammer_data:
-                messagebox.showerror("Erro", "Já existe uma ficha com este nome!")
-                return
-            self.warhammer_data[name] = {
-                'attributes': {'mov': 4, 'hab_arma': 30, 'prec_tiro': 30, 'forca': 3, 'res': 3, 'fer': 1, 'ini': 30, 'ataq': 1, 'lid': 6},
-                'current_life': 10,
-                'max_life': 10,
-                'level': 1,
-                'skills': {skill: False for skill in ["Lógica", "Carisma", "Conhecimento", "Medicina", "Pilotagem", "Explosivos", "Intimidar", "Procurar", "Tecnologia"]},
-                'armor': "Couro",
-                'weapons': [],
-                'equipment': [],
-                'notes': ""
-            }
-            self.save_character_data()
-            self.update_warhammer_chars_list()
-            self.warhammer_chars_var.set(name)
-            self.load_warhammer_character()
-            messagebox.showinfo("Sucesso", f"Ficha '{name}' criada e salva!")
-
-    def load_warhammer_character(self, event=None):
-        name = self.warhammer_chars_var.get()
-        if name in self.warhammer_data:
-            data = self.warhammer_data[name]
-            for attr in self.warhammer_attrs:
-                self.warhammer_attrs[attr].set(data['attributes'].get(attr, 0))
-            self.warhammer_current_life.set(data.get('current_life', 10))
-            self.warhammer_max_life.set(data.get('max_life', 10))
-            self.warhammer_level.set(data.get('level', 1))
-            for skill in self.warhammer_skills_vars:
-                self.warhammer_skills_vars[skill].set(data['skills'].get(skill, False))
-            self.warhammer_armor_var.set(data.get('armor', 'Couro'))
-            self.weapons_listbox.delete(0, tk.END)
-            weapons = data.get('weapons', [])
-            for weapon in weapons:
-                self.weapons_listbox.insert(tk.END, weapon)
-            self.equipment_listbox.delete(0, tk.END)
-            equipment = data.get('equipment', [])
-            for eq in equipment:
-                self.equipment_listbox.insert(tk.END, eq)
-            self.warhammer_notes.delete(1.0, tk.END)
-            notes = data.get('notes', '')
-            self.warhammer_notes.insert(1.0, notes)
-
-    def rename_warhammer_character(self):
-        current_name = self.warhammer_chars_var.get()
-        if not current_name:
-            messagebox.showerror("Erro", "Nenhuma ficha selecionada!")
-            return
-        new_name = simpledialog.askstring("Renomear Ficha", f"Novo nome para '{current_name}':")
-        if new_name and new_name.strip() and new_name != current_name:
-            if new_name in self.warhammer_data:
-                messagebox.showerror("Erro", "Já existe uma ficha com este nome!")
-                return
-            self.warhammer_data[new_name] = self.warhammer_data.pop(current_name)
-            self.save_character_data()
-            self.update_warhammer_chars_list()
-            self.warhammer_chars_var.set(new_name)
-            messagebox.showinfo("Sucesso", f"Ficha renomeada para '{new_name}'!")
-
-    def delete_warhammer_character(self):
-        current_name = self.warhammer_chars_var.get()
-        if not current_name:
-            messagebox.showerror("Erro", "Nenhuma ficha selecionada!")
-            return
-        if messagebox.askyesno("Confirmar", f"Deseja excluir a ficha '{current_name}'?"):
-            del self.warhammer_data[current_name]
-            self.save_character_data()
-            self.update_warhammer_chars_list()
-            messagebox.showinfo("Sucesso", f"Ficha '{current_name}' excluída!")
-
-    def update_warhammer_attribute(self, attr, value):
-        name = self.warhammer_chars_var.get()
-        if name in self.warhammer_data:
-            self.warhammer_data[name]['attributes'][attr] = value
-            self.save_character_data()
-
-    def update_warhammer_skill(self, skill, value):
-        name = self.warhammer_chars_var.get()
-        if name in self.warhammer_data:
-            self.warhammer_data[name]['skills'][skill] = value
-            self.save_character_data()
-
-    def add_weapon(self, entry):
-        weapon = entry.get().strip()
-        if weapon:
-            self.weapons_listbox.insert(tk.END, weapon)
-            entry.delete(0, tk.END)
-            name = self.warhammer_chars_var.get()
-            if name in self.warhammer_data:
-                self.warhammer_data[name]['weapons'] = list(self.weapons_listbox.get(0, tk.END))
-                self.save_character_data()
-
-    def add_equipment(self, entry):
-        equipment = entry.get().strip()
-        if equipment:
-            self.equipment_listbox.insert(tk.END, equipment)
-            entry.delete(0, tk.END)
-            name = self.warhammer_chars_var.get()
-            if name in self.warhammer_data:
-                self.warhammer_data[name]['equipment'] = list(self.equipment_listbox.get(0, tk.END))
-                self.save_character_data()
+        builders = {}
+        for system in ('demi', 'nahobino', 'samurai', 'persona_user'):
+            frame = tb.Frame(smt_notebook, padding=10)
+            smt_notebook.add(frame, text=SCHEMAS[system].title)
+            builders[frame] = lambda f=frame, s=system: self.setup_sheet_tab(f, s)
+        self.lazy_tabs(smt_notebook, builders)
+
+    def setup_sheet_tab(self, parent, system):
+        """Uma aba de ficha montada pelo SheetView a partir do esquema do sistema"""
+        self.sheet_views[system] = SheetView(
+            parent, SCHEMAS[system],
+            sheets=lambda: self.character_data[system],
+            save=lambda name, *path: self.save_character_data(system, name, *path),
+            rename=lambda old_name, new_name: self.rename_character_data(system, old_name, new_name),
+            virtual=self.virtual_sheets,
+            monitor=self.loop_monitor
+        )
 
-    
     def reroll_dice(self):
         if self.last_roll:
-            dice, quantity, modifier, original_mode = self.last_roll
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            
-            mode = "desvantagem"
-            
-            roll_functions = {
-                "d4": self.roll_d4,
-                "d6": self.roll_d6,
-                "d8": self.roll_d8,
-                "d10": self.roll_d10,
-                "d12": self.roll_d12,
-                "d20": self.roll_d20,
-                "d100": self.roll_d100,
-                "dpercent": self.roll_dpercent
-            }
-            
-            roll_func = roll_functions[dice]
-            is_percent = (dice == "dpercent")
-            is_d20 = (dice == "d20")
-            
-            all_rolls = []
-            for _ in range(quantity):
-                roll1 = roll_func()
-                roll2 = roll_func()
-                roll = min(roll1, roll2)
-                roll_str = f"{roll1}{'%' if is_percent else ''}/{roll2}{'%' if is_percent else ''}→{roll}{'%' if is_percent else ''}"
-                all_rolls.append(roll_str)
-            
-            critical_text = ""
-            if is_d20 and quantity == 1:
-                roll_value = int(all_rolls[0].split('→')[-1]) if '→' in all_rolls[0] else int(all_rolls[0])
-               
-                if roll_value == 20:
-                    critical_text = " - 🗿 SUCESSO CRÍTICO!"
-                    self.result_label.configure(foreground="#0080ff")
-                elif roll_value == 1:
-                    critical_text = " - 💀 FALHA CRÍTICA!"
-                    self.result_label.configure(foreground="#ff0000")
-                else:
-                    self.result_label.configure(foreground="black" if not self.is_dark else "white")
-            else:
-                self.result_label.configure(foreground="black" if not self.is_dark else "white")
-            
-            if modifier != 0:
-                if dice == "d6" and quantity > 1:
-                    rolls_values = [int(r.split('→')[-1].replace('%', '')) if '→' in r else int(r.replace('%', '')) for r in all_rolls]
-                    total = sum(rolls_values)
-                    final = total + modifier
-                    result_text = f"Rerol (Desvantagem): {', '.join(all_rolls)} = {total} + {modifier} = {final}{critical_text}"
-                else:
-                    modified_rolls = []
-                    for r in all_rolls:
-                        roll_value = int(r.split('→')[-1].replace('%', '')) if '→' in r else int(r.replace('%', ''))
-                        modified_value = roll_value + modifier
-                        modified_rolls.append(f"{modified_value}{'%' if is_percent else ''}")
-                    
-                    mod_text = f" {'+' if modifier > 0 else ''}{modifier}{'%' if is_percent else ''} = "
-                    result_text = f"Rerol (Desvantagem): {', '.join(all_rolls)}{mod_text}{', '.join(modified_rolls)}{critical_text}"
-            else:
-                if dice == "d6" and quantity > 1:
-                    rolls_values = [int(r.split('→')[-1]) if '→' in r else int(r) for r in all_rolls]
-                    total = sum(rolls_values)
-                    result_text = f"Rerol (Desvantagem): {', '.join(all_rolls)} = {total}{critical_text}"
-                else:
-                    result_text = f"Rerol (Desvantagem): {', '.join(all_rolls)}{critical_text}"
-            
-            history_entry = {
-                'timestamp': timestamp,
-                'type': f"{dice} x{quantity}",
-                'mode': mode,
-                'modifier': modifier,
-                'rolls': all_rolls,
-                'display': result_text
-            }
-            
-            self.history.append(history_entry)
-            self.current_result.set(result_text)
-    
+            dice, quantity, modifier = self.last_roll
+            # Rerol é sempre em desvantagem
+            result = self.engine.roll(dice, quantity, "desvantagem", modifier, reroll=True)
+            self.show_result(result)
+
+    def show_result(self, result):
+        """Atualiza o rótulo (cor de crítico incluída) e guarda o resultado no histórico"""
+        self.animator.cancel("result_label")
+        if result.crit == CRIT_SUCCESS:
+            self.result_label.configure(foreground="#0080ff")
+        elif result.crit == CRIT_FAILURE:
+            self.result_label.configure(foreground="#ff0000")
+        else:
+            self.result_label.configure(foreground="black" if not self.is_dark else "white")
+        self.history.append(result)
+        self.roll_log.append(result)
+        self.roll_stats.add(result)
+        self.update_stats_panel()
+        if self.history_viewer and self.history_viewer.exists():
+            self.history_viewer.refresh()
+        self.current_result.set(result.display)
+
+    def roll_expression(self):
+        expression = self.expression.get().strip()
+        if not expression:
+            return
+        try:
+            plan = compile_expression(expression)
+        except ValueError as e:
+            from tkinter import messagebox
+            messagebox.showerror("Erro", str(e))
+            return
+        self.show_result(plan.roll(self.engine))
+
     def reset_dice(self):
         self.current_result.set("Selecione um dado e clique em Rolar!")
         self.last_roll = None
         self.reroll_button.config(state="disabled")
+        self.animator.cancel("result_label")
         self.result_label.configure(foreground="black" if not self.is_dark else "white")
     
     def show_history(self):
         if not self.history:
+            from tkinter import messagebox
             messagebox.showinfo("Histórico", "Nenhum lançamento registrado ainda!")
             return
-            
-        history_window = tb.Toplevel(self.root)
-        history_window.title("Histórico de Lançamentos")
-        history_window.geometry("700x400")
-        
-        main_frame = tb.Frame(history_window, padding="10")
-        main_frame.pack(fill=tk.BOTH, expand=True)
 
-        scrollbar = tb.Scrollbar(main_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        text_color = "black" if not self.is_dark else "white"
-        history_listbox = tk.Listbox(
-            main_frame,
-            yscrollcommand=scrollbar.set,
-            font=('Courier', 10),
-            selectmode=tk.SINGLE,
-            width=90,
-            height=20,
-            bg="#35E22C",
-            fg=text_color,
-            selectbackground="#2AB825",
-            selectforeground=text_color
-        )
-        history_listbox.pack(fill=tk.BOTH, expand=True)
-        
-        scrollbar.config(command=history_listbox.yview)
-        
-        for idx, entry in enumerate(reversed(self.history)):
-            display_text = f"[{entry['timestamp']}] {entry['display']}"
-            history_listbox.insert(tk.END, display_text)
-        
-        close_button = tb.Button(
-            history_window,
-            text="Fechar",
-            command=history_window.destroy,
-            bootstyle="secondary-outline"
-        )
-        close_button.pack(pady=10)
+        # Janela virtualizada: só as linhas visíveis são montadas
+        if self.history_viewer and self.history_viewer.exists():
+            self.history_viewer.window.lift()
+            self.history_viewer.refresh()
+            return
+        self.history_viewer = HistoryViewer(self.root, self.history, "black" if not self.is_dark else "white")
     
     def clear_history(self):
-        self.history = []
+        self.history.clear()
+        if not self.keep_stats.get():
+            self.roll_stats.reset()
+            self.update_stats_panel()
+        if self.history_viewer and self.history_viewer.exists():
+            self.history_viewer.refresh()
+        from tkinter import messagebox
         messagebox.showinfo("Histórico", "Histórico de lançamentos limpo com sucesso!")
 
 
-
-    def save_notes(self):
-        name = self.warhammer_chars_var.get()
-        if name in self.warhammer_data:
-            self.warhammer_data[name]['notes'] = self.warhammer_notes.get(1.0, tk.END).strip()
-            self.save_character_data()
-
-    def remove_weapon(self):
-        selection = self.weapons_listbox.curselection()
-        if selection:
-            self.weapons_listbox.delete(selection[0])
-            name = self.warhammer_chars_var.get()
-            if name in self.warhammer_data:
-                self.warhammer_data[name]['weapons'] = list(self.weapons_listbox.get(0, tk.END))
-                self.save_character_data()
-
-    def remove_equipment(self):
-        selection = self.equipment_listbox.curselection()
-        if selection:
-            self.equipment_listbox.delete(selection[0])
-            name = self.warhammer_chars_var.get()
-            if name in self.warhammer_data:
-                self.warhammer_data[name]['equipment'] = list(self.equipment_listbox.get(0, tk.END))
-                self.save_character_data()
-
-    def update_warhammer_current_life(self):
-        name = self.warhammer_chars_var.get()
-        if name in self.warhammer_data:
-            self.warhammer_data[name]['current_life'] = self.warhammer_current_life.get()
-            self.save_character_data()
-
-    def update_warhammer_max_life(self):
-        name = self.warhammer_chars_var.get()
-        if name in self.warhammer_data:
-            self.warhammer_data[name]['max_life'] = self.warhammer_max_life.get()
-            self.save_character_data()
-
-    def update_warhammer_level(self):
-        name = self.warhammer_chars_var.get()
-        if name in self.warhammer_data:
-            self.warhammer_data[name]['level'] = self.warhammer_level.get()
-            self.save_character_data()
-
     def roll_d4(self):
         return random.randint(1, 4)
     
@@ -2012,87 +681,52 @@ class DiceRollerApp:
         dice = self.dice_type.get()
         mode = self.roll_mode.get()
         quantity = self.num_dice.get()
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        
-        roll_functions = {
-            "d4": self.roll_d4,
-            "d6": self.roll_d6,
-            "d8": self.roll_d8,
-            "d10": self.roll_d10,
-            "d12": self.roll_d12,
-            "d20": self.roll_d20,
-            "d100": self.roll_d100,
-            "dpercent": self.roll_dpercent
-        }
-        
-        roll_func = roll_functions[dice]
-        is_percent = (dice == "dpercent")
-        is_d20 = (dice == "d20")
-        
-        all_rolls = []
-        for _ in range(quantity):
-            if mode == "normal":
-                roll = roll_func()
-                all_rolls.append(str(roll) + ("%" if is_percent else ""))
-            else:
-                roll1 = roll_func()
-                roll2 = roll_func()
-                roll = max(roll1, roll2) if mode == "vantagem" else min(roll1, roll2)
-                roll_str = f"{roll1}{'%' if is_percent else ''}/{roll2}{'%' if is_percent else ''}→{roll}{'%' if is_percent else ''}"
-                all_rolls.append(roll_str)
-        
-        critical_text = ""
-        if is_d20 and quantity == 1:
-            roll_value = int(all_rolls[0].split('→')[-1]) if '→' in all_rolls[0] else int(all_rolls[0])
-            if roll_value == 20:
-                critical_text = " - 🗿 SUCESSO CRÍTICO!"
-                self.result_label.configure(foreground="#0080ff")
-            elif roll_value == 1:
-                critical_text = " - 💀 FALHA CRÍTICA!"
-                self.result_label.configure(foreground="#ff0000")
-            else:
-                self.result_label.configure(foreground="black" if not self.is_dark else "white")
-        else:
-            self.result_label.configure(foreground="black" if not self.is_dark else "white")
-        
-        if modifier != 0:
-            if dice == "d6" and quantity > 1:
-                rolls_values = [int(r.split('→')[-1].replace('%', '')) if '→' in r else int(r.replace('%', '')) for r in all_rolls]
-                total = sum(rolls_values)
-                final = total + modifier
-                result_text = f"Resultado: {', '.join(all_rolls)} = {total} + {modifier} = {final}{critical_text}"
-            else:
-                modified_rolls = []
-                for r in all_rolls:
-                    roll_value = int(r.split('→')[-1].replace('%', '')) if '→' in r else int(r.replace('%', ''))
-                    modified_value = roll_value + modifier
-                    modified_rolls.append(f"{modified_value}{'%' if is_percent else ''}")
-                
-                mod_text = f" {'+' if modifier > 0 else ''}{modifier}{'%' if is_percent else ''} = "
-                result_text = f"Resultados: {', '.join(all_rolls)}{mod_text}{', '.join(modified_rolls)}{critical_text}"
-        else:
-            if dice == "d6" and quantity > 1:
-                rolls_values = [int(r.split('→')[-1]) if '→' in r else int(r) for r in all_rolls]
-                total = sum(rolls_values)
-                result_text = f"Resultado: {', '.join(all_rolls)} = {total}{critical_text}"
-            else:
-                result_text = f"Resultados: {', '.join(all_rolls)}{critical_text}"
-        
-        history_entry = {
-            'timestamp': timestamp,
-            'type': f"{dice} x{quantity}",
-            'mode': mode,
-            'modifier': modifier,
-            'rolls': all_rolls,
-            'display': result_text
-        }
-        
-        self.history.append(history_entry)
-        self.last_roll = (dice, quantity, modifier, mode)
-        self.current_result.set(result_text)
+
+        result = self.engine.roll(dice, quantity, mode, modifier)
+        self.show_result(result)
+        self.last_roll = (dice, quantity, modifier)
         self.reroll_button.config(state="normal")
     
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rolagem de Dados Avançada")
+    parser.add_argument("--sync-save", action="store_true", help="grava as fichas na thread da UI (comportamento antigo, para comparação)")
+    parser.add_argument("--save-timing", action="store_true", help="mostra ao sair o tempo de UI gasto por edição de ficha")
+    parser.add_argument("--storage", choices=["json", "sqlite"], default="json",
+                        help="onde guardar fichas e rolagens (sqlite importa os dados em JSON na primeira vez)")
+    parser.add_argument("--debug", action="store_true", help="mostra o tempo de inicialização e a contagem de widgets")
+    parser.add_argument("--virtual-sheets", action="store_true",
+                        help="nas fichas, só mantém widgets para as seções visíveis (fichas muito longas)")
+    parser.add_argument("--bench-theme", type=int, metavar="N",
+                        help="alterna o tema N vezes depois de abrir, mostra a latência e sai")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="mede carga das fichas, montagem das abas, primeiro idle e imports; "
+                             "grava startup_profile.txt e startup_profile.prof e sai")
+    args = parser.parse_args()
+
+    profiler = None
+    if args.profile_startup:
+        from startup_profile import StartupProfiler
+        profiler = StartupProfiler()
+        for method in ("load_character_data", "setup_character_tab", "setup_smt_tab", "setup_sheet_tab"):
+            profiler.wrap(DiceRollerApp, method)
+        profiler.profile.enable()
+        profiler.mark("app")
+
     root = tb.Window(themename="darkly")
-    app = DiceRollerApp(root)
+    app = DiceRollerApp(root, sync_save=args.sync_save, save_timing=args.save_timing, storage=args.storage, debug=args.debug,
+                        virtual_sheets=args.virtual_sheets)
+    if args.bench_theme:
+        root.after(500, lambda: app.benchmark_theme(args.bench_theme))
+    if profiler:
+        profiler.phase_since("janela + DiceRollerApp.__init__", "app")
+
+        def finish_profile():
+            profiler.phase_since("primeiro idle do mainloop", "mainloop")
+            app.build_pending_tabs()  # abas que a inicialização deixou para depois também entram no relatório
+            print(f"Relatório de inicialização em {profiler.write_report()}")
+            app.on_close()
+
+        # after(0) dentro do after_idle: roda depois de todo o lote de idle (redesenho incluído)
+        root.after_idle(lambda: root.after(0, finish_profile))
+        profiler.mark("mainloop")
     root.mainloop()
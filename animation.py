@@ -0,0 +1,80 @@
+import time
+
+FRAME_MS = 16  # ~60 fps
+FRAME_BUDGET = 0.008  # segundos de trabalho por quadro; o resto fica para o próximo
+
+
+def parse_color(color):
+    color = color.lstrip("#")
+    return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def lerp_color(start, end, t):
+    """Interpola duas cores '#rrggbb' (t de 0 a 1)"""
+    a, b = parse_color(start), parse_color(end)
+    return "#%02x%02x%02x" % tuple(round(x + (y - x) * t) for x, y in zip(a, b))
+
+
+class Animator:
+    """
+    Um único timer para todas as animações da interface: a cada quadro cada
+    animação recebe t (0 a 1) calculado pelo relógio, não pelo número de
+    passos. Se o quadro atrasar ou estourar o orçamento, as animações
+    restantes pulam esse quadro e continuam do ponto certo no próximo; nada
+    fica enfileirado.
+
+    `animate(key, duration, update, done)`: `update(t)` aplica o quadro e
+    `done()` roda no fim. Uma nova animação com a mesma chave substitui a
+    anterior.
+    """
+
+    def __init__(self, root, frame_ms=FRAME_MS, budget=FRAME_BUDGET):
+        self.root = root
+        self.frame_ms = frame_ms
+        self.budget = budget
+        self.animations = {}  # chave -> [início, duração, update, done]
+        self.after_id = None
+        self.last_tick = None
+        self.frames = 0
+        self.dropped = 0
+
+    def animate(self, key, duration, update, done=None):
+        self.animations[key] = [time.perf_counter(), duration, update, done]
+        if self.after_id is None:
+            self.last_tick = time.perf_counter()
+            self.after_id = self.root.after(0, self.tick)
+
+    def cancel(self, key):
+        self.animations.pop(key, None)
+
+    def tick(self):
+        start = time.perf_counter()
+        self.frames += 1
+        late = start - self.last_tick - self.frame_ms / 1000
+        if late > 0:
+            self.dropped += int(late * 1000 // self.frame_ms)
+        self.last_tick = start
+
+        for key in list(self.animations):
+            if time.perf_counter() - start > self.budget:
+                self.dropped += 1
+                break  # o resto espera o próximo quadro
+            animation = self.animations.get(key)
+            if animation is None:
+                continue
+            began, duration, update, done = animation
+            t = min(1.0, (start - began) / duration) if duration > 0 else 1.0
+            update(t)
+            if t >= 1.0:
+                del self.animations[key]
+                if done:
+                    done()
+            else:
+                # quem foi atualizado vai para o fim da fila, para ninguém ficar sempre de fora
+                self.animations[key] = self.animations.pop(key)
+
+        if self.animations:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.after_id = self.root.after(max(1, int(self.frame_ms - elapsed_ms)), self.tick)
+        else:
+            self.after_id = None
@@ -0,0 +1,336 @@
+import json
+import marshal
+import os
+import threading
+import uuid
+
+SYSTEMS = ("demi", "nahobino", "samurai", "persona_user", "cyberpunk", "warhammer")
+
+DEFAULT_STORE_DIR = "fichas"
+LEGACY_DATA_PATH = "character_data.json"  # arquivo único usado antes dos shards
+COMPACT_RECORDS = 200  # registros no diário antes de compactar nos shards
+
+
+def atomic_write(path, content):
+    """Escreve em um arquivo temporário, faz fsync e troca pelo original com rename"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_dir(os.path.dirname(os.path.abspath(path)))
+
+
+def atomic_write_json(path, data):
+    atomic_write(path, json.dumps(data).encode("utf-8"))
+
+
+def _fsync_dir(directory):
+    # Garante que o rename chegou ao disco (não existe no Windows)
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def encode_edit(path, value=None, delete=False):
+    """
+    Registro de diário para um campo: `path` vai do sistema até o campo,
+    ex.: ["cyberpunk", "V", "attributes", "dex"]. Serializado na hora, para
+    a thread de gravação não ler dicts que a interface ainda vai alterar.
+    """
+    record = {"p": list(path), "d": 1} if delete else {"p": list(path), "v": value}
+    return json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def encode_rename(system, old_name, new_name):
+    record = {"p": [system, old_name], "m": new_name}
+    return json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def apply_edit(data, record):
+    *parents, key = record["p"]
+    target = data
+    for part in parents:
+        target = target.setdefault(part, {})
+    if "m" in record:
+        target[record["m"]] = target.pop(key)
+    elif record.get("d"):
+        target.pop(key, None)
+    else:
+        target[key] = record["v"]
+
+
+class _Unloaded:
+    __slots__ = ("shard",)
+
+    def __init__(self, shard):
+        self.shard = shard
+
+
+class LazySheets(dict):
+    """
+    dict nome -> ficha de um sistema. Fichas ainda não abertas ficam como
+    marcadores e só são lidas do shard no primeiro acesso; `pop` devolve o
+    marcador sem ler, então renomear não toca no disco.
+    """
+
+    def __init__(self, read, shards=()):
+        super().__init__((name, _Unloaded(shard)) for name, shard in shards)
+        self.read = read
+
+    def __getitem__(self, name):
+        sheet = super().__getitem__(name)
+        if isinstance(sheet, _Unloaded):
+            sheet = self.read(sheet.shard)
+            super().__setitem__(name, sheet)
+        return sheet
+
+    def get(self, name, default=None):
+        return self[name] if name in self else default
+
+    def setdefault(self, name, default=None):
+        if name not in self:
+            super().__setitem__(name, default)
+        return self[name]
+
+    def values(self):
+        return [self[name] for name in self]
+
+    def items(self):
+        return [(name, self[name]) for name in self]
+
+    def is_loaded(self, name):
+        return not isinstance(super().get(name), _Unloaded)
+
+
+class LazySystems(dict):
+    """
+    dict sistema -> LazySheets. O índice de cada sistema só é lido na
+    primeira vez que o sistema é usado (aba ou combobox aberta).
+    """
+
+    def __init__(self, load_system):
+        super().__init__()
+        self.load_system = load_system
+
+    def __missing__(self, system):
+        sheets = self.load_system(system)
+        self[system] = sheets
+        return sheets
+
+    def setdefault(self, system, default=None):
+        return self[system]
+
+
+class PendingChanges:
+    """
+    Fichas alteradas desde a última compactação: renomeações (em ordem) e o
+    conjunto de (sistema, nome) sujos. `collect` tira o snapshot só dessas.
+    """
+
+    def __init__(self):
+        self.renames = []
+        self.dirty = {}
+
+    def __len__(self):
+        return len(self.renames) + len(self.dirty)
+
+    def touch(self, system, name):
+        self.dirty[(system, name)] = None
+
+    def rename(self, system, old_name, new_name):
+        self.renames.append((system, old_name, new_name))
+        if (system, old_name) in self.dirty:
+            del self.dirty[(system, old_name)]
+            self.touch(system, new_name)
+
+    def record(self, record):
+        system, name = record["p"][:2]
+        if "m" in record:
+            self.rename(system, name, record["m"])
+        else:
+            self.touch(system, name)
+
+    def collect(self, data):
+        """
+        Cópia profunda rápida (marshal) das fichas sujas, para a thread de
+        gravação não ler dicts que a interface está alterando. None marca
+        ficha excluída.
+        """
+        sheets = []
+        for system, name in self.dirty:
+            sheets_of_system = data[system]
+            if name not in sheets_of_system:
+                sheets.append((system, name, None))
+            elif sheets_of_system.is_loaded(name):
+                sheets.append((system, name, sheets_of_system[name]))
+        changes = {"renames": list(self.renames), "sheets": marshal.loads(marshal.dumps(sheets))}
+        self.renames.clear()
+        self.dirty.clear()
+        return changes
+
+
+class ShardedCharacterStore:
+    """
+    Uma ficha por arquivo (fichas/<sistema>-<id>.json) e um index.jsonl com
+    uma linha "<sistema>\t<json nome -> shard>" por sistema.
+
+    Cada edição acrescenta poucos bytes ao diário; de tempos em tempos só as
+    fichas alteradas são compactadas nos seus shards (temp + fsync + rename)
+    e o diário é zerado. Renomear só muda o índice. Ao carregar, o índice é
+    só separado em linhas: cada sistema é decodificado quando usado pela
+    primeira vez, e os que não foram usados voltam para o índice com os
+    mesmos bytes. Os shards são lidos quando a ficha é aberta.
+    """
+
+    compacts_edits = True  # compact() grava tudo o que as edições anteriores do diário mudaram
+
+    def __init__(self, directory=DEFAULT_STORE_DIR, legacy_path=LEGACY_DATA_PATH):
+        self.directory = directory
+        self.legacy_path = legacy_path
+        self.index_path = os.path.join(directory, "index.jsonl")
+        self.journal_path = os.path.join(directory, "journal.jsonl")
+        self.index = {}  # sistemas já decodificados
+        self.index_raw = {}  # sistemas ainda em bytes, como estão no arquivo
+        self.lock = threading.Lock()  # índice é lido pela interface e gravado pela thread de gravação
+        self.journal = None
+
+    def shard_path(self, shard):
+        return os.path.join(self.directory, shard)
+
+    def read_shard(self, shard):
+        with open(self.shard_path(shard), "r") as f:
+            return json.load(f)
+
+    def system_index(self, system):
+        with self.lock:
+            names = self.index.get(system)
+            if names is None:
+                raw = self.index_raw.pop(system, None)
+                names = self.index[system] = json.loads(raw) if raw else {}
+            return names
+
+    def load_system(self, system):
+        return LazySheets(self.read_shard, list(self.system_index(system).items()))
+
+    def load(self):
+        os.makedirs(self.directory, exist_ok=True)
+        old_index_path = os.path.join(self.directory, "index.json")
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "rb") as f:
+                for line in f:
+                    system, _, raw = line.rstrip(b"\n").partition(b"\t")
+                    self.index_raw[system.decode("utf-8")] = raw
+        elif os.path.exists(old_index_path):
+            # índice em um JSON só (versão anterior): converte para uma linha por sistema
+            with open(old_index_path, "r") as f:
+                self.index.update(json.load(f))
+            self.write_index()
+            os.remove(old_index_path)
+        elif os.path.exists(self.legacy_path):
+            self._import_legacy()
+        data = LazySystems(self.load_system)
+
+        changes = PendingChanges()
+        torn = False
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "rb") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        torn = True  # última linha cortada por uma queda
+                        break
+                    apply_edit(data, record)
+                    changes.record(record)
+        if changes or torn:
+            # Zera o diário também quando só há a linha cortada: a próxima
+            # edição seria acrescentada colada nela e se perderia na leitura
+            self.compact(changes.collect(data))
+        return data
+
+    def _import_legacy(self):
+        """Migração única do character_data.json para shards (o arquivo antigo fica intacto)"""
+        with open(self.legacy_path, "r") as f:
+            legacy = json.load(f)
+        legacy_journal = f"{self.legacy_path}.journal"
+        if os.path.exists(legacy_journal):
+            with open(legacy_journal, "rb") as f:
+                for line in f:
+                    try:
+                        apply_edit(legacy, json.loads(line))
+                    except ValueError:
+                        break
+        sheets = [(system, name, sheet) for system in SYSTEMS
+                  for name, sheet in legacy.get(system, {}).items()]
+        self.compact({"renames": [], "sheets": sheets})
+
+    def append(self, lines):
+        """Acrescenta registros já serializados ao diário, com um único fsync"""
+        if self.journal is None:
+            self.journal = open(self.journal_path, "ab")
+        self.journal.write(b"".join(lines))
+        self.journal.flush()
+        os.fsync(self.journal.fileno())
+
+    def compact(self, changes):
+        """Grava as fichas alteradas e o índice, depois zera o diário"""
+        index_changed = False
+        removed = []
+        for system, old_name, new_name in changes["renames"]:
+            names = self.system_index(system)
+            if old_name in names:
+                if new_name in names:
+                    removed.append(names[new_name])
+                names[new_name] = names.pop(old_name)
+                index_changed = True
+        for system, name, sheet in changes["sheets"]:
+            names = self.system_index(system)
+            if sheet is None:
+                if name in names:
+                    removed.append(names.pop(name))
+                    index_changed = True
+                continue
+            if name not in names:
+                names[name] = f"{system}-{uuid.uuid4().hex[:12]}.json"
+                index_changed = True
+            atomic_write_json(self.shard_path(names[name]), sheet)
+        if index_changed:
+            self.write_index()
+        for shard in removed:
+            try:
+                os.remove(self.shard_path(shard))
+            except FileNotFoundError:
+                pass
+
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+        with open(self.journal_path, "wb") as f:
+            f.flush()
+            os.fsync(f.fileno())
+
+    def write_index(self):
+        """Sistemas não usados nesta sessão são gravados com os bytes lidos, sem decodificar"""
+        with self.lock:
+            lines = []
+            for system in sorted(set(self.index) | set(self.index_raw)):
+                if system in self.index:
+                    raw = json.dumps(self.index[system]).encode("utf-8")
+                else:
+                    raw = self.index_raw[system]
+                lines.append(system.encode("utf-8") + b"\t" + raw + b"\n")
+        atomic_write(self.index_path, b"".join(lines))
+
+    def close(self):
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
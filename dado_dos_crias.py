@@ -2,7 +2,9 @@ import random
 import tkinter as tk
 import ttkbootstrap as tb
 from tkinter import messagebox
-from datetime import datetime
+from dice_engine import CRIT_FAILURE, CRIT_SUCCESS, SUMMED_FORMAT_TOTAL, DiceEngine
+from history_viewer import HistoryViewer
+from roll_history import RollHistory
 
 class DiceRollerApp:
     def __init__(self, root):
@@ -20,7 +22,20 @@ class DiceRollerApp:
         self.modifier = tk.IntVar(value=0)
         self.roll_mode = tk.StringVar(value="normal")
         self.num_dice = tk.IntVar(value=1)
-        self.history = []
+        self.history = RollHistory(summed_format=SUMMED_FORMAT_TOTAL)  # d6 somado no texto antigo: "12 (d6 x3)"
+        self.history_viewer = None
+
+        # Motor de rolagem compartilhado (as funções roll_d* ficam como fallback sem NumPy)
+        self.engine = DiceEngine(roll_functions={
+            "d4": self.roll_d4,
+            "d6": self.roll_d6,
+            "d8": self.roll_d8,
+            "d10": self.roll_d10,
+            "d12": self.roll_d12,
+            "d20": self.roll_d20,
+            "d100": self.roll_d100,
+            "dpercent": self.roll_dpercent
+        })
 
         # --- Botão alternar tema ---
         self.theme_button = tb.Button(
@@ -208,171 +223,32 @@ class DiceRollerApp:
         dice = self.dice_type.get()
         mode = self.roll_mode.get()
         quantity = self.num_dice.get()
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        
-        # Determina qual função de rolagem usar
-        roll_functions = {
-            "d4": self.roll_d4,
-            "d6": self.roll_d6,
-            "d8": self.roll_d8,
-            "d10": self.roll_d10,
-            "d12": self.roll_d12,
-            "d20": self.roll_d20,
-            "d100": self.roll_d100,
-            "dpercent": self.roll_dpercent
-        }
-        
-        roll_func = roll_functions[dice]
-        is_percent = (dice == "dpercent")
-        is_d20 = (dice == "d20")
-        
-        all_rolls = []
-        for _ in range(quantity):
-            if mode == "normal":
-                roll = roll_func()
-                all_rolls.append(str(roll) + ("%" if is_percent else ""))
-            else:
-                roll1 = roll_func()
-                roll2 = roll_func()
-                roll = max(roll1, roll2) if mode == "vantagem" else min(roll1, roll2)
-                roll_str = f"{roll1}{'%' if is_percent else ''}/{roll2}{'%' if is_percent else ''}→{roll}{'%' if is_percent else ''}"
-                all_rolls.append(roll_str)
-        
-        # Verifica se há críticos (apenas para d20)
-        critical_text = ""
-        if is_d20 and quantity == 1:
-            roll_value = int(all_rolls[0].split('→')[-1]) if '→' in all_rolls[0] else int(all_rolls[0])
-            if roll_value == 20:
-                critical_text = " - 🗿 SUCESSO CRÍTICO!"
-                self.result_label.configure(foreground="#0080ff")  # Azul para sucesso crítico
-            elif roll_value == 1:
-                critical_text = " - 💀 FALHA CRÍTICA!"
-                self.result_label.configure(foreground="#ff0000")  # Vermelho para falha crítica
-            else:
-                self.result_label.configure(foreground="white")  # Cor normal
-        else:
-            self.result_label.configure(foreground="white")  # Cor normal
-        
-        # Aplica modificador se necessário
-        if modifier != 0:
-            if dice == "d6" and quantity > 1:
-                # Caso especial: d6 com múltiplos dados soma primeiro
-                total = sum(int(r.split('→')[-1].replace('%', '')) if '→' in r else int(r.replace('%', '')) for r in all_rolls)
-                final = total + modifier
-                result_text = f"Resultado: {total} + {modifier} = {final} (d6 x{quantity}){critical_text}"
-            else:
-                modified_rolls = []
-                for r in all_rolls:
-                    roll_value = int(r.split('→')[-1].replace('%', '')) if '→' in r else int(r.replace('%', ''))
-                    modified_value = roll_value + modifier
-                    modified_rolls.append(f"{modified_value}{'%' if is_percent else ''}")
-                
-                mod_text = f" {'+' if modifier > 0 else ''}{modifier}{'%' if is_percent else ''} = "
-                result_text = f"Resultados: {', '.join(all_rolls)}{mod_text}{', '.join(modified_rolls)}{critical_text}"
-        else:
-            if dice == "d6" and quantity > 1:
-                total = sum(int(r.split('→')[-1]) if '→' in r else int(r) for r in all_rolls)
-                result_text = f"Resultado: {total} (d6 x{quantity}){critical_text}"
-            else:
-                result_text = f"Resultados: {', '.join(all_rolls)}{critical_text}"
-        
-        # Salva no histórico
-        history_entry = {
-            'timestamp': timestamp,
-            'type': f"{dice} x{quantity}",
-            'mode': mode,
-            'modifier': modifier,
-            'rolls': all_rolls,
-            'display': result_text
-        }
-        
-        self.history.append(history_entry)
-        self.last_roll = (dice, quantity, modifier, mode)
-        self.current_result.set(result_text)
+
+        result = self.engine.roll(dice, quantity, mode, modifier, summed_format=SUMMED_FORMAT_TOTAL)
+        self.show_result(result)
+        self.last_roll = (dice, quantity, modifier)
         self.reroll_button.config(state="normal")
     
     def reroll_dice(self):
         if self.last_roll:
-            dice, quantity, modifier, original_mode = self.last_roll
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            
+            dice, quantity, modifier = self.last_roll
             # Força o modo desvantagem para rerol
-            mode = "desvantagem"
-            
-            # Determina qual função de rolagem usar
-            roll_functions = {
-                "d4": self.roll_d4,
-                "d6": self.roll_d6,
-                "d8": self.roll_d8,
-                "d10": self.roll_d10,
-                "d12": self.roll_d12,
-                "d20": self.roll_d20,
-                "d100": self.roll_d100,
-                "dpercent": self.roll_dpercent
-            }
-            
-            roll_func = roll_functions[dice]
-            is_percent = (dice == "dpercent")
-            is_d20 = (dice == "d20")
-            
-            all_rolls = []
-            for _ in range(quantity):
-                # Sempre rola em desvantagem (rola 2 e pega o menor)
-                roll1 = roll_func()
-                roll2 = roll_func()
-                roll = min(roll1, roll2)
-                roll_str = f"{roll1}{'%' if is_percent else ''}/{roll2}{'%' if is_percent else ''}→{roll}{'%' if is_percent else ''}"
-                all_rolls.append(roll_str)
-            
-            # Verifica se há críticos (apenas para d20)
-            critical_text = ""
-            if is_d20 and quantity == 1:
-                roll_value = int(all_rolls[0].split('→')[-1]) if '→' in all_rolls[0] else int(all_rolls[0])
-                if roll_value == 20:
-                    critical_text = " - 🗿 SUCESSO CRÍTICO!"
-                    self.result_label.configure(foreground="#0080ff")
-                elif roll_value == 1:
-                    critical_text = " - 💀 FALHA CRÍTICA!"
-                    self.result_label.configure(foreground="#ff0000")
-                else:
-                    self.result_label.configure(foreground="white")
-            else:
-                self.result_label.configure(foreground="white")
-            
-            # Aplica modificador se necessário
-            if modifier != 0:
-                if dice == "d6" and quantity > 1:
-                    total = sum(int(r.split('→')[-1].replace('%', '')) if '→' in r else int(r.replace('%', '')) for r in all_rolls)
-                    final = total + modifier
-                    result_text = f"Rerol (Desvantagem): {total} + {modifier} = {final} (d6 x{quantity}){critical_text}"
-                else:
-                    modified_rolls = []
-                    for r in all_rolls:
-                        roll_value = int(r.split('→')[-1].replace('%', '')) if '→' in r else int(r.replace('%', ''))
-                        modified_value = roll_value + modifier
-                        modified_rolls.append(f"{modified_value}{'%' if is_percent else ''}")
-                    
-                    mod_text = f" {'+' if modifier > 0 else ''}{modifier}{'%' if is_percent else ''} = "
-                    result_text = f"Rerol (Desvantagem): {', '.join(all_rolls)}{mod_text}{', '.join(modified_rolls)}{critical_text}"
-            else:
-                if dice == "d6" and quantity > 1:
-                    total = sum(int(r.split('→')[-1]) if '→' in r else int(r) for r in all_rolls)
-                    result_text = f"Rerol (Desvantagem): {total} (d6 x{quantity}){critical_text}"
-                else:
-                    result_text = f"Rerol (Desvantagem): {', '.join(all_rolls)}{critical_text}"
-            
-            # Salva no histórico
-            history_entry = {
-                'timestamp': timestamp,
-                'type': f"{dice} x{quantity}",
-                'mode': mode,
-                'modifier': modifier,
-                'rolls': all_rolls,
-                'display': result_text
-            }
-            
-            self.history.append(history_entry)
-            self.current_result.set(result_text)
+            result = self.engine.roll(dice, quantity, "desvantagem", modifier, reroll=True,
+                                      summed_format=SUMMED_FORMAT_TOTAL)
+            self.show_result(result)
+
+    def show_result(self, result):
+        # Cor do rótulo conforme o crítico (apenas d20 com um dado)
+        if result.crit == CRIT_SUCCESS:
+            self.result_label.configure(foreground="#0080ff")  # Azul para sucesso crítico
+        elif result.crit == CRIT_FAILURE:
+            self.result_label.configure(foreground="#ff0000")  # Vermelho para falha crítica
+        else:
+            self.result_label.configure(foreground="white")  # Cor normal
+        self.history.append(result)
+        if self.history_viewer and self.history_viewer.exists():
+            self.history_viewer.refresh()
+        self.current_result.set(result.display)
     
     def reset_dice(self):
         self.current_result.set("Selecione um dado e clique em Rolar!")
@@ -384,48 +260,18 @@ class DiceRollerApp:
         if not self.history:
             messagebox.showinfo("Histórico", "Nenhum lançamento registrado ainda!")
             return
-            
-        history_window = tb.Toplevel(self.root)
-        history_window.title("Histórico de Lançamentos")
-        history_window.geometry("700x400")
-        
-        main_frame = tb.Frame(history_window, padding="10")
-        main_frame.pack(fill=tk.BOTH, expand=True)
 
-        scrollbar = tb.Scrollbar(main_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        # Aplicando a cor verde do botão rolar (#35E22C) ao fundo do histórico
-        history_listbox = tk.Listbox(
-            main_frame,
-            yscrollcommand=scrollbar.set,
-            font=('Courier', 10),
-            selectmode=tk.SINGLE,
-            width=90,
-            height=20,
-            bg="#35E22C",  # Verde do botão rolar
-            fg="white",
-            selectbackground="#2AB825",  # Verde mais escuro para seleção
-            selectforeground="white"
-        )
-        history_listbox.pack(fill=tk.BOTH, expand=True)
-        
-        scrollbar.config(command=history_listbox.yview)
-        
-        for idx, entry in enumerate(reversed(self.history)):
-            display_text = f"[{entry['timestamp']}] {entry['display']}"
-            history_listbox.insert(tk.END, display_text)
-        
-        close_button = tb.Button(
-            history_window,
-            text="Fechar",
-            command=history_window.destroy,
-            bootstyle="secondary-outline"
-        )
-        close_button.pack(pady=10)
+        # Janela virtualizada: só as linhas visíveis são montadas
+        if self.history_viewer and self.history_viewer.exists():
+            self.history_viewer.window.lift()
+            self.history_viewer.refresh()
+            return
+        self.history_viewer = HistoryViewer(self.root, self.history, "white")
     
     def clear_history(self):
-        self.history = []
+        self.history.clear()
+        if self.history_viewer and self.history_viewer.exists():
+            self.history_viewer.refresh()
         messagebox.showinfo("Histórico", "Histórico de lançamentos limpo com sucesso!")
 
 if __name__ == "__main__":
@@ -0,0 +1,80 @@
+"""
+Rolagem de dados pela linha de comando, sem tkinter.
+
+    python -m dice_cli 4d6kh3+2 2d20kl1      # rola cada expressão
+    python -m dice_cli -n 5 --total 3d8+2    # 5 rolagens, só os totais
+    echo "1d20+5" | python -m dice_cli -     # lê expressões do stdin, uma por linha
+    python -m dice_cli --bench               # vazão do motor em lote
+    python -m dice_cli --bench-sim           # simulação com 1..N processos
+"""
+import argparse
+import random
+import sys
+
+from dice_engine import MODES, DiceEngine, benchmark
+from dice_expr import compile_expression
+
+
+def roll_lines(expressions, engine, times=1, total_only=False, out=sys.stdout, err=sys.stderr):
+    """Rola cada expressão e escreve um resultado por linha. Retorna o número de erros."""
+    errors = 0
+    for expression in expressions:
+        expression = expression.strip()
+        if not expression or expression.startswith("#"):
+            continue
+        try:
+            plan = compile_expression(expression)
+        except ValueError as e:
+            print(f"erro: {e}", file=err, flush=True)
+            errors += 1
+            continue
+        for _ in range(times):
+            result = plan.roll(engine)
+            print(result.total if total_only else result.display, file=out)
+        out.flush()
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m dice_cli", description="Rola expressões de dados (ex.: 4d6kh3+2).")
+    parser.add_argument("expressions", nargs="*", help="expressões a rolar; '-' ou nenhuma lê do stdin")
+    parser.add_argument("-n", "--times", type=int, default=1, help="quantas vezes rolar cada expressão")
+    parser.add_argument("-t", "--total", action="store_true", help="imprime só o total")
+    parser.add_argument("--seed", type=int, help="semente do gerador (rolagens reprodutíveis)")
+    parser.add_argument("--numpy", action="store_true", help="usa o motor NumPy (compensa em pools grandes)")
+    parser.add_argument("--bench", action="store_true", help="mede a vazão do motor de rolagem e sai")
+    parser.add_argument("--bench-sim", type=int, nargs="?", const=10_000_000, metavar="ROLAGENS",
+                        help="mede a simulação Monte Carlo com 1, 2, 4... processos (padrão: 10^7 rolagens) e sai")
+    parser.add_argument("--workers", type=int, help="máximo de processos no --bench-sim (padrão: núcleos da máquina)")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        for mode in MODES:
+            for name, rate in benchmark(mode=mode).items():
+                print(f"{mode:12} {name:7} {rate:>15,.0f} dados/s")
+        return 0
+
+    if args.bench_sim:
+        from dice_sim import benchmark_scaling
+        base = None
+        for workers, elapsed, rate in benchmark_scaling(rolls=args.bench_sim, max_workers=args.workers):
+            base = base or rate
+            print(f"{workers:3} processos {elapsed:8.2f} s {rate:>15,.0f} rolagens/s  {rate / base:5.2f}x")
+        return 0
+
+    if args.seed is not None and not args.numpy:
+        random.seed(args.seed)
+    engine = DiceEngine(seed=args.seed, use_numpy=args.numpy)
+
+    if not args.expressions or args.expressions == ["-"]:
+        if not args.expressions and sys.stdin.isatty():
+            parser.print_usage()
+            return 2
+        errors = roll_lines(sys.stdin, engine, args.times, args.total)
+    else:
+        errors = roll_lines(args.expressions, engine, args.times, args.total)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
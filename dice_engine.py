@@ -0,0 +1,272 @@
+import importlib.util
+import random
+import time
+from datetime import datetime
+
+# NumPy é opcional (sem ele usamos as funções por dado) e só é importado
+# na primeira rolagem grande, para a interface e a CLI abrirem rápido.
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+NUMPY_MIN_DICE = 16  # abaixo disso as funções por dado são mais rápidas que o NumPy
+DISPLAY_MAX_DICE = 100  # dados escritos no texto do resultado; o resto vira "… +N"
+
+
+def load_numpy():
+    import numpy
+    return numpy
+
+# Número de faces de cada dado. O D% tem 10 faces que valem 10, 20, ..., 100.
+DICE_FACES = {
+    "d4": 4,
+    "d6": 6,
+    "d8": 8,
+    "d10": 10,
+    "d12": 12,
+    "d20": 20,
+    "d100": 100,
+    "dpercent": 10,
+}
+
+# Multiplicador aplicado à face sorteada (só o D% é diferente de 1)
+FACE_SCALE = {dice: 1 for dice in DICE_FACES}
+FACE_SCALE["dpercent"] = 10
+
+MODES = ("normal", "vantagem", "desvantagem")
+
+
+CRIT_NONE = 0
+CRIT_SUCCESS = 1
+CRIT_FAILURE = -1
+
+# Texto do d6 somado: "Resultado: 4, 5, 3 = 12" (RollDice.py) ou o antigo
+# "Resultado: 12 (d6 x3)" do dado_dos_crias.py
+SUMMED_FORMAT_DICE = "dados"
+SUMMED_FORMAT_TOTAL = "total"
+
+
+def _total(values):
+    return int(values.sum()) if hasattr(values, "sum") else sum(values)
+
+
+def is_summed(dice, quantity):
+    """A aba de dados soma só d6 com mais de um dado; nos outros, cada dado sai com o modificador"""
+    return dice == "d6" and quantity > 1
+
+
+def clip_texts(texts, count):
+    """Os primeiros DISPLAY_MAX_DICE textos de `count` dados, mais "… +N" se sobrar"""
+    texts = list(texts)
+    if count > DISPLAY_MAX_DICE:
+        texts.append(f"… +{count - DISPLAY_MAX_DICE}")
+    return texts
+
+
+class RollResult:
+    """
+    Resultado de uma rolagem da aba de dados.
+
+    Guarda só os números; o texto exibido no rótulo e no histórico é montado
+    na primeira vez que `display` é lido.
+    """
+
+    __slots__ = ("dice", "mode", "modifier", "raw", "kept", "total", "crit", "reroll", "timestamp",
+                 "summed_format", "_display")
+
+    def __init__(self, dice, mode, modifier, raw, kept, reroll=False, timestamp=None,
+                 summed_format=SUMMED_FORMAT_DICE):
+        self.dice = dice
+        self.mode = mode
+        self.modifier = modifier
+        self.raw = raw
+        self.kept = kept
+        self.total = _total(kept) + modifier
+        self.reroll = reroll
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.summed_format = summed_format
+        self.crit = CRIT_NONE
+        if dice == "d20" and len(kept) == 1:
+            if kept[0] == 20:
+                self.crit = CRIT_SUCCESS
+            elif kept[0] == 1:
+                self.crit = CRIT_FAILURE
+        self._display = None
+
+    @classmethod
+    def from_faces(cls, dice, mode, modifier, faces, reroll=False, timestamp=None,
+                   summed_format=SUMMED_FORMAT_DICE):
+        """Recria o resultado a partir das faces em sequência (pares em vantagem/desvantagem)"""
+        if mode == "normal":
+            raw = kept = faces
+        else:
+            raw = list(zip(faces[0::2], faces[1::2]))
+            pick = max if mode == "vantagem" else min
+            kept = [pick(pair) for pair in raw]
+        return cls(dice, mode, modifier, raw, kept, reroll=reroll, timestamp=timestamp,
+                   summed_format=summed_format)
+
+    def faces(self):
+        """Todas as faces sorteadas em sequência, como inteiros"""
+        if self.mode == "normal":
+            return [int(face) for face in self.raw]
+        return [int(face) for pair in self.raw for face in pair]
+
+    @property
+    def quantity(self):
+        return len(self.kept)
+
+    @property
+    def time_text(self):
+        return datetime.fromtimestamp(self.timestamp).strftime("%H:%M:%S")
+
+    def roll_texts(self):
+        """Texto de cada dado: "12" no normal, "12/7→12" em vantagem/desvantagem"""
+        pct = "%" if self.dice == "dpercent" else ""
+        shown = DISPLAY_MAX_DICE
+        if self.mode == "normal":
+            return clip_texts((f"{roll}{pct}" for roll in self.kept[:shown]), self.quantity)
+        return clip_texts((f"{roll1}{pct}/{roll2}{pct}→{roll}{pct}"
+                           for (roll1, roll2), roll in zip(self.raw[:shown], self.kept[:shown])), self.quantity)
+
+    @property
+    def display(self):
+        if self._display is None:
+            self._display = self._format()
+        return self._display
+
+    def _format(self):
+        pct = "%" if self.dice == "dpercent" else ""
+        rolls = ", ".join(self.roll_texts())
+        critical_text = ""
+        if self.crit == CRIT_SUCCESS:
+            critical_text = " - 🗿 SUCESSO CRÍTICO!"
+        elif self.crit == CRIT_FAILURE:
+            critical_text = " - 💀 FALHA CRÍTICA!"
+        summed = is_summed(self.dice, self.quantity)
+        if self.reroll:
+            prefix = "Rerol (Desvantagem):"
+        else:
+            prefix = "Resultado:" if summed else "Resultados:"
+        modifier = self.modifier
+        if summed:
+            total = self.total - modifier
+            if self.summed_format == SUMMED_FORMAT_TOTAL:
+                if modifier != 0:
+                    return f"{prefix} {total} + {modifier} = {self.total} (d6 x{self.quantity}){critical_text}"
+                return f"{prefix} {total} (d6 x{self.quantity}){critical_text}"
+            if modifier != 0:
+                return f"{prefix} {rolls} = {total} + {modifier} = {self.total}{critical_text}"
+            return f"{prefix} {rolls} = {total}{critical_text}"
+        if modifier != 0:
+            modified = ", ".join(clip_texts((f"{roll + modifier}{pct}" for roll in self.kept[:DISPLAY_MAX_DICE]),
+                                            self.quantity))
+            return f"{prefix} {rolls} {'+' if modifier > 0 else ''}{modifier}{pct} = {modified}{critical_text}"
+        return f"{prefix} {rolls}{critical_text}"
+
+
+def _python_roll_functions():
+    """Funções de rolagem por dado usadas quando o NumPy não está disponível"""
+    functions = {}
+    for dice, faces in DICE_FACES.items():
+        scale = FACE_SCALE[dice]
+        functions[dice] = lambda f=faces, s=scale: random.randint(1, f) * s
+    return functions
+
+
+class DiceEngine:
+    """
+    Motor de rolagem em lote.
+
+    Com NumPy, sorteia lotes de NUMPY_MIN_DICE dados ou mais de uma vez e
+    devolve arrays de inteiros; o gerador (e o import do NumPy) só é criado
+    no primeiro lote assim. Lotes menores, ou sem NumPy, usam as funções por
+    dado (uma chamada por dado) e devolvem listas. Com `seed`, tudo passa
+    pelo NumPy, para as rolagens serem reprodutíveis.
+    """
+
+    def __init__(self, roll_functions=None, seed=None, use_numpy=True, min_numpy_dice=None):
+        self.use_numpy = use_numpy and HAS_NUMPY
+        self.seed = seed
+        if min_numpy_dice is None:
+            min_numpy_dice = 1 if seed is not None else NUMPY_MIN_DICE
+        self.min_numpy_dice = min_numpy_dice
+        self._rng = None
+        self.roll_functions = roll_functions or _python_roll_functions()
+
+    @property
+    def rng(self):
+        if self._rng is None:
+            self._rng = load_numpy().random.default_rng(self.seed)
+        return self._rng
+
+    def batched(self, quantity):
+        return self.use_numpy and quantity >= self.min_numpy_dice
+
+    def roll_batch(self, dice, quantity, mode="normal"):
+        """
+        Rola `quantity` dados do tipo `dice` no modo indicado.
+
+        Retorna (raw, kept): no modo normal `raw` tem uma face por dado; em
+        vantagem/desvantagem tem um par de faces por dado. `kept` tem sempre
+        o valor que fica de cada dado.
+        """
+        if dice not in DICE_FACES:
+            raise ValueError(f"Dado desconhecido: {dice}")
+        if mode not in MODES:
+            raise ValueError(f"Modo de rolagem desconhecido: {mode}")
+        if self.batched(quantity):
+            return self._roll_numpy(dice, quantity, mode)
+        return self._roll_python(dice, quantity, mode)
+
+    def roll(self, dice, quantity, mode="normal", modifier=0, reroll=False, summed_format=SUMMED_FORMAT_DICE):
+        """Rola e devolve um RollResult"""
+        raw, kept = self.roll_batch(dice, quantity, mode)
+        return RollResult(dice, mode, modifier, raw, kept, reroll=reroll, summed_format=summed_format)
+
+    def roll_faces(self, faces, quantity, scale=1):
+        """Rola `quantity` dados genéricos de `faces` lados (usado pelas expressões)"""
+        if faces < 1:
+            raise ValueError(f"Dado inválido: d{faces}")
+        if self.batched(quantity):
+            raw = self.rng.integers(1, faces + 1, size=quantity)
+            if scale != 1:
+                raw *= scale
+            return raw
+        return [random.randint(1, faces) * scale for _ in range(quantity)]
+
+    def _roll_numpy(self, dice, quantity, mode):
+        faces = DICE_FACES[dice]
+        scale = FACE_SCALE[dice]
+        if mode == "normal":
+            raw = self.rng.integers(1, faces + 1, size=quantity)
+            if scale != 1:
+                raw *= scale
+            return raw, raw
+        raw = self.rng.integers(1, faces + 1, size=(quantity, 2))
+        if scale != 1:
+            raw *= scale
+        kept = raw.max(axis=1) if mode == "vantagem" else raw.min(axis=1)
+        return raw, kept
+
+    def _roll_python(self, dice, quantity, mode):
+        roll_func = self.roll_functions[dice]
+        if mode == "normal":
+            raw = [roll_func() for _ in range(quantity)]
+            return raw, raw
+        pick = max if mode == "vantagem" else min
+        raw = [(roll_func(), roll_func()) for _ in range(quantity)]
+        kept = [pick(pair) for pair in raw]
+        return raw, kept
+
+
+def benchmark(total_dice=1_000_000, dice="d20", mode="normal"):
+    """Mede a vazão (dados por segundo) do motor com e sem NumPy"""
+    results = {}
+    engines = [("python", DiceEngine(use_numpy=False))]
+    if HAS_NUMPY:
+        engines.insert(0, ("numpy", DiceEngine()))
+    for name, engine in engines:
+        start = time.perf_counter()
+        engine.roll_batch(dice, total_dice, mode)
+        elapsed = time.perf_counter() - start
+        results[name] = total_dice / elapsed if elapsed else float("inf")
+    return results
+
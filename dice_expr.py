@@ -0,0 +1,187 @@
+import re
+import time
+from datetime import datetime
+from functools import lru_cache
+
+from dice_engine import CRIT_NONE, DISPLAY_MAX_DICE, clip_texts
+
+# Um termo é "NdS" (com keep/drop opcional) ou uma constante, com sinal
+_TERM_RE = re.compile(r"([+-])?(?:(\d*)d(\d+|%)(?:(kh|kl|dh|dl|k)(\d+))?|(\d+))")
+
+PARSE_CACHE_SIZE = 256
+
+# Limites de uma expressão: acima disso a rolagem esgotaria memória/tempo
+MAX_DICE = 10_000  # dados somados em todos os termos (o log guarda todas as faces)
+MAX_FACES = 1_000_000
+MAX_CONSTANT = 10 ** 9
+
+
+class DiceTerm:
+    """Um grupo de dados de uma expressão, ex.: 4d6kh3"""
+
+    __slots__ = ("sign", "count", "faces", "scale", "keep", "keep_high", "label")
+
+    def __init__(self, sign, count, faces, scale, keep, keep_high, label):
+        self.sign = sign
+        self.count = count
+        self.faces = faces
+        self.scale = scale
+        self.keep = keep
+        self.keep_high = keep_high
+        self.label = label
+
+    def select(self, raw):
+        """Escolhe as faces que ficam (todas, as maiores ou as menores)"""
+        if self.keep >= self.count:
+            return list(raw)
+        ordered = sorted(raw, reverse=self.keep_high)
+        return ordered[:self.keep]
+
+
+class ExpressionResult:
+    """Resultado de uma expressão; o texto é montado só quando `display` é lido"""
+
+    __slots__ = ("plan", "parts", "total", "timestamp", "_display")
+
+    crit = CRIT_NONE  # expressões não têm crítico
+
+    def __init__(self, plan, parts, total, timestamp=None):
+        self.plan = plan
+        self.parts = parts
+        self.total = total
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self._display = None
+
+    @property
+    def time_text(self):
+        return datetime.fromtimestamp(self.timestamp).strftime("%H:%M:%S")
+
+    def faces(self):
+        """Faces de todos os termos em sequência"""
+        return [int(face) for _, raw, _ in self.parts for face in raw]
+
+    def roll_texts(self):
+        texts = []
+        for term, raw, kept in self.parts:
+            sign = "-" if term.sign < 0 else ""
+            raw_text = ", ".join(clip_texts(map(str, raw[:DISPLAY_MAX_DICE]), len(raw)))
+            if term.keep < term.count:
+                kept_text = ", ".join(clip_texts(map(str, kept[:DISPLAY_MAX_DICE]), len(kept)))
+                texts.append(f"{sign}{term.label}[{raw_text}→{kept_text}]")
+            else:
+                texts.append(f"{sign}{term.label}[{raw_text}]")
+        if self.plan.constant:
+            texts.append(f"{self.plan.constant:+d}")
+        return texts
+
+    @property
+    def display(self):
+        if self._display is None:
+            self._display = f"Expressão {self.plan.expression}: {' '.join(self.roll_texts())} = {self.total}"
+        return self._display
+
+
+class DicePlan:
+    """Expressão de dados já compilada: uma lista de termos e uma constante"""
+
+    __slots__ = ("expression", "terms", "constant")
+
+    def __init__(self, expression, terms, constant):
+        self.expression = expression
+        self.terms = terms
+        self.constant = constant
+
+    def roll(self, engine):
+        """
+        Avalia a expressão uma vez.
+
+        Retorna um ExpressionResult, com parts = lista de (termo, raw, kept).
+        """
+        total = self.constant
+        parts = []
+        for term in self.terms:
+            raw = [int(v) for v in engine.roll_faces(term.faces, term.count, term.scale)]
+            kept = term.select(raw)
+            total += term.sign * sum(kept)
+            parts.append((term, raw, kept))
+        return ExpressionResult(self, parts, total)
+
+    def from_faces(self, faces, timestamp=None):
+        """Recria um resultado a partir das faces guardadas (histórico/log)"""
+        total = self.constant
+        parts = []
+        pos = 0
+        for term in self.terms:
+            raw = faces[pos:pos + term.count]
+            pos += term.count
+            kept = term.select(raw)
+            total += term.sign * sum(kept)
+            parts.append((term, raw, kept))
+        return ExpressionResult(self, parts, total, timestamp=timestamp)
+
+
+def _parse(expression):
+    if not expression:
+        raise ValueError("Expressão vazia")
+    terms = []
+    constant = 0
+    total_dice = 0
+    pos = 0
+    while pos < len(expression):
+        match = _TERM_RE.match(expression, pos)
+        if not match or match.end() == pos or (pos > 0 and not match.group(1)):
+            raise ValueError(f"Expressão inválida: '{expression}' (posição {pos + 1})")
+        sign_text, count, faces, keep_op, keep_n, number = match.groups()
+        sign = -1 if sign_text == "-" else 1
+        if number is not None:
+            constant += sign * int(number)
+            if abs(constant) > MAX_CONSTANT:
+                raise ValueError(f"Constante grande demais (máximo {MAX_CONSTANT:,})".replace(",", "."))
+        else:
+            count = int(count) if count else 1
+            if count < 1:
+                raise ValueError(f"Quantidade de dados inválida em '{match.group(0)}'")
+            total_dice += count
+            if total_dice > MAX_DICE:
+                raise ValueError(f"Dados demais na expressão (máximo {MAX_DICE:,})".replace(",", "."))
+            if faces == "%":
+                faces, scale = 10, 10
+            else:
+                faces, scale = int(faces), 1
+                if faces < 1:
+                    raise ValueError(f"Dado inválido em '{match.group(0)}'")
+                if faces > MAX_FACES:
+                    raise ValueError(f"Dado com faces demais em '{match.group(0)}' (máximo {MAX_FACES:,})"
+                                     .replace(",", "."))
+            keep, keep_high = count, True
+            if keep_op:
+                n = int(keep_n)
+                if keep_op in ("kh", "k"):
+                    keep = n
+                elif keep_op == "kl":
+                    keep, keep_high = n, False
+                elif keep_op == "dl":
+                    keep = count - n
+                else:  # dh
+                    keep, keep_high = count - n, False
+                if not 0 < keep <= count:
+                    raise ValueError(f"Keep/drop inválido em '{match.group(0)}'")
+            label = match.group(0).lstrip("+-")
+            terms.append(DiceTerm(sign, count, faces, scale, keep, keep_high, label))
+        pos = match.end()
+    return DicePlan(expression, tuple(terms), constant)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _compile_normalized(expression):
+    return _parse(expression)
+
+
+def compile_expression(expression):
+    """
+    Compila uma expressão como "4d6kh3+2", "2d20kl1" ou "3d8+1d6-2".
+
+    O plano fica em um cache LRU indexado pela expressão, então rolar a mesma
+    macro de novo não passa pelo parser.
+    """
+    return _compile_normalized("".join(expression.split()).lower())
@@ -0,0 +1,130 @@
+import math
+from functools import lru_cache
+
+from dice_engine import DICE_FACES, FACE_SCALE, HAS_NUMPY, MODES, load_numpy
+
+DIST_CACHE_SIZE = 128  # pools memoizados (cada um guarda quantidade * faces probabilidades)
+EXACT_MAX_DICE = 100  # acima disso roll_summary usa a aproximação normal
+
+
+class Distribution:
+    """
+    Distribuição exata de um resultado inteiro.
+
+    probs[i] é a probabilidade do valor offset + i * step.
+    """
+
+    __slots__ = ("offset", "step", "probs")
+
+    def __init__(self, offset, step, probs):
+        self.offset = offset
+        self.step = step
+        self.probs = tuple(probs)
+
+    def __add__(self, other):
+        """Soma de dois resultados independentes (convolução)"""
+        if self.step != other.step:
+            raise ValueError("Distribuições com passos diferentes")
+        return Distribution(self.offset + other.offset, self.step, _convolve(self.probs, other.probs))
+
+    def shift(self, amount):
+        """Mesma distribuição somada a uma constante (modificador)"""
+        return Distribution(self.offset + amount, self.step, self.probs)
+
+    def values(self):
+        return [self.offset + i * self.step for i in range(len(self.probs))]
+
+    def mean(self):
+        return sum(v * p for v, p in zip(self.values(), self.probs))
+
+    def stddev(self):
+        mean = self.mean()
+        variance = sum((v - mean) ** 2 * p for v, p in zip(self.values(), self.probs))
+        return math.sqrt(max(variance, 0.0))
+
+    def prob_at_least(self, target):
+        """P(resultado >= target)"""
+        if target <= self.offset:
+            return 1.0
+        first = -(-(target - self.offset) // self.step)  # divisão arredondando para cima
+        return min(1.0, float(sum(self.probs[first:])))
+
+
+def _convolve(a, b):
+    if HAS_NUMPY:
+        return load_numpy().convolve(a, b).tolist()
+    result = [0.0] * (len(a) + len(b) - 1)
+    for i, pa in enumerate(a):
+        if pa:
+            for j, pb in enumerate(b):
+                result[i + j] += pa * pb
+    return result
+
+
+@lru_cache(maxsize=DIST_CACHE_SIZE)
+def single_die_distribution(dice, mode="normal"):
+    """Distribuição de um dado (normal, vantagem = maior de 2, desvantagem = menor de 2)"""
+    if mode not in MODES:
+        raise ValueError(f"Modo de rolagem desconhecido: {mode}")
+    faces = DICE_FACES[dice]
+    total = faces * faces
+    if mode == "normal":
+        probs = [1 / faces] * faces
+    elif mode == "vantagem":
+        probs = [(k * k - (k - 1) ** 2) / total for k in range(1, faces + 1)]
+    else:
+        probs = [((faces - k + 1) ** 2 - (faces - k) ** 2) / total for k in range(1, faces + 1)]
+    scale = FACE_SCALE[dice]
+    return Distribution(scale, scale, probs)
+
+
+@lru_cache(maxsize=DIST_CACHE_SIZE)
+def pool_distribution(dice, count, mode="normal"):
+    """
+    Distribuição da soma de `count` dados iguais.
+
+    Memoizada por (dado, quantidade, modo); pools grandes saem de pedaços
+    menores já calculados por quadrados sucessivos (n = 2 * (n // 2) + n % 2).
+    """
+    if count < 1:
+        raise ValueError("Quantidade de dados deve ser pelo menos 1")
+    if count == 1:
+        return single_die_distribution(dice, mode)
+    half = pool_distribution(dice, count // 2, mode)
+    result = half + half
+    if count % 2:
+        result = result + single_die_distribution(dice, mode)
+    return result
+
+
+def roll_distribution(dice, count, mode="normal", modifier=0):
+    """Distribuição do total somado de uma rolagem (soma dos dados + modificador)"""
+    return pool_distribution(dice, count, mode).shift(modifier)
+
+
+def roll_summary(dice, count, mode="normal", modifier=0, target=0):
+    """
+    (média, desvio, P(≥ target), exata) do total de uma rolagem. Até
+    EXACT_MAX_DICE dados a distribuição é exata; acima, pelo teorema
+    central do limite, a soma vira uma normal com média e variância de um
+    dado multiplicadas por `count` (com correção de continuidade).
+    """
+    if count <= EXACT_MAX_DICE:
+        dist = roll_distribution(dice, count, mode, modifier)
+        return dist.mean(), dist.stddev(), dist.prob_at_least(target), True
+    die = single_die_distribution(dice, mode)
+    mean = count * die.mean() + modifier
+    stddev = math.sqrt(count) * die.stddev()
+    z = (target - die.step / 2 - mean) / (stddev * math.sqrt(2))
+    return mean, stddev, 0.5 * math.erfc(z), False
+
+
+def die_summary(dice, count, mode="normal", modifier=0, target=0):
+    """
+    Para rolagens que não são somadas (cada dado mostrado com o modificador):
+    (média, desvio, P(≥ target)) de um dado + modificador e P(algum dos
+    `count` dados ≥ target).
+    """
+    die = single_die_distribution(dice, mode).shift(modifier)
+    each = die.prob_at_least(target)
+    return die.mean(), die.stddev(), each, 1 - (1 - each) ** count
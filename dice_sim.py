@@ -0,0 +1,133 @@
+import math
+import multiprocessing
+import os
+import random
+import time
+from collections import Counter
+
+from dice_engine import DICE_FACES, FACE_SCALE, HAS_NUMPY, DiceEngine, is_summed, load_numpy
+
+SIM_BATCH = 100_000  # rolagens sorteadas de uma vez dentro de um chunk: memória constante
+SIM_MIN_CHUNK = 50_000
+SIM_MAX_CHUNK = 5_000_000
+CHUNKS_PER_WORKER = 4  # chunks por processo: progresso, cancelamento e equilíbrio de carga
+
+
+def simulate_chunk(dice, quantity, mode, modifier, rolls, seed=None):
+    """
+    Faz `rolls` rolagens de `quantity` dados e devolve o histograma dos
+    totais ({total: vezes}); se a aba de dados não soma a rolagem (ver
+    is_summed), o histograma é de cada dado + modificador. Roda num processo
+    do TaskRunner; `seed` é a semente do fluxo deste chunk (ver chunk_seeds).
+    """
+    if HAS_NUMPY:
+        return _simulate_numpy(dice, quantity, mode, modifier, rolls, seed)
+    return _simulate_python(dice, quantity, mode, modifier, rolls, seed)
+
+
+def _simulate_numpy(dice, quantity, mode, modifier, rolls, seed):
+    np = load_numpy()
+    engine = DiceEngine(seed=seed, min_numpy_dice=1)  # kept.reshape precisa de array
+    summed = is_summed(dice, quantity)
+    counts = np.zeros((quantity if summed else 1) * DICE_FACES[dice] * FACE_SCALE[dice] + 1, dtype=np.int64)
+    for start in range(0, rolls, SIM_BATCH):
+        batch = min(SIM_BATCH, rolls - start)
+        _, kept = engine.roll_batch(dice, batch * quantity, mode)
+        values = kept.reshape(batch, quantity).sum(axis=1) if summed else kept
+        counts += np.bincount(values, minlength=len(counts))
+    totals = np.flatnonzero(counts)
+    return dict(zip((totals + modifier).tolist(), counts[totals].tolist()))
+
+
+def _simulate_python(dice, quantity, mode, modifier, rolls, seed):
+    rng = random.Random(seed)
+    faces = DICE_FACES[dice]
+    scale = FACE_SCALE[dice]
+    if mode == "normal":
+        roll = lambda: rng.randint(1, faces)
+    else:
+        pick = max if mode == "vantagem" else min
+        roll = lambda: pick(rng.randint(1, faces), rng.randint(1, faces))
+    histogram = Counter()
+    if not is_summed(dice, quantity):
+        for _ in range(rolls * quantity):
+            histogram[roll() * scale + modifier] += 1
+        return histogram
+    for _ in range(rolls):
+        histogram[sum(roll() for _ in range(quantity)) * scale + modifier] += 1
+    return histogram
+
+
+def chunk_seeds(count, entropy=None):
+    """
+    Uma semente por chunk, de fluxos independentes: SeedSequence.spawn com
+    NumPy (sem sobreposição entre os fluxos), ou inteiros de 64 bits.
+    """
+    if HAS_NUMPY:
+        return load_numpy().random.SeedSequence(entropy).spawn(count)
+    source = random.Random(entropy) if entropy is not None else random.SystemRandom()
+    return [source.getrandbits(64) for _ in range(count)]
+
+
+def split_rolls(rolls, workers=1):
+    """Tamanhos dos chunks que somam `rolls`, CHUNKS_PER_WORKER por processo"""
+    chunk = -(-rolls // (workers * CHUNKS_PER_WORKER))
+    chunk = max(SIM_MIN_CHUNK, min(SIM_MAX_CHUNK, chunk))
+    return [min(chunk, rolls - start) for start in range(0, rolls, chunk)]
+
+
+def simulation_chunks(dice, quantity, mode, modifier, rolls, workers=1, entropy=None):
+    """Argumentos de simulate_chunk para cada chunk, cada um com a sua semente"""
+    sizes = split_rolls(rolls, workers)
+    return [(dice, quantity, mode, modifier, size, seed) for size, seed in zip(sizes, chunk_seeds(len(sizes), entropy))]
+
+
+def merge_histograms(total, part):
+    total = Counter() if total is None else total
+    total.update(part)
+    return total
+
+
+def summarize(histogram, target):
+    """(rolagens, média, desvio, P(≥ alvo)) de um histograma de totais"""
+    rolls = sum(histogram.values())
+    if not rolls:
+        return 0, 0.0, 0.0, 0.0
+    mean = sum(value * count for value, count in histogram.items()) / rolls
+    variance = sum((value - mean) ** 2 * count for value, count in histogram.items()) / rolls
+    at_least = sum(count for value, count in histogram.items() if value >= target) / rolls
+    return rolls, mean, math.sqrt(variance), at_least
+
+
+def worker_counts(max_workers=None):
+    """1, 2, 4, ... até o número de núcleos (incluído)"""
+    max_workers = max_workers or os.cpu_count() or 1
+    counts = []
+    workers = 1
+    while workers < max_workers:
+        counts.append(workers)
+        workers *= 2
+    return counts + [max_workers]
+
+
+def benchmark_scaling(rolls=10_000_000, dice="d20", quantity=1, mode="normal", max_workers=None):
+    """
+    Mede rolagens por segundo da simulação com 1..N processos. A criação
+    dos processos fica fora da medida. Devolve [(processos, segundos, rolagens/s)].
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for workers in worker_counts(max_workers):
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            # uma tarefa minúscula por processo, para todos já estarem criados
+            list(pool.map(simulate_chunk, *zip(*[(dice, 1, "normal", 0, 1)] * workers)))
+            chunks = simulation_chunks(dice, quantity, mode, 0, rolls, workers)
+            start = time.perf_counter()
+            histogram = None
+            for part in pool.map(simulate_chunk, *zip(*chunks)):
+                histogram = merge_histograms(histogram, part)
+            elapsed = time.perf_counter() - start
+        results.append((workers, elapsed, rolls / elapsed if elapsed else float("inf")))
+    return results
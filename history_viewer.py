@@ -0,0 +1,176 @@
+import tkinter as tk
+import tkinter.font as tkfont
+from tkinter import ttk
+
+import ttkbootstrap as tb
+
+from roll_history import DICE_NAMES, MODE_DESVANTAGEM, MODE_EXPRESSION, MODE_NORMAL, MODE_REROLL, MODE_VANTAGEM
+
+ALL = "Todos"
+DICE_FILTERS = [ALL] + DICE_NAMES + ["expressão"]
+MODE_FILTERS = {
+    ALL: None,
+    "Normal": MODE_NORMAL,
+    "Vantagem": MODE_VANTAGEM,
+    "Desvantagem": MODE_DESVANTAGEM,
+    "Rerol": MODE_REROLL,
+    "Expressão": MODE_EXPRESSION,
+}
+
+
+class HistoryViewer:
+    """
+    Janela de histórico virtualizada.
+
+    O Listbox só recebe as linhas visíveis; a barra de rolagem é controlada
+    aqui e, ao rolar, as próximas linhas são buscadas no RollHistory. Abrir a
+    janela custa o mesmo com 10 ou 10.000 rolagens.
+    """
+
+    def __init__(self, parent, history, text_color="white"):
+        self.history = history
+        self.first = 0  # posição (0 = mais recente) da primeira linha exibida
+        # Com filtro: linhas aceitas, como índices absolutos (head + índice),
+        # da mais antiga para a mais recente; as de antes de match_start já
+        # saíram do histórico. None = sem filtro.
+        self.matches = None
+        self.match_start = 0
+        self.match = None
+        self.seen_end = 0  # índice absoluto da próxima linha ainda não filtrada
+
+        self.window = tb.Toplevel(parent)
+        self.window.title("Histórico de Lançamentos")
+        self.window.geometry("700x400")
+
+        filter_frame = tb.Frame(self.window, padding=(10, 10, 10, 0))
+        filter_frame.pack(fill=tk.X)
+        tb.Label(filter_frame, text="Dado:").pack(side=tk.LEFT)
+        self.dice_filter = tk.StringVar(value=ALL)
+        dice_combo = ttk.Combobox(filter_frame, textvariable=self.dice_filter, values=DICE_FILTERS, state="readonly", width=12)
+        dice_combo.pack(side=tk.LEFT, padx=5)
+        dice_combo.bind("<<ComboboxSelected>>", lambda e: self.apply_filter())
+        tb.Label(filter_frame, text="Modo:").pack(side=tk.LEFT, padx=(10, 0))
+        self.mode_filter = tk.StringVar(value=ALL)
+        mode_combo = ttk.Combobox(filter_frame, textvariable=self.mode_filter, values=list(MODE_FILTERS), state="readonly", width=12)
+        mode_combo.pack(side=tk.LEFT, padx=5)
+        mode_combo.bind("<<ComboboxSelected>>", lambda e: self.apply_filter())
+        self.count_label = tb.Label(filter_frame)
+        self.count_label.pack(side=tk.RIGHT)
+
+        main_frame = tb.Frame(self.window, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        self.scrollbar = tb.Scrollbar(main_frame, command=self.on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.font = tkfont.Font(family="Courier", size=10)
+        self.listbox = tk.Listbox(
+            main_frame,
+            font=self.font,
+            selectmode=tk.SINGLE,
+            width=90,
+            height=20,
+            bg="#35E22C",
+            fg=text_color,
+            selectbackground="#2AB825",
+            selectforeground=text_color
+        )
+        self.listbox.pack(fill=tk.BOTH, expand=True)
+        self.listbox.bind("<Configure>", lambda e: self.render())
+        self.listbox.bind("<MouseWheel>", lambda e: self.scroll_by(-1 if e.delta > 0 else 1, "units"))
+        self.listbox.bind("<Button-4>", lambda e: self.scroll_by(-1, "units"))
+        self.listbox.bind("<Button-5>", lambda e: self.scroll_by(1, "units"))
+        self.listbox.bind("<Prior>", lambda e: self.scroll_by(-1, "pages"))
+        self.listbox.bind("<Next>", lambda e: self.scroll_by(1, "pages"))
+
+        tb.Button(self.window, text="Fechar", command=self.window.destroy, bootstyle="secondary-outline").pack(pady=10)
+
+        self.render()
+
+    def exists(self):
+        return bool(self.window.winfo_exists())
+
+    def visible_rows(self):
+        height = self.listbox.winfo_height()
+        if height <= 1:  # ainda não desenhado
+            return int(self.listbox.cget("height"))
+        return max(1, height // self.font.metrics("linespace"))
+
+    def row_count(self):
+        return len(self.history) if self.matches is None else len(self.matches) - self.match_start
+
+    def history_index(self, position):
+        if self.matches is None:
+            return len(self.history) - 1 - position
+        return self.matches[len(self.matches) - 1 - position] - self.history.head
+
+    def history_end(self):
+        return self.history.head + len(self.history)
+
+    def apply_filter(self):
+        dice = self.dice_filter.get()
+        mode = MODE_FILTERS[self.mode_filter.get()]
+        if dice == ALL and mode is None:
+            self.matches = None
+        else:
+            dice = None if dice == ALL else dice
+            self.match = self.history.matcher(dice, mode)
+            head = self.history.head
+            self.matches = [head + index for index in reversed(self.history.filter(dice, mode))]
+            self.match_start = 0
+            self.seen_end = self.history_end()
+        self.first = 0
+        self.render()
+
+    def refresh(self):
+        """
+        Chamado quando entra uma rolagem nova (ou o histórico é limpo) com a
+        janela aberta. Com filtro, só as linhas novas são testadas.
+        """
+        if self.matches is None:
+            self.render()
+            return
+        head = self.history.head
+        end = self.history_end()
+        if end < self.seen_end:  # histórico limpo
+            self.apply_filter()
+            return
+        for row in range(max(self.seen_end, head), end):
+            if self.match(row - head):
+                self.matches.append(row)
+        self.seen_end = end
+        # Descarta as linhas que saíram do buffer circular
+        while self.match_start < len(self.matches) and self.matches[self.match_start] < head:
+            self.match_start += 1
+        if self.match_start > len(self.matches) // 2:
+            del self.matches[:self.match_start]
+            self.match_start = 0
+        self.render()
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.first = int(float(amount) * self.row_count())
+            self.render()
+        else:
+            self.scroll_by(int(amount), unit)
+
+    def scroll_by(self, amount, unit):
+        step = self.visible_rows() if unit == "pages" else 1
+        self.first += amount * step
+        self.render()
+        return "break"
+
+    def render(self):
+        total = self.row_count()
+        visible = self.visible_rows()
+        self.first = max(0, min(self.first, total - visible))
+        last = min(total, self.first + visible)
+        rows = [self.history.display(self.history_index(pos)) for pos in range(self.first, last)]
+        self.listbox.delete(0, tk.END)
+        if rows:
+            self.listbox.insert(tk.END, *rows)
+        if total:
+            self.scrollbar.set(self.first / total, last / total)
+        else:
+            self.scrollbar.set(0, 1)
+        self.count_label.configure(text=f"{total} lançamentos")
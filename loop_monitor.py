@@ -0,0 +1,150 @@
+import heapq
+import time
+import tkinter as tk
+from collections import deque
+from functools import wraps
+
+import ttkbootstrap as tb
+
+HEARTBEAT_MS = 50
+HISTOGRAM_EDGES_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)  # última faixa: acima de 1 s
+LATENCY_SAMPLES = 2000  # atrasos guardados para p50/p99
+SLOWEST_KEPT = 15
+DIAGNOSTICS_REFRESH_MS = 500
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+class LoopMonitor:
+    """
+    Mede o quanto o mainloop fica travado: um heartbeat de HEARTBEAT_MS
+    registra o atraso de cada tick (histograma e amostras para p50/p99), e
+    os callbacks instrumentados com `instrument` registram quanto tempo
+    levaram. Cada atraso é atribuído ao callback mais lento que rodou desde
+    o tick anterior. `show` abre a janela de diagnóstico (escondida por
+    padrão; F12 no DiceRollerApp).
+    """
+
+    def __init__(self, root, interval_ms=HEARTBEAT_MS):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.histogram = [0] * (len(HISTOGRAM_EDGES_MS) + 1)
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.slowest = []  # heap de (ms, nome, hora) com os SLOWEST_KEPT mais lentos
+        self.totals = {}  # nome -> [chamadas, ms total, ms máximo]
+        self.blame = {}  # nome -> ms de atraso do heartbeat atribuídos a ele
+        self.since_tick = None  # (ms, nome) mais lento desde o último tick
+        self.window = None
+        self.expected = time.perf_counter() + interval_ms / 1000
+        self.root.after(interval_ms, self.tick)
+
+    def tick(self):
+        now = time.perf_counter()
+        late_ms = max(0.0, (now - self.expected) * 1000)
+        self.latencies.append(late_ms)
+        self.histogram[self.bucket(late_ms)] += 1
+        if self.since_tick is not None and late_ms >= self.interval_ms:
+            name = self.since_tick[1]
+            self.blame[name] = self.blame.get(name, 0.0) + late_ms
+        self.since_tick = None
+        self.expected = now + self.interval_ms / 1000
+        self.root.after(self.interval_ms, self.tick)
+
+    @staticmethod
+    def bucket(ms):
+        for i, edge in enumerate(HISTOGRAM_EDGES_MS):
+            if ms < edge:
+                return i
+        return len(HISTOGRAM_EDGES_MS)
+
+    def record(self, name, ms):
+        totals = self.totals.setdefault(name, [0, 0.0, 0.0])
+        totals[0] += 1
+        totals[1] += ms
+        totals[2] = max(totals[2], ms)
+        entry = (ms, name, time.strftime("%H:%M:%S"))
+        if len(self.slowest) < SLOWEST_KEPT:
+            heapq.heappush(self.slowest, entry)
+        elif ms > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, entry)
+        if self.since_tick is None or ms > self.since_tick[0]:
+            self.since_tick = (ms, name)
+
+    def timed(self, name, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(name, (time.perf_counter() - start) * 1000)
+        return wrapper
+
+    def instrument(self, obj, names, prefix=None):
+        """
+        Troca os métodos `names` do objeto por versões medidas. Tem que ser
+        chamado antes de os métodos serem passados como command/bind.
+        """
+        for name in names:
+            label = f"{prefix}.{name}" if prefix else name
+            setattr(obj, name, self.timed(label, getattr(obj, name)))
+
+    def summary(self):
+        values = sorted(self.latencies)
+        return {
+            "ticks": sum(self.histogram),
+            "p50": percentile(values, 0.50),
+            "p99": percentile(values, 0.99),
+            "max": values[-1] if values else 0.0,
+        }
+
+    def histogram_text(self, width=30):
+        top = max(self.histogram) or 1
+        lines = []
+        lower = 0
+        for edge, count in zip(HISTOGRAM_EDGES_MS + (None,), self.histogram):
+            label = f"{lower}-{edge} ms" if edge is not None else f">= {lower} ms"
+            lines.append(f"{label:>14} {'█' * round(width * count / top):<{width}} {count}")
+            lower = edge
+        return "\n".join(lines)
+
+    def slowest_text(self):
+        lines = [f"{ms:8.1f} ms  {when}  {name}" for ms, name, when in sorted(self.slowest, reverse=True)]
+        if self.blame:
+            lines += ["", "Atraso do heartbeat atribuído:"]
+            lines += [f"{ms:8.1f} ms  {name}" for name, ms in sorted(self.blame.items(), key=lambda kv: -kv[1])]
+        return "\n".join(lines) or "Nenhum callback medido ainda."
+
+    # --- Janela de diagnóstico ---
+    def show(self, event=None):
+        if self.window is not None and self.window.winfo_exists():
+            self.window.deiconify()
+            self.window.lift()
+            return
+        self.window = tb.Toplevel(self.root)
+        self.window.title("Diagnóstico do loop de eventos")
+        self.window.geometry("520x520")
+        self.summary_var = tk.StringVar()
+        tb.Label(self.window, textvariable=self.summary_var, font=("Courier", 11, "bold")).pack(anchor="w", padx=10, pady=5)
+        self.histogram_label = tb.Label(self.window, font=("Courier", 9), justify="left")
+        self.histogram_label.pack(anchor="w", padx=10)
+        tb.Label(self.window, text="Callbacks mais lentos:").pack(anchor="w", padx=10, pady=(10, 0))
+        self.slowest_label = tb.Label(self.window, font=("Courier", 9), justify="left")
+        self.slowest_label.pack(anchor="w", padx=10)
+        self.window.protocol("WM_DELETE_WINDOW", self.window.withdraw)
+        self.refresh()
+
+    def refresh(self):
+        if self.window is None or not self.window.winfo_exists():
+            return
+        if self.window.state() != "withdrawn":
+            s = self.summary()
+            self.summary_var.set(f"Atraso do heartbeat ({s['ticks']} ticks): p50 {s['p50']:.1f} ms, "
+                                 f"p99 {s['p99']:.1f} ms, máx {s['max']:.1f} ms")
+            self.histogram_label.configure(text=self.histogram_text())
+            self.slowest_label.configure(text=self.slowest_text())
+        self.window.after(DIAGNOSTICS_REFRESH_MS, self.refresh)
@@ -0,0 +1,235 @@
+from array import array
+from datetime import datetime
+
+from dice_engine import CRIT_NONE, DICE_FACES, SUMMED_FORMAT_DICE, RollResult
+from dice_expr import ExpressionResult, compile_expression
+
+DICE_CODES = {dice: code for code, dice in enumerate(DICE_FACES)}
+DICE_NAMES = list(DICE_FACES)
+
+# Código de modo de cada linha ("rerol" é desvantagem vinda do botão Rerolar)
+MODE_NORMAL, MODE_VANTAGEM, MODE_DESVANTAGEM, MODE_REROLL, MODE_EXPRESSION = range(5)
+MODE_CODES = {"normal": MODE_NORMAL, "vantagem": MODE_VANTAGEM, "desvantagem": MODE_DESVANTAGEM}
+MODE_NAMES = ["normal", "vantagem", "desvantagem", "desvantagem", "expressão"]
+
+DEFAULT_CAPACITY = 10_000
+FACES_PER_ROW = 4  # média de faces reservada por linha no buffer compartilhado
+MAX_ROW_SHARE = 4  # linha com mais de 1/MAX_ROW_SHARE do buffer de faces fica sem as faces
+
+
+class OmittedRow:
+    """Linha grande demais para o buffer de faces: só dado, quantidade e total"""
+
+    __slots__ = ("name", "mode", "face_count", "total", "timestamp")
+    crit = CRIT_NONE
+
+    def __init__(self, name, mode, face_count, total, timestamp):
+        self.name = name
+        self.mode = mode
+        self.face_count = face_count
+        self.total = total
+        self.timestamp = timestamp
+
+    @property
+    def time_text(self):
+        return datetime.fromtimestamp(self.timestamp).strftime("%H:%M:%S")
+
+    @property
+    def display(self):
+        if self.mode == MODE_EXPRESSION:
+            return f"Expressão {self.name}: {self.face_count} faces omitidas = {self.total}"
+        quantity = self.face_count if self.mode == MODE_NORMAL else self.face_count // 2
+        return f"{quantity}{self.name} ({MODE_NAMES[self.mode]}): faces omitidas, total = {self.total}"
+
+
+class RollHistory:
+    """
+    Histórico de rolagens em buffer circular de capacidade fixa.
+
+    Cada coluna (dado, modo, modificador, total, horário) é um `array` do
+    tamanho da capacidade; as faces de todas as linhas ficam em um único
+    buffer circular. Quando o buffer de linhas ou o de faces enche, as
+    linhas mais antigas saem; uma rolagem grande demais para o buffer de
+    faces é guardada sem elas (só total e quantidade). O texto de exibição
+    só é montado para as linhas lidas.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, face_capacity=None, summed_format=SUMMED_FORMAT_DICE):
+        self.capacity = capacity
+        self.summed_format = summed_format  # texto do d6 somado nas linhas lidas (ver RollResult)
+        self.face_capacity = face_capacity or capacity * FACES_PER_ROW
+        self.max_row_faces = self.face_capacity // MAX_ROW_SHARE
+        self.dice = array("i", [0]) * capacity
+        self.mode = array("b", [0]) * capacity
+        self.omitted = array("b", [0]) * capacity
+        self.modifier = array("q", [0]) * capacity
+        self.total = array("q", [0]) * capacity
+        self.timestamp = array("d", [0.0]) * capacity
+        self.face_start = array("q", [0]) * capacity
+        self.face_count = array("i", [0]) * capacity
+        self.faces = array("i", [0]) * self.face_capacity
+        self.clear()
+
+    def clear(self):
+        self.head = 0  # índice absoluto da linha mais antiga
+        self.count = 0
+        self.faces_written = 0
+        # Expressões viram códigos de dado a partir de len(DICE_NAMES); o
+        # código é liberado (e reaproveitado) quando a última linha dela sai
+        self.expressions = []
+        self.expression_codes = {}
+        self.expression_rows = []  # linhas no histórico de cada código
+        self.free_codes = []
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    def append(self, result):
+        """Guarda um RollResult ou ExpressionResult"""
+        if isinstance(result, ExpressionResult):
+            mode_code = MODE_EXPRESSION
+            modifier = 0  # a constante faz parte da expressão
+        else:
+            dice_code = DICE_CODES[result.dice]
+            mode_code = MODE_REROLL if result.reroll else MODE_CODES[result.mode]
+            modifier = result.modifier
+        faces = result.faces()
+        omitted = len(faces) > self.max_row_faces
+
+        if self.count == self.capacity:
+            self._drop_oldest()
+        if mode_code == MODE_EXPRESSION:
+            dice_code = self._expression_code(result.plan.expression)
+        start = self.faces_written
+        if not omitted:
+            self._write_faces(faces)
+        # Remove linhas cujas faces foram sobrescritas no buffer circular
+        while self.count and self.face_start[self.head % self.capacity] < self.faces_written - self.face_capacity:
+            self._drop_oldest()
+
+        slot = (self.head + self.count) % self.capacity
+        self.dice[slot] = dice_code
+        self.mode[slot] = mode_code
+        self.omitted[slot] = omitted
+        self.modifier[slot] = modifier
+        self.total[slot] = result.total
+        self.timestamp[slot] = result.timestamp
+        self.face_start[slot] = start
+        self.face_count[slot] = len(faces)
+        self.count += 1
+
+    def _drop_oldest(self):
+        slot = self.head % self.capacity
+        if self.mode[slot] == MODE_EXPRESSION:
+            self._release_code(self.dice[slot])
+        self.head += 1
+        self.count -= 1
+
+    def _write_faces(self, faces):
+        pos = self.faces_written % self.face_capacity
+        first = min(len(faces), self.face_capacity - pos)
+        self.faces[pos:pos + first] = array("i", faces[:first])
+        if first < len(faces):
+            self.faces[0:len(faces) - first] = array("i", faces[first:])
+        self.faces_written += len(faces)
+
+    def _expression_code(self, expression):
+        code = self.expression_codes.get(expression)
+        if code is None:
+            if self.free_codes:
+                code = self.free_codes.pop()
+                self.expressions[code - len(DICE_NAMES)] = expression
+            else:
+                code = len(DICE_NAMES) + len(self.expressions)
+                self.expressions.append(expression)
+                self.expression_rows.append(0)
+            self.expression_codes[expression] = code
+        self.expression_rows[code - len(DICE_NAMES)] += 1
+        return code
+
+    def _release_code(self, code):
+        index = code - len(DICE_NAMES)
+        self.expression_rows[index] -= 1
+        if not self.expression_rows[index]:
+            del self.expression_codes[self.expressions[index]]
+            self.expressions[index] = None
+            self.free_codes.append(code)
+
+    def _slot(self, index):
+        """Posição no buffer da linha `index` (0 = mais antiga, -1 = mais recente)"""
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("Índice fora do histórico")
+        return (self.head + index) % self.capacity
+
+    def _row_faces(self, slot):
+        start = self.face_start[slot] % self.face_capacity
+        count = self.face_count[slot]
+        end = start + count
+        if end <= self.face_capacity:
+            return self.faces[start:end].tolist()
+        return self.faces[start:].tolist() + self.faces[:end - self.face_capacity].tolist()
+
+    def dice_name(self, index):
+        code = self.dice[self._slot(index)]
+        if code < len(DICE_NAMES):
+            return DICE_NAMES[code]
+        return self.expressions[code - len(DICE_NAMES)]
+
+    def mode_name(self, index):
+        return MODE_NAMES[self.mode[self._slot(index)]]
+
+    def result(self, index):
+        """Reconstrói o objeto de resultado da linha (o texto só é gerado ao ler .display)"""
+        slot = self._slot(index)
+        mode_code = self.mode[slot]
+        timestamp = self.timestamp[slot]
+        if self.omitted[slot]:
+            return OmittedRow(self.dice_name(index), mode_code, self.face_count[slot], self.total[slot], timestamp)
+        faces = self._row_faces(slot)
+        if mode_code == MODE_EXPRESSION:
+            return compile_expression(self.dice_name(index)).from_faces(faces, timestamp=timestamp)
+        return RollResult.from_faces(DICE_NAMES[self.dice[slot]], MODE_NAMES[mode_code], self.modifier[slot],
+                                     faces, reroll=mode_code == MODE_REROLL, timestamp=timestamp,
+                                     summed_format=self.summed_format)
+
+    def display(self, index):
+        """Linha formatada como no histórico: "[HH:MM:SS] texto" """
+        result = self.result(index)
+        return f"[{result.time_text}] {result.display}"
+
+    def recent(self, start=0, stop=None):
+        """Índices do mais recente para o mais antigo, a partir de `start` posições atrás"""
+        stop = self.count if stop is None else min(stop, self.count)
+        return range(self.count - 1 - start, self.count - 1 - stop, -1)
+
+    def matcher(self, dice=None, mode=None):
+        """
+        Função índice -> bool que diz se a linha tem o dado e o código de modo
+        pedidos. `dice="expressão"` seleciona as expressões. Só lê as colunas
+        numéricas; nenhum texto é montado.
+        """
+        if dice is None:
+            dice_ok = None
+        elif dice == "expressão":
+            first_expression = len(DICE_NAMES)
+            dice_ok = lambda code: code >= first_expression
+        else:
+            wanted = DICE_CODES[dice]
+            dice_ok = lambda code: code == wanted
+
+        def matches(index):
+            slot = (self.head + index) % self.capacity
+            if mode is not None and self.mode[slot] != mode:
+                return False
+            return dice_ok is None or dice_ok(self.dice[slot])
+        return matches
+
+    def filter(self, dice=None, mode=None):
+        """Índices (do mais recente para o mais antigo) das linhas aceitas por matcher(dice, mode)"""
+        matches = self.matcher(dice, mode)
+        return [index for index in self.recent() if matches(index)]
@@ -0,0 +1,149 @@
+import json
+import mmap
+import os
+import time
+
+from dice_engine import RollResult
+from dice_expr import ExpressionResult, compile_expression
+
+DEFAULT_LOG_PATH = "roll_log.jsonl"
+FSYNC_EVERY = 20  # rolagens entre dois fsync
+FSYNC_INTERVAL = 2.0  # segundos máximos sem fsync
+MAX_BYTES = 1_000_000  # tamanho que dispara a rotação
+BACKUPS = 5  # arquivos rotacionados mantidos (roll_log.jsonl.1 ... .5)
+
+
+def result_to_record(result):
+    if isinstance(result, ExpressionResult):
+        record = {"t": round(result.timestamp, 3), "e": result.plan.expression, "f": result.faces()}
+    else:
+        record = {"t": round(result.timestamp, 3), "d": result.dice, "m": result.mode,
+                  "mod": result.modifier, "f": result.faces()}
+        if result.reroll:
+            record["r"] = 1
+    return record
+
+
+def result_from_record(record):
+    """Recria o RollResult/ExpressionResult a partir das faces gravadas"""
+    if "e" in record:
+        return compile_expression(record["e"]).from_faces(record["f"], timestamp=record["t"])
+    return RollResult.from_faces(record["d"], record["m"], record["mod"], record["f"],
+                                 reroll=bool(record.get("r")), timestamp=record["t"])
+
+
+def encode_result(result):
+    """Uma linha JSON compacta por rolagem"""
+    return json.dumps(result_to_record(result), separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def decode_result(line):
+    return result_from_record(json.loads(line))
+
+
+def _tail_lines(path, count):
+    """Últimas `count` linhas do arquivo, lidas de trás para frente via mmap"""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return []
+    with f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            lines = []
+            end = size
+            if mm[end - 1:end] == b"\n":
+                end -= 1
+            while len(lines) < count and end > 0:
+                start = mm.rfind(b"\n", 0, end) + 1
+                lines.append(mm[start:end])
+                end = start - 1
+    lines.reverse()
+    return lines
+
+
+class RollLog:
+    """
+    Log de rolagens só de acréscimo, uma linha por rolagem.
+
+    O fsync é feito em lote (a cada FSYNC_EVERY rolagens ou FSYNC_INTERVAL
+    segundos) e o arquivo é rotacionado ao passar de MAX_BYTES.
+    """
+
+    def __init__(self, path=DEFAULT_LOG_PATH, fsync_every=FSYNC_EVERY, fsync_interval=FSYNC_INTERVAL,
+                 max_bytes=MAX_BYTES, backups=BACKUPS):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.pending = 0
+        self.last_sync = time.monotonic()
+        self.file = open(path, "ab")
+        self._end_partial_line()
+
+    def _end_partial_line(self):
+        # Uma queda pode deixar a última linha sem "\n"; fecha ela antes de continuar
+        if self.file.tell():
+            with open(self.path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self.file.write(b"\n")
+
+    def append(self, result):
+        self.file.write(encode_result(result))
+        self.pending += 1
+        if self.pending >= self.fsync_every or time.monotonic() - self.last_sync >= self.fsync_interval:
+            self.sync()
+        if self.file.tell() >= self.max_bytes:
+            self.rotate()
+
+    def sync(self):
+        """Grava o buffer no disco (flush + fsync) se houver rolagens pendentes"""
+        if self.pending:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.pending = 0
+        self.last_sync = time.monotonic()
+
+    def rotate(self):
+        self.sync()
+        self.file.close()
+        for i in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{i}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{i + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self.file = open(self.path, "ab")
+
+    def close(self):
+        if not self.file.closed:
+            self.sync()
+            self.file.close()
+
+    def tail(self, count):
+        """
+        Últimas `count` rolagens (da mais antiga para a mais recente), incluindo
+        os arquivos rotacionados se o atual não tiver o suficiente. Só o final
+        de cada arquivo é lido.
+        """
+        if not self.file.closed:
+            self.file.flush()
+        paths = [self.path] + [f"{self.path}.{i}" for i in range(1, self.backups + 1)]
+        lines = []
+        for path in paths:
+            if len(lines) >= count:
+                break
+            lines = _tail_lines(path, count - len(lines)) + lines
+        results = []
+        for line in lines:
+            try:
+                results.append(decode_result(line))
+            except (ValueError, KeyError):
+                continue  # linha cortada por uma queda no meio da escrita
+        return results
@@ -0,0 +1,100 @@
+import math
+from array import array
+
+from dice_engine import DICE_FACES, FACE_SCALE, RollResult
+
+
+class RunningStats:
+    """Agregados de um (dado, modo), atualizados em O(1) por dado (Welford)"""
+
+    __slots__ = ("count", "mean", "m2", "min", "max", "histogram", "scale", "crits", "fumbles")
+
+    def __init__(self, faces, scale=1):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self.histogram = array("q", [0]) * faces
+        self.scale = scale
+        self.crits = 0
+        self.fumbles = 0
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        self.histogram[value // self.scale - 1] += 1
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.variance)
+
+    @property
+    def crit_rate(self):
+        return self.crits / self.count if self.count else 0.0
+
+    @property
+    def fumble_rate(self):
+        return self.fumbles / self.count if self.count else 0.0
+
+
+class RollStats:
+    """
+    Estatísticas ao vivo por tipo de dado e modo, alimentadas a cada rolagem
+    sem reler o histórico. Rerolagens contam como desvantagem; expressões
+    não entram.
+    """
+
+    def __init__(self):
+        self.stats = {}
+
+    def get(self, dice, mode):
+        key = (dice, mode)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = RunningStats(DICE_FACES[dice], FACE_SCALE[dice])
+        return stats
+
+    def add(self, result):
+        if not isinstance(result, RollResult):
+            return
+        stats = self.get(result.dice, result.mode)
+        is_d20 = result.dice == "d20"
+        for value in result.kept:
+            value = int(value)
+            stats.add(value)
+            if is_d20:
+                if value == 20:
+                    stats.crits += 1
+                elif value == 1:
+                    stats.fumbles += 1
+
+    def reset(self):
+        self.stats.clear()
+
+    def summary(self, dice, mode):
+        """Texto curto para o painel da aba de dados"""
+        stats = self.stats.get((dice, mode))
+        if not stats or not stats.count:
+            return f"{dice} {mode}: nenhum dado rolado ainda"
+        text = (f"{dice} {mode}: {stats.count} dados | média {stats.mean:.2f} | "
+                f"desvio {stats.stddev:.2f} | mín {stats.min} | máx {stats.max}")
+        if dice == "d20":
+            text += f" | crítico {stats.crit_rate * 100:.1f}% | falha {stats.fumble_rate * 100:.1f}%"
+        return text
+
+    def histogram_text(self, dice, mode):
+        stats = self.stats.get((dice, mode))
+        if not stats or not stats.count or len(stats.histogram) > 20:
+            return ""
+        return "  ".join(f"{(face + 1) * stats.scale}:{n}" for face, n in enumerate(stats.histogram))
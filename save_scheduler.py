@@ -0,0 +1,39 @@
+SAVE_IDLE_MS = 400  # espera sem edições antes de gravar
+SAVE_MAX_DELAY_MS = 2000  # nunca segura uma edição por mais que isso
+
+
+class SaveScheduler:
+    """
+    Junta rajadas de edições em uma única gravação.
+
+    Cada edição marca um sistema como sujo e reinicia a espera; a gravação
+    acontece depois de SAVE_IDLE_MS sem edições (ou SAVE_MAX_DELAY_MS desde a
+    primeira edição pendente, para não segurar um spinbox pressionado para
+    sempre). `flush` grava na hora e deve ser chamado ao sair.
+    """
+
+    def __init__(self, root, write, idle_ms=SAVE_IDLE_MS, max_delay_ms=SAVE_MAX_DELAY_MS):
+        self.root = root
+        self.write = write
+        self.idle_ms = idle_ms
+        self.max_delay_ms = max_delay_ms
+        self.dirty = set()
+        self.idle_job = None
+        self.deadline_job = None
+
+    def mark_dirty(self, system):
+        self.dirty.add(system)
+        if self.idle_job is not None:
+            self.root.after_cancel(self.idle_job)
+        self.idle_job = self.root.after(self.idle_ms, self.flush)
+        if self.deadline_job is None:
+            self.deadline_job = self.root.after(self.max_delay_ms, self.flush)
+
+    def flush(self):
+        for job in (self.idle_job, self.deadline_job):
+            if job is not None:
+                self.root.after_cancel(job)
+        self.idle_job = self.deadline_job = None
+        if self.dirty:
+            dirty, self.dirty = self.dirty, set()
+            self.write(dirty)
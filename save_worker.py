@@ -0,0 +1,98 @@
+import queue
+import threading
+
+_STOP = object()
+_EDIT = "edit"
+_SNAPSHOT = "snapshot"
+
+
+class SaveWorker:
+    """
+    Grava as fichas em uma thread dedicada, alimentada por uma fila.
+
+    Recebe dois tipos de trabalho para o `store`: edições de campo já
+    serializadas (`submit_edit`, acrescentadas ao diário em lote, com um só
+    fsync) e compactações (`submit`, com as fichas alteradas desde a anterior).
+    Compactações são aplicadas em ordem e cada uma zera o diário, então só as
+    edições enfileiradas depois da última vão para o diário. Isso vale para
+    stores com `compacts_edits`; nos outros (SQLite) a compactação não grava
+    nada e todas as edições do lote vão para `append`.
+
+    Erros não abrem messagebox aqui: vão para `errors` e a interface os busca
+    com `poll_errors` (via root.after). Com `sync=True` grava na própria
+    thread chamadora, o comportamento antigo, útil para comparar.
+    """
+
+    def __init__(self, store, sync=False):
+        self.store = store
+        self.sync = sync
+        self.queue = queue.Queue()
+        self.errors = queue.Queue()
+        self.thread = None
+        if not sync:
+            self.thread = threading.Thread(target=self._run, name="save-worker", daemon=True)
+            self.thread.start()
+
+    def submit(self, data):
+        self._put((_SNAPSHOT, data))
+
+    def submit_edit(self, line):
+        self._put((_EDIT, line))
+
+    def _put(self, job):
+        if self.sync:
+            self._process([job])
+        else:
+            self.queue.put(job)
+
+    def _process(self, jobs):
+        try:
+            if self.store.compacts_edits:
+                snapshots = [i for i, (kind, _) in enumerate(jobs) if kind == _SNAPSHOT]
+                if snapshots:
+                    # Cada compactação traz só as fichas alteradas desde a anterior
+                    for kind, changes in jobs[:snapshots[-1] + 1]:
+                        if kind == _SNAPSHOT:
+                            self.store.compact(changes)
+                    jobs = jobs[snapshots[-1] + 1:]
+            edits = [line for kind, line in jobs if kind == _EDIT]
+            if edits:
+                self.store.append(edits)
+            for kind, changes in jobs:
+                if kind == _SNAPSHOT:
+                    self.store.compact(changes)  # só sobra snapshot se o store não compacta as edições
+        except Exception as e:
+            self.errors.put(e)
+
+    def _run(self):
+        while True:
+            jobs = [self.queue.get()]
+            # Junta o que chegou enquanto a última gravação acontecia
+            while True:
+                try:
+                    jobs.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = _STOP in jobs
+            jobs = [job for job in jobs if job is not _STOP]
+            if jobs:
+                self._process(jobs)
+            if stop:
+                self.store.close()
+                return
+
+    def poll_errors(self):
+        errors = []
+        while True:
+            try:
+                errors.append(self.errors.get_nowait())
+            except queue.Empty:
+                return errors
+
+    def close(self, timeout=5.0):
+        """Grava o que estiver pendente e encerra a thread"""
+        if self.thread is not None and self.thread.is_alive():
+            self.queue.put(_STOP)
+            self.thread.join(timeout)
+        elif self.sync:
+            self.store.close()
@@ -0,0 +1,221 @@
+SMT_ATTRIBUTES = ["Força", "Vitalidade", "Magia", "Agilidade", "Sorte"]
+SMT_LISTS = [("Skills", "primary", "skills"), ("Habilidades Passivas", "info", "passives"),
+             ("Inventário", "success", "inventory"), ("Itens Chave", "warning", "key_items")]
+
+
+class Spin:
+    """Spinbox inteiro ligado a `path` na ficha, ex.: ("attributes", "Força")"""
+
+    def __init__(self, label, path, from_, to, default, width=4, suffix=None):
+        self.label = label
+        self.path = path
+        self.from_ = from_
+        self.to = to
+        self.default = default
+        self.width = width
+        self.suffix = suffix
+
+
+class Numbers:
+    """Spinboxes; `rows` é uma lista de linhas, cada uma com um ou mais Spin"""
+
+    kind = "numbers"
+
+    def __init__(self, title, style, rows):
+        self.title = title
+        self.style = style
+        self.rows = rows
+
+    def defaults(self):
+        for row in self.rows:
+            for spin in row:
+                yield spin.path, spin.default
+
+
+class Checks:
+    kind = "checks"
+
+    def __init__(self, title, style, key, options):
+        self.title = title
+        self.style = style
+        self.key = key
+        self.options = options
+
+    def defaults(self):
+        for option in self.options:
+            yield (self.key, option), False
+
+
+class Choice:
+    """Radiobuttons; `options` é uma lista de (valor, texto)"""
+
+    kind = "choice"
+
+    def __init__(self, title, style, key, options):
+        self.title = title
+        self.style = style
+        self.key = key
+        self.options = options
+
+    def defaults(self):
+        yield (self.key,), self.options[0][0]
+
+
+class Equipped:
+    """Lista com uma opção equipada (magatamas, essências, personas)"""
+
+    kind = "equipped"
+
+    def __init__(self, title, style, key, equipped_key):
+        self.title = title
+        self.style = style
+        self.key = key
+        self.equipped_key = equipped_key
+
+    def defaults(self):
+        yield (self.key,), []
+        yield (self.equipped_key,), ""
+
+
+class ItemList:
+    kind = "list"
+
+    def __init__(self, title, style, key):
+        self.title = title
+        self.style = style
+        self.key = key
+
+    def defaults(self):
+        yield (self.key,), []
+
+
+class Notes:
+    kind = "notes"
+
+    def __init__(self, title, style, key):
+        self.title = title
+        self.style = style
+        self.key = key
+
+    def defaults(self):
+        yield (self.key,), ""
+
+
+class SheetSchema:
+    """
+    Ficha declarativa de um sistema: lista de seções que o SheetView
+    (sheet_view.py) transforma em widgets, carga e gravação. Os valores
+    padrão de uma ficha nova também saem daqui.
+    """
+
+    def __init__(self, system, title, sections):
+        self.system = system
+        self.title = title
+        self.sections = sections
+
+    def new_sheet(self):
+        sheet = {}
+        for section in self.sections:
+            for path, value in section.defaults():
+                set_path(sheet, path, value)
+        return sheet
+
+
+def get_path(sheet, path, default=None):
+    node = sheet
+    for key in path:
+        if not isinstance(node, dict) or key not in node:
+            return default
+        node = node[key]
+    return node
+
+
+def set_path(sheet, path, value):
+    node = sheet
+    for key in path[:-1]:
+        node = node.setdefault(key, {})
+    node[path[-1]] = value
+
+
+def _smt_schema(system, title, equipped=None, equipped_position=0):
+    sections = [
+        Numbers("PV / PM", "danger", [[
+            Spin("PV:", ("pv",), 0, 999, 100, width=6),
+            Spin("PM:", ("pm",), 0, 999, 50, width=6),
+            Spin("Level:", ("level",), 1, 99, 1),
+        ]]),
+        Numbers("Atributos", "info", [[Spin(f"{name}:", ("attributes", name), 1, 99, 10) for name in SMT_ATTRIBUTES]]),
+    ]
+    if equipped:
+        sections.insert(equipped_position, equipped)
+    sections += [ItemList(list_title, style, key) for list_title, style, key in SMT_LISTS]
+    return SheetSchema(system, title, sections)
+
+
+CYBERPUNK_ATTRIBUTES = [
+    ("Força", "forca", 5, -2),
+    ("Destreza", "dex", 22, 6),
+    ("Constituição", "con", 9, 1),
+    ("Sabedoria", "sab", 10, 1),
+    ("Inteligência", "int", 11, 2),
+    ("Tecnologia", "tech", 10, 1),
+    ("Carisma", "car", 4, -3)
+]
+
+WARHAMMER_ATTRIBUTES = [
+    ("Movimento", "mov", 4),
+    ("Habilidade com Arma", "hab_arma", 30),
+    ("Precisão de Tiro", "prec_tiro", 30),
+    ("Força", "forca", 3),
+    ("Resiliência", "res", 3),
+    ("Ferimentos", "fer", 1),
+    ("Iniciativa", "ini", 30),
+    ("Ataques", "ataq", 1),
+    ("Liderança", "lid", 6)
+]
+
+WARHAMMER_SKILLS = ["Lógica", "Carisma", "Conhecimento", "Medicina", "Pilotagem", "Explosivos", "Intimidar",
+                    "Procurar", "Tecnologia"]
+
+WARHAMMER_ARMORS = [("Couro", 1), ("Couro Reforçado", 2), ("Cota de Malha", 3), ("Placas", 4)]
+
+SCHEMAS = {
+    "demi": _smt_schema("demi", "Demi-fiend",
+                        Equipped("Magatamas", "warning", "magatamas", "magatama_equipped")),
+    "nahobino": _smt_schema("nahobino", "Nahobino",
+                            Equipped("Essências", "warning", "essences", "essence_equipped"), equipped_position=2),
+    "samurai": _smt_schema("samurai", "Samurai"),
+    "persona_user": _smt_schema("persona_user", "Persona-User",
+                                Equipped("Personas", "warning", "personas", "persona_equipped")),
+    "cyberpunk": SheetSchema("cyberpunk", "Cyberpunk", [
+        Numbers("Atributos", "info", [
+            [Spin(f"{name}:", ("attributes", key), 1, 30, value, width=5),
+             Spin("(", ("modifiers", key), -10, 10, mod, width=3, suffix=")")]
+            for name, key, value, mod in CYBERPUNK_ATTRIBUTES
+        ]),
+        Numbers("Vida / Humanidade / Dinheiro", "danger", [[
+            Spin("Vida Atual:", ("life",), 0, 100, 50, width=5),
+            Spin("Vida Máxima:", ("max_life",), 1, 100, 50, width=5),
+            Spin("Humanidade:", ("humanity",), 0, 100, 100, width=5),
+            Spin("Dinheiro:", ("money",), 0, 100000, 1000, width=8),
+            Spin("Level:", ("level",), 1, 99, 1),
+        ]]),
+        ItemList("Próteses e Implantes", "warning", "cyberware"),
+        ItemList("Inventário", "primary", "inventory"),
+    ]),
+    "warhammer": SheetSchema("warhammer", "Warhammer", [
+        Numbers("Atributos", "info", [[Spin(f"{name}:", ("attributes", key), 1, 100, value, width=5)]
+                                      for name, key, value in WARHAMMER_ATTRIBUTES]),
+        Numbers("Vida do Personagem", "danger", [[
+            Spin("Vida Atual:", ("current_life",), 0, 100, 10, width=5),
+            Spin("Vida Máxima:", ("max_life",), 1, 100, 10, width=5),
+            Spin("Level:", ("level",), 1, 99, 1),
+        ]]),
+        Checks("Perícias (Marque até 4)", "primary", "skills", WARHAMMER_SKILLS),
+        Choice("Armaduras", "warning", "armor",
+               [(armor, f"{armor} (Proteção: {value})") for armor, value in WARHAMMER_ARMORS]),
+        ItemList("Armas", "danger", "weapons"),
+        ItemList("Equipamentos", "success", "equipment"),
+        Notes("Observações", "secondary", "notes"),
+    ]),
+}
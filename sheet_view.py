@@ -0,0 +1,391 @@
+import difflib
+import tkinter as tk
+from tkinter import ttk
+
+import ttkbootstrap as tb
+
+from sheet_schema import get_path, set_path
+
+
+class ScrollableFrame(ttk.Frame):
+    """
+    Frame com barra de rolagem. O scrollregion é recalculado no máximo uma
+    vez por ciclo ocioso, não a cada <Configure> de widget empacotado.
+
+    Com `virtual=True` as seções adicionadas por `add_section` só têm
+    widgets enquanto estão na tela (ou a uma altura de tela de distância);
+    fora disso ficam como um frame vazio com a altura que tinham.
+    """
+
+    def __init__(self, container, *args, virtual=False, **kwargs):
+        super().__init__(container, *args, **kwargs)
+        self.canvas = canvas = tk.Canvas(self)
+        self.scrollbar = scrollbar = ttk.Scrollbar(self, orient="vertical", command=canvas.yview)
+        self.scrollable_frame = ttk.Frame(canvas)
+        self.virtual = virtual
+        self.sections = []  # [slot, build, unbuild, realizado]
+        self.update_pending = None
+        self.scrollable_frame.bind("<Configure>", self.schedule_update)
+        canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=self.on_scroll)
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        if virtual:
+            canvas.bind("<Configure>", self.schedule_update)
+
+    def on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if self.virtual:
+            self.schedule_update()
+
+    def schedule_update(self, event=None):
+        if self.update_pending is None:
+            self.update_pending = self.after_idle(self.update_region)
+
+    def update_region(self):
+        self.update_pending = None
+        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        if self.virtual:
+            self.realize_visible()
+
+    def add_section(self, build, unbuild=None, height=120, **pack_options):
+        """
+        `build(slot)` monta a seção dentro de `slot`; no modo virtual
+        `unbuild()` é chamado antes dos widgets dela serem destruídos.
+        """
+        slot = ttk.Frame(self.scrollable_frame, height=height)
+        slot.pack(**pack_options)
+        entry = [slot, build, unbuild, False]
+        self.sections.append(entry)
+        if not self.virtual:
+            self.realize(entry)
+        return slot
+
+    def realize(self, entry):
+        slot, build, unbuild, realized = entry
+        if not realized:
+            build(slot)
+            entry[3] = True
+
+    def unrealize(self, entry):
+        slot, build, unbuild, realized = entry
+        if realized:
+            height = slot.winfo_height()
+            if unbuild:
+                unbuild()
+            for child in slot.winfo_children():
+                child.destroy()
+            slot.configure(height=height)
+            entry[3] = False
+
+    def realize_visible(self):
+        view = self.canvas.winfo_height()
+        top = self.canvas.canvasy(0) - view
+        bottom = self.canvas.canvasy(0) + 2 * view
+        for entry in self.sections:
+            slot = entry[0]
+            y = slot.winfo_y()
+            if y + slot.winfo_height() >= top and y <= bottom:
+                self.realize(entry)
+            else:
+                self.unrealize(entry)
+
+
+def refresh_listbox(listbox, shown, items):
+    """
+    Leva o Listbox de `shown` (o que ele mostra hoje) para `items` aplicando
+    só a diferença, em blocos: um delete/insert por trecho alterado em vez de
+    um insert por item. Os trechos são aplicados de trás para frente para os
+    índices dos anteriores continuarem válidos.
+    """
+    if shown == items:
+        return
+    if not shown or not items:
+        listbox.delete(0, tk.END)
+        listbox.insert(tk.END, *items)
+        return
+    opcodes = difflib.SequenceMatcher(None, shown, items, autojunk=False).get_opcodes()
+    for tag, i1, i2, j1, j2 in reversed(opcodes):
+        if tag == "equal":
+            continue
+        if i2 > i1:
+            listbox.delete(i1, i2 - 1)
+        if j2 > j1:
+            listbox.insert(i1, *items[j1:j2])
+
+
+class SheetView:
+    """
+    Aba de um sistema montada a partir do SheetSchema (sheet_schema.py).
+
+    O conjunto de widgets é criado uma vez e reaproveitado por todas as
+    fichas do sistema: trocar de ficha só recarrega os valores. Cada edição
+    grava só o campo alterado: `save(name, *path)` e `rename(old, new)` são
+    os registros do DiceRollerApp, e `sheets()` devolve o dict nome -> ficha.
+    Com um LoopMonitor em `monitor`, carregar e gerenciar fichas é medido.
+    """
+
+    def __init__(self, parent, schema, sheets, save, rename, virtual=False, monitor=None):
+        self.schema = schema
+        if monitor is not None:
+            monitor.instrument(self, ("load", "new_character", "rename_character", "delete_character"),
+                               prefix=schema.system)
+        self.sheets = sheets
+        self.save = save
+        self.rename_sheet = rename
+        self.loaders = {}  # seção -> como copiar a ficha para os widgets dela (só seções montadas)
+        self.ready = False
+
+        frame = ScrollableFrame(parent, virtual=virtual)
+        frame.pack(fill=tk.BOTH, expand=True)
+        self._build_header(frame.scrollable_frame)
+        for section in schema.sections:
+            if section.kind in ("list", "notes"):
+                pack_options = dict(fill=tk.BOTH, expand=True, pady=5)
+            else:
+                pack_options = dict(fill=tk.X, pady=5)
+            frame.add_section(lambda slot, s=section: self._build_section(slot, s),
+                              lambda s=section: self.loaders.pop(s, None), **pack_options)
+        self.refresh_names()
+        self.ready = True
+
+    def _build_section(self, slot, section):
+        box = tb.Labelframe(slot, text=section.title, bootstyle=section.style)
+        box.pack(fill=tk.BOTH, expand=True)
+        self.loaders[section] = []
+        getattr(self, f"_build_{section.kind}")(box, section)
+        if self.ready:  # seção montada depois (modo virtual): mostra a ficha atual
+            sheet = self.current_or_default()
+            for load in self.loaders[section]:
+                load(sheet)
+
+    @property
+    def name(self):
+        return self.chars_var.get()
+
+    def current(self):
+        sheets = self.sheets()
+        return sheets[self.name] if self.name in sheets else None
+
+    def current_or_default(self):
+        sheet = self.current()
+        return self.schema.new_sheet() if sheet is None else sheet
+
+    def _edit(self, path, value):
+        sheet = self.current()
+        if sheet is not None:
+            set_path(sheet, path, value)
+            self.save(self.name, *path)
+
+    def _edit_number(self, path, var):
+        """Spinbox: setas, Enter ou saída do campo; texto inválido ou valor igual não grava"""
+        try:
+            value = var.get()
+        except tk.TclError:
+            return
+        sheet = self.current()
+        if sheet is not None and get_path(sheet, path, None) != value:
+            self._edit(path, value)
+
+    # --- Montagem ---
+    def _build_header(self, parent):
+        chars_frame = tb.Labelframe(parent, text="Gerenciamento de Fichas", bootstyle="info")
+        chars_frame.pack(fill=tk.X, pady=5)
+        controls = tb.Frame(chars_frame)
+        controls.pack(fill=tk.X, pady=5)
+        tb.Label(controls, text="Ficha atual:").pack(side=tk.LEFT)
+        self.chars_var = tk.StringVar()
+        self.chars_combo = ttk.Combobox(controls, textvariable=self.chars_var, state="readonly")
+        self.chars_combo.pack(side=tk.LEFT, padx=5)
+        self.chars_combo.bind("<<ComboboxSelected>>", self.load)
+        tb.Button(controls, text="Nova Ficha", command=self.new_character, bootstyle="success-outline").pack(side=tk.LEFT, padx=2)
+        tb.Button(controls, text="Renomear", command=self.rename_character, bootstyle="info-outline").pack(side=tk.LEFT, padx=2)
+        tb.Button(controls, text="Excluir", command=self.delete_character, bootstyle="danger-outline").pack(side=tk.LEFT, padx=2)
+
+    def _build_numbers(self, box, section):
+        for spins in section.rows:
+            row = tb.Frame(box) if len(section.rows) > 1 else box
+            if row is not box:
+                row.pack(fill=tk.X, pady=2)
+            for spin in spins:
+                var = tk.IntVar(value=spin.default)
+                tb.Label(row, text=spin.label).pack(side=tk.LEFT, padx=2)
+                spinbox = tb.Spinbox(row, from_=spin.from_, to=spin.to, textvariable=var, width=spin.width,
+                                     command=lambda p=spin.path, v=var: self._edit_number(p, v))
+                spinbox.pack(side=tk.LEFT, padx=2)
+                # Valor digitado: grava ao confirmar com Enter ou ao sair do campo
+                for sequence in ("<Return>", "<FocusOut>"):
+                    spinbox.bind(sequence, lambda e, p=spin.path, v=var: self._edit_number(p, v))
+                if spin.suffix:
+                    tb.Label(row, text=spin.suffix).pack(side=tk.LEFT)
+                self.loaders[section].append(lambda sheet, p=spin.path, v=var, d=spin.default: v.set(get_path(sheet, p, d)))
+
+    def _build_checks(self, box, section):
+        for option in section.options:
+            var = tk.BooleanVar(value=False)
+            path = (section.key, option)
+            tb.Checkbutton(box, text=option, variable=var, bootstyle="primary-square-toggle",
+                           command=lambda p=path, v=var: self._edit(p, v.get())).pack(anchor="w", pady=2)
+            self.loaders[section].append(lambda sheet, p=path, v=var: v.set(get_path(sheet, p, False)))
+
+    def _build_choice(self, box, section):
+        default = section.options[0][0]
+        var = tk.StringVar(value=default)
+        path = (section.key,)
+        for value, text in section.options:
+            tb.Radiobutton(box, text=text, variable=var, value=value, bootstyle="info-round-toggle",
+                           command=lambda: self._edit(path, var.get())).pack(anchor="w", pady=1)
+        self.loaders[section].append(lambda sheet: var.set(get_path(sheet, path, default)))
+
+    def _build_equipped(self, box, section):
+        tb.Label(box, text="Equipada:").pack(side=tk.LEFT)
+        var = tk.StringVar()
+        combo = ttk.Combobox(box, textvariable=var, state="readonly", width=20)
+        combo.pack(side=tk.LEFT, padx=5)
+        combo.bind("<<ComboboxSelected>>", lambda e: self._edit((section.equipped_key,), var.get()))
+        entry = tb.Entry(box, width=18)
+        entry.pack(side=tk.LEFT, padx=5)
+
+        def add():
+            sheet = self.current()
+            item = entry.get().strip()
+            if sheet is None or not item:
+                return
+            items = sheet.setdefault(section.key, [])
+            if item not in items:
+                items.append(item)
+                combo['values'] = items
+                entry.delete(0, tk.END)
+                self.save(self.name, section.key)
+
+        def remove():
+            sheet = self.current()
+            selected = var.get()
+            if sheet is None or selected not in sheet.get(section.key, []):
+                return
+            items = sheet[section.key]
+            items.remove(selected)
+            combo['values'] = items
+            var.set(items[0] if items else "")
+            sheet[section.equipped_key] = var.get()
+            self.save(self.name, section.key)
+            self.save(self.name, section.equipped_key)
+
+        def load(sheet):
+            combo['values'] = get_path(sheet, (section.key,), [])
+            var.set(get_path(sheet, (section.equipped_key,), ""))
+
+        tb.Button(box, text="Adicionar", bootstyle="success-outline", command=add).pack(side=tk.LEFT, padx=5)
+        tb.Button(box, text="Remover", bootstyle="danger-outline", command=remove).pack(side=tk.LEFT, padx=5)
+        self.loaders[section].append(load)
+
+    def _build_list(self, box, section):
+        listbox = tk.Listbox(box, height=6)
+        listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        controls = tb.Frame(box)
+        controls.pack(side=tk.LEFT, fill=tk.Y, padx=5)
+        entry = tb.Entry(controls, width=18)
+        entry.pack(fill=tk.X, pady=2)
+        shown = []  # cópia do conteúdo do Listbox, para comparar sem ler do Tcl
+
+        def add():
+            sheet = self.current()
+            item = entry.get().strip()
+            if sheet is None or not item:
+                return
+            sheet.setdefault(section.key, []).append(item)
+            listbox.insert(tk.END, item)
+            shown.append(item)
+            entry.delete(0, tk.END)
+            self.save(self.name, section.key)
+
+        def remove():
+            sheet = self.current()
+            selection = listbox.curselection()
+            if sheet is None or not selection:
+                return
+            del sheet[section.key][selection[0]]
+            listbox.delete(selection[0])
+            del shown[selection[0]]
+            self.save(self.name, section.key)
+
+        def load(sheet):
+            items = get_path(sheet, (section.key,), [])
+            refresh_listbox(listbox, shown, items)
+            shown[:] = items
+
+        tb.Button(controls, text="Adicionar", bootstyle="success-outline", command=add).pack(fill=tk.X, pady=2)
+        tb.Button(controls, text="Remover", bootstyle="danger-outline", command=remove).pack(fill=tk.X, pady=2)
+        self.loaders[section].append(load)
+
+    def _build_notes(self, box, section):
+        text = tk.Text(box, height=6)
+        text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        path = (section.key,)
+
+        def load(sheet):
+            text.delete(1.0, tk.END)
+            text.insert(1.0, get_path(sheet, path, ""))
+
+        tb.Button(box, text="Salvar Observações", bootstyle="primary-outline",
+                  command=lambda: self._edit(path, text.get(1.0, tk.END).strip())).pack(pady=5)
+        self.loaders[section].append(load)
+
+    # --- Fichas ---
+    def refresh_names(self, select=None):
+        names = list(self.sheets().keys())
+        self.chars_combo['values'] = names
+        if select in names:
+            self.chars_var.set(select)
+        else:
+            self.chars_var.set(names[0] if names else "")
+        self.load()
+
+    def load(self, event=None):
+        """Copia a ficha atual (ou os valores padrão, se não houver) para os widgets"""
+        sheet = self.current_or_default()
+        for loaders in self.loaders.values():
+            for load in loaders:
+                load(sheet)
+
+    def new_character(self):
+        from tkinter import messagebox, simpledialog  # diálogos só são carregados quando usados
+        name = simpledialog.askstring(f"Nova Ficha {self.schema.title}", "Nome da nova ficha:")
+        if name and name.strip():
+            sheets = self.sheets()
+            if name in sheets:
+                messagebox.showerror("Erro", "Já existe uma ficha com este nome!")
+                return
+            sheets[name] = self.schema.new_sheet()
+            self.save(name)
+            self.refresh_names(select=name)
+            messagebox.showinfo("Sucesso", f"Ficha '{name}' criada e salva!")
+
+    def rename_character(self):
+        from tkinter import messagebox, simpledialog
+        current_name = self.name
+        if not current_name:
+            messagebox.showerror("Erro", "Nenhuma ficha selecionada!")
+            return
+        new_name = simpledialog.askstring("Renomear Ficha", f"Novo nome para '{current_name}':")
+        if new_name and new_name.strip() and new_name != current_name:
+            sheets = self.sheets()
+            if new_name in sheets:
+                messagebox.showerror("Erro", "Já existe uma ficha com este nome!")
+                return
+            sheets[new_name] = sheets.pop(current_name)
+            self.rename_sheet(current_name, new_name)
+            self.refresh_names(select=new_name)
+            messagebox.showinfo("Sucesso", f"Ficha renomeada para '{new_name}'!")
+
+    def delete_character(self):
+        from tkinter import messagebox
+        current_name = self.name
+        if not current_name:
+            messagebox.showerror("Erro", "Nenhuma ficha selecionada!")
+            return
+        if messagebox.askyesno("Confirmar", f"Deseja excluir a ficha '{current_name}'?"):
+            del self.sheets()[current_name]
+            self.save(current_name)
+            self.refresh_names()
+            messagebox.showinfo("Sucesso", f"Ficha '{current_name}' excluída!")
@@ -0,0 +1,277 @@
+import json
+import os
+import sqlite3
+import time
+
+from character_store import SYSTEMS, LazySheets, LazySystems, ShardedCharacterStore
+from roll_log import BACKUPS, DEFAULT_LOG_PATH, FSYNC_EVERY, FSYNC_INTERVAL, decode_result, result_from_record, result_to_record
+
+DEFAULT_DB_PATH = "dados_rpg.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS characters (
+    id INTEGER PRIMARY KEY,
+    system TEXT NOT NULL,
+    name TEXT NOT NULL,
+    UNIQUE (system, name)
+);
+CREATE TABLE IF NOT EXISTS attributes (
+    character_id INTEGER NOT NULL REFERENCES characters (id) ON DELETE CASCADE,
+    section TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (character_id, section, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS list_items (
+    character_id INTEGER NOT NULL REFERENCES characters (id) ON DELETE CASCADE,
+    list TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (character_id, list, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rolls (
+    id INTEGER PRIMARY KEY,
+    t REAL NOT NULL,
+    dice TEXT,
+    mode TEXT,
+    modifier INTEGER,
+    reroll INTEGER NOT NULL DEFAULT 0,
+    expression TEXT,
+    faces TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS rolls_by_dice ON rolls (dice, mode, t);
+CREATE INDEX IF NOT EXISTS rolls_by_time ON rolls (t);
+"""
+
+# Marcadores em `attributes` (section "") para campos que são containers, para
+# que listas e dicts vazios voltem como estavam
+_LIST_MARK = "[]"
+_DICT_MARK = "{}"
+
+
+def connect(path=DEFAULT_DB_PATH, check_same_thread=True):
+    conn = sqlite3.connect(path, check_same_thread=check_same_thread)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class SqliteCharacterStore:
+    """
+    Fichas em SQLite (WAL): uma linha em `characters` por ficha, campos
+    simples e dicts (attributes, modifiers, skills...) em `attributes` com o
+    valor em JSON, e listas (skills, inventory, cyberware...) em `list_items`.
+
+    Mesma interface do ShardedCharacterStore: as edições do diário viram SQL
+    direto na thread de gravação (editar um atributo é um UPDATE de uma
+    linha), então não há nada a compactar. Na primeira abertura as fichas em
+    JSON são importadas.
+    """
+
+    compacts_edits = False  # as edições vão direto para o banco; compact() não grava nada
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self.reader = None  # thread da interface (leitura das fichas abertas)
+        self.writer = None  # thread de gravação
+
+    def load(self):
+        # close() roda na thread de gravação, por isso o leitor aceita outra thread
+        self.reader = connect(self.path, check_same_thread=False)
+        if self.reader.execute("PRAGMA user_version").fetchone()[0] == 0:
+            self._migrate()
+        return LazySystems(self.load_system)
+
+    def load_system(self, system):
+        rows = self.reader.execute("SELECT name, id FROM characters WHERE system = ?", (system,))
+        return LazySheets(self.read_sheet, rows.fetchall())
+
+    def _migrate(self):
+        """Importa uma vez as fichas em JSON (shards ou o character_data.json antigo)"""
+        json_store = ShardedCharacterStore()
+        with self.reader as conn:
+            if os.path.exists(json_store.directory) or os.path.exists(json_store.legacy_path):
+                data = json_store.load()
+                json_store.close()
+                for system in SYSTEMS:
+                    for name, sheet in data[system].items():
+                        self._put_sheet(conn, system, name, sheet)
+            conn.execute("PRAGMA user_version = 1")
+
+    def read_sheet(self, character_id):
+        sheet = {}
+        rows = self.reader.execute("SELECT section, key, value FROM attributes WHERE character_id = ?",
+                                   (character_id,))
+        for section, key, value in rows:
+            if section:
+                sheet.setdefault(section, {})[key] = json.loads(value)
+            elif value == _LIST_MARK:
+                sheet.setdefault(key, [])
+            elif value == _DICT_MARK:
+                sheet.setdefault(key, {})
+            else:
+                sheet[key] = json.loads(value)
+        rows = self.reader.execute("SELECT list, value FROM list_items WHERE character_id = ? "
+                                   "ORDER BY list, position", (character_id,))
+        for list_name, value in rows:
+            sheet.setdefault(list_name, []).append(value)
+        return sheet
+
+    def _character_id(self, conn, system, name):
+        conn.execute("INSERT OR IGNORE INTO characters (system, name) VALUES (?, ?)", (system, name))
+        return conn.execute("SELECT id FROM characters WHERE system = ? AND name = ?",
+                            (system, name)).fetchone()[0]
+
+    def _set_attribute(self, conn, character_id, section, key, value):
+        cur = conn.execute("UPDATE attributes SET value = ? WHERE character_id = ? AND section = ? AND key = ?",
+                           (value, character_id, section, key))
+        if not cur.rowcount:
+            conn.execute("INSERT INTO attributes (character_id, section, key, value) VALUES (?, ?, ?, ?)",
+                         (character_id, section, key, value))
+
+    def _delete_field(self, conn, character_id, field):
+        conn.execute("DELETE FROM attributes WHERE character_id = ? AND (section = ? OR (section = '' AND key = ?))",
+                     (character_id, field, field))
+        conn.execute("DELETE FROM list_items WHERE character_id = ? AND list = ?", (character_id, field))
+
+    def _put_field(self, conn, character_id, field, value):
+        if isinstance(value, list):
+            self._delete_field(conn, character_id, field)
+            self._set_attribute(conn, character_id, "", field, _LIST_MARK)
+            conn.executemany("INSERT INTO list_items (character_id, list, position, value) VALUES (?, ?, ?, ?)",
+                             [(character_id, field, i, item) for i, item in enumerate(value)])
+        elif isinstance(value, dict):
+            self._delete_field(conn, character_id, field)
+            self._set_attribute(conn, character_id, "", field, _DICT_MARK)
+            conn.executemany("INSERT INTO attributes (character_id, section, key, value) VALUES (?, ?, ?, ?)",
+                             [(character_id, field, key, json.dumps(v)) for key, v in value.items()])
+        else:
+            self._set_attribute(conn, character_id, "", field, json.dumps(value))
+
+    def _put_sheet(self, conn, system, name, sheet):
+        character_id = self._character_id(conn, system, name)
+        conn.execute("DELETE FROM attributes WHERE character_id = ?", (character_id,))
+        conn.execute("DELETE FROM list_items WHERE character_id = ?", (character_id,))
+        for field, value in sheet.items():
+            self._put_field(conn, character_id, field, value)
+
+    def _apply(self, conn, record):
+        system, name, *fields = record["p"]
+        if "m" in record:
+            conn.execute("DELETE FROM characters WHERE system = ? AND name = ?", (system, record["m"]))
+            conn.execute("UPDATE characters SET name = ? WHERE system = ? AND name = ?", (record["m"], system, name))
+        elif not fields:
+            if record.get("d"):
+                conn.execute("DELETE FROM characters WHERE system = ? AND name = ?", (system, name))
+            else:
+                self._put_sheet(conn, system, name, record["v"])
+        else:
+            character_id = self._character_id(conn, system, name)
+            if len(fields) == 1:
+                if record.get("d"):
+                    self._delete_field(conn, character_id, fields[0])
+                else:
+                    self._put_field(conn, character_id, fields[0], record["v"])
+            elif record.get("d"):
+                conn.execute("DELETE FROM attributes WHERE character_id = ? AND section = ? AND key = ?",
+                             (character_id, fields[0], fields[1]))
+            else:
+                self._set_attribute(conn, character_id, fields[0], fields[1], json.dumps(record["v"]))
+
+    def append(self, lines):
+        """Aplica as edições do lote numa única transação"""
+        if self.writer is None:
+            self.writer = connect(self.path)
+        with self.writer as conn:
+            for line in lines:
+                self._apply(conn, json.loads(line))
+
+    def compact(self, changes):
+        pass  # cada edição já foi gravada em `append`
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+
+
+class SqliteRollLog:
+    """
+    Histórico de rolagens na tabela `rolls` (indexada por dado/modo/tempo),
+    com a mesma interface do RollLog. O commit é feito em lote como o fsync
+    do RollLog; na primeira abertura o roll_log.jsonl (e rotações) é importado.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, commit_every=FSYNC_EVERY, commit_interval=FSYNC_INTERVAL,
+                 legacy_path=DEFAULT_LOG_PATH):
+        self.conn = connect(path)
+        self.commit_every = commit_every
+        self.commit_interval = commit_interval
+        self.pending = 0
+        self.last_sync = time.monotonic()
+        if not self.conn.execute("SELECT 1 FROM rolls LIMIT 1").fetchone():
+            self._import_log(legacy_path)
+
+    def _import_log(self, legacy_path):
+        paths = [f"{legacy_path}.{i}" for i in range(BACKUPS, 0, -1)] + [legacy_path]
+        with self.conn:
+            for path in paths:
+                if not os.path.exists(path):
+                    continue
+                with open(path, "rb") as f:
+                    for line in f:
+                        try:
+                            self._insert(decode_result(line))
+                        except (ValueError, KeyError):
+                            continue
+
+    def _insert(self, result):
+        record = result_to_record(result)
+        self.conn.execute(
+            "INSERT INTO rolls (t, dice, mode, modifier, reroll, expression, faces) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (record["t"], record.get("d"), record.get("m"), record.get("mod"), record.get("r", 0),
+             record.get("e"), json.dumps(record["f"], separators=(",", ":"))))
+
+    def append(self, result):
+        self._insert(result)
+        self.pending += 1
+        if self.pending >= self.commit_every or time.monotonic() - self.last_sync >= self.commit_interval:
+            self.sync()
+
+    def sync(self):
+        if self.pending:
+            self.conn.commit()
+            self.pending = 0
+        self.last_sync = time.monotonic()
+
+    def close(self):
+        self.sync()
+        self.conn.close()
+
+    def tail(self, count, dice=None, mode=None):
+        """Últimas `count` rolagens (da mais antiga para a mais recente), opcionalmente de um dado/modo"""
+        query = "SELECT t, dice, mode, modifier, reroll, expression, faces FROM rolls"
+        conditions, params = [], []
+        if dice is not None:
+            conditions.append("dice = ?")
+            params.append(dice)
+        if mode is not None:
+            conditions.append("mode = ?")
+            params.append(mode)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        rows = self.conn.execute(query + " ORDER BY t DESC, id DESC LIMIT ?", params + [count]).fetchall()
+        results = []
+        for t, dice, mode, modifier, reroll, expression, faces in reversed(rows):
+            record = {"t": t, "f": json.loads(faces)}
+            if expression is not None:
+                record["e"] = expression
+            else:
+                record.update(d=dice, m=mode, mod=modifier, r=reroll)
+            results.append(result_from_record(record))
+        return results
@@ -0,0 +1,93 @@
+import cProfile
+import io
+import os
+import pstats
+import subprocess
+import sys
+import time
+
+PROFILE_TEXT = "startup_profile.txt"
+PROFILE_DUMP = "startup_profile.prof"
+
+# Imports acompanhados no relatório; os opcionais devem aparecer como "não importado"
+WATCHED_IMPORTS = ("tkinter", "ttkbootstrap", "PIL.ImageTk", "tkinter.messagebox", "tkinter.simpledialog",
+                   "numpy", "sqlite3", "sqlite_store", "character_store", "sheet_view")
+
+
+def import_times(module="RollDice"):
+    """
+    Tempo acumulado (ms) de cada import feito por `import module`, medido
+    com `python -X importtime` num interpretador novo (sem cache de módulos).
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        try:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            times.setdefault(name.strip(), int(cumulative) / 1000)
+        except ValueError:
+            continue  # cabeçalho
+    return times
+
+
+class StartupProfiler:
+    """
+    Perfil da inicialização do RollDice.py (--profile-startup): tempo de
+    cada fase (métodos embrulhados com `wrap`, primeiro idle do mainloop)
+    e um cProfile de tudo, gravados em texto e em .prof (pstats/snakeviz).
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases = []  # (nome, segundos)
+        self.marks = {}
+        self.profile = cProfile.Profile()
+
+    def wrap(self, cls, name):
+        """Troca `cls.name` por uma versão que registra o tempo de cada chamada"""
+        original = getattr(cls, name)
+
+        def timed(app, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(app, *args, **kwargs)
+            finally:
+                label = f"{name}({args[-1]})" if args and isinstance(args[-1], str) else name
+                self.phases.append((label, time.perf_counter() - start))
+
+        setattr(cls, name, timed)
+
+    def mark(self, name):
+        self.marks[name] = time.perf_counter()
+
+    def phase_since(self, label, mark):
+        self.phases.append((label, time.perf_counter() - self.marks[mark]))
+
+    def write_report(self, text_path=PROFILE_TEXT, dump_path=PROFILE_DUMP):
+        self.profile.disable()
+        self.profile.dump_stats(dump_path)
+        total = time.perf_counter() - self.start
+
+        lines = ["Fases da inicialização (ms):"]
+        for label, seconds in self.phases:
+            lines.append(f"  {label:<40} {seconds * 1000:9.1f}")
+        lines.append(f"  {'total (até o relatório)':<40} {total * 1000:9.1f}")
+
+        lines += ["", "Imports (ms acumulados, interpretador novo):"]
+        imports = import_times()
+        for name in WATCHED_IMPORTS:
+            if name in imports:
+                lines.append(f"  {name:<40} {imports[name]:9.1f}")
+            else:
+                lines.append(f"  {name:<40} {'não importado':>13}")
+
+        stream = io.StringIO()
+        pstats.Stats(self.profile, stream=stream).sort_stats("cumulative").print_stats(30)
+        lines += ["", f"cProfile (30 maiores tempos acumulados; completo em {dump_path}):", stream.getvalue()]
+
+        with open(text_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+        return text_path
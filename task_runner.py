@@ -0,0 +1,140 @@
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+TASK_POLL_MS = 50
+
+_PROGRESS = "progress"
+_FUTURE = "future"
+
+
+class Task:
+    """
+    Trabalho entregue ao TaskRunner. `cancel` (na interface) descarta o que
+    ainda não começou e ignora o que terminar depois. Funções rodando em
+    thread recebem a própria Task: `cancelled()` para parar cedo e
+    `report(feito, total)` para o progresso.
+    """
+
+    def __init__(self, runner, combine, on_result, on_error, on_progress):
+        self.runner = runner
+        self.combine = combine
+        self.on_result = on_result
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.cancel_event = threading.Event()
+        self.futures = []
+        self.completed = 0
+        self.result = None
+
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        self.cancel_event.set()
+        for future in self.futures:
+            future.cancel()
+        self.runner.active.discard(self)
+
+    def report(self, done, total):
+        self.runner.queue.put((_PROGRESS, self, (done, total)))
+
+
+class TaskRunner:
+    """
+    Executa trabalho pesado fora da thread do Tk, num ThreadPoolExecutor ou
+    ProcessPoolExecutor (criados no primeiro uso), e entrega resultados,
+    erros e progresso de volta por uma fila esvaziada com root.after, como
+    o SaveWorker faz com os erros de gravação. Os callbacks on_* rodam
+    sempre na thread da interface.
+    """
+
+    def __init__(self, root, poll_ms=TASK_POLL_MS, max_threads=None, max_processes=None):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.max_threads = max_threads
+        self.max_processes = max_processes
+        self.queue = queue.Queue()
+        self.threads = None
+        self.processes = None
+        self.active = set()
+        self.poll_job = None
+
+    def executor(self, kind):
+        if kind == "process":
+            if self.processes is None:
+                # spawn: fork de um processo com Tk e threads rodando não é seguro
+                self.processes = ProcessPoolExecutor(max_workers=self.max_processes,
+                                                     mp_context=multiprocessing.get_context("spawn"))
+            return self.processes
+        if self.threads is None:
+            self.threads = ThreadPoolExecutor(max_workers=self.max_threads, thread_name_prefix="task")
+        return self.threads
+
+    def submit(self, func, *args, on_result=None, on_error=None, on_progress=None):
+        """Roda `func(task, *args)` numa thread; o retorno vai para `on_result`"""
+        task = Task(self, lambda _, result: result, on_result, on_error, on_progress)
+        self._start(task, [self.executor("thread").submit(func, task, *args)])
+        return task
+
+    def map_chunks(self, func, chunks, combine, initial=None, kind="thread",
+                   on_result=None, on_error=None, on_progress=None):
+        """
+        Roda `func(*chunk)` para cada chunk (em threads ou processos) e junta
+        os resultados na interface com `combine(acumulado, resultado)`, na
+        ordem em que terminam. O progresso é (chunks prontos, total).
+        """
+        task = Task(self, combine, on_result, on_error, on_progress)
+        task.result = initial
+        executor = self.executor(kind)
+        self._start(task, [executor.submit(func, *chunk) for chunk in chunks])
+        return task
+
+    def _start(self, task, futures):
+        task.futures = futures
+        self.active.add(task)
+        for future in futures:
+            future.add_done_callback(lambda f, t=task: self.queue.put((_FUTURE, t, f)))
+        if self.poll_job is None:
+            self.poll_job = self.root.after(self.poll_ms, self.poll)
+
+    def poll(self):
+        while True:
+            try:
+                kind, task, payload = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if task not in self.active:
+                continue  # cancelada ou já terminou com erro
+            if kind == _PROGRESS:
+                if task.on_progress:
+                    task.on_progress(*payload)
+            else:
+                self._finish_future(task, payload)
+        self.poll_job = self.root.after(self.poll_ms, self.poll) if self.active else None
+
+    def _finish_future(self, task, future):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            task.cancel()
+            if task.on_error:
+                task.on_error(error)
+            return
+        task.result = task.combine(task.result, future.result())
+        task.completed += 1
+        if len(task.futures) > 1 and task.on_progress:
+            task.on_progress(task.completed, len(task.futures))
+        if task.completed == len(task.futures):
+            self.active.discard(task)
+            if task.on_result:
+                task.on_result(task.result)
+
+    def shutdown(self):
+        for task in list(self.active):
+            task.cancel()
+        for executor in (self.threads, self.processes):
+            if executor is not None:
+                executor.shutdown(wait=False)  # o que não começou já foi cancelado acima
@@ -0,0 +1,203 @@
+import json
+import os
+
+from character_store import PendingChanges, ShardedCharacterStore, apply_edit, encode_edit, encode_rename
+
+
+def open_store(tmp_path):
+    store = ShardedCharacterStore(str(tmp_path / "fichas"), str(tmp_path / "character_data.json"))
+    return store, store.load()
+
+
+def journal_bytes(store):
+    with open(store.journal_path, "rb") as f:
+        return f.read()
+
+
+def test_apply_edit_creates_sets_and_deletes():
+    data = {}
+    apply_edit(data, json.loads(encode_edit(["cyberpunk", "V", "attributes", "dex"], 8)))
+    apply_edit(data, json.loads(encode_edit(["cyberpunk", "V", "life"], 40)))
+    assert data == {"cyberpunk": {"V": {"attributes": {"dex": 8}, "life": 40}}}
+    apply_edit(data, json.loads(encode_edit(["cyberpunk", "V", "attributes", "dex"], delete=True)))
+    apply_edit(data, json.loads(encode_rename("cyberpunk", "V", "Johnny")))
+    assert data == {"cyberpunk": {"Johnny": {"attributes": {}, "life": 40}}}
+
+
+def test_journal_replay_ignores_torn_last_line(tmp_path):
+    store, _ = open_store(tmp_path)
+    store.append([encode_edit(["cyberpunk", "V"], {"life": 10}),
+                  encode_edit(["cyberpunk", "V", "life"], 7),
+                  encode_edit(["cyberpunk", "V", "life"], 3)[:-9]])  # queda no meio da gravação
+    store.close()
+
+    store, data = open_store(tmp_path)
+    assert data["cyberpunk"]["V"] == {"life": 7}
+    assert journal_bytes(store) == b""  # compactado nos shards ao carregar
+    store.close()
+
+    store, data = open_store(tmp_path)
+    assert data["cyberpunk"]["V"] == {"life": 7}
+    store.close()
+
+
+def test_edits_after_a_torn_only_journal_survive(tmp_path):
+    store, _ = open_store(tmp_path)
+    store.append([encode_edit(["demi", "Nahobino"], {"level": 1})[:-5]])
+    store.close()
+
+    store, data = open_store(tmp_path)
+    assert "Nahobino" not in data["demi"]
+    store.append([encode_edit(["demi", "Nahobino"], {"level": 2})])
+    store.close()
+
+    store, data = open_store(tmp_path)
+    assert data["demi"]["Nahobino"] == {"level": 2}
+    store.close()
+
+
+def test_compaction_writes_dirty_sheets_and_clears_journal(tmp_path):
+    store, data = open_store(tmp_path)
+    changes = PendingChanges()
+    for line in (encode_edit(["samurai", "Miyamoto"], {"honor": 3}),
+                 encode_edit(["samurai", "Tomoe"], {"honor": 5})):
+        record = json.loads(line)
+        store.append([line])
+        apply_edit(data, record)
+        changes.record(record)
+    store.compact(changes.collect(data))
+    assert journal_bytes(store) == b""
+    shards = store.system_index("samurai")
+    assert sorted(shards) == ["Miyamoto", "Tomoe"]
+    assert store.read_shard(shards["Tomoe"]) == {"honor": 5}
+    store.close()
+
+    store, data = open_store(tmp_path)
+    assert data["samurai"]["Miyamoto"] == {"honor": 3}
+    assert len(os.listdir(store.directory)) == 4  # 2 shards, índice e diário
+    store.close()
+
+
+class Session:
+    """Edita as fichas como a interface: dict em memória, diário e PendingChanges"""
+
+    def __init__(self, tmp_path):
+        self.store, self.data = open_store(tmp_path)
+        self.changes = PendingChanges()
+
+    def journal(self, line):
+        record = json.loads(line)
+        apply_edit(self.data, record)
+        self.changes.record(record)
+        self.store.append([line])
+
+    def put(self, system, name, sheet):
+        self.journal(encode_edit([system, name], sheet))
+
+    def delete(self, system, name):
+        self.journal(encode_edit([system, name], delete=True))
+
+    def rename(self, system, old_name, new_name):
+        self.journal(encode_rename(system, old_name, new_name))
+
+    def compact(self):
+        self.store.compact(self.changes.collect(self.data))
+
+    def close(self):
+        self.store.close()
+
+
+def reopen(tmp_path):
+    store, data = open_store(tmp_path)
+    sheets = {system: dict(data[system].items()) for system in ("demi", "cyberpunk")}
+    shards = sorted(name for name in os.listdir(store.directory) if name.endswith(".json"))
+    store.close()
+    return sheets, shards
+
+
+def saved_session(tmp_path):
+    session = Session(tmp_path)
+    session.put("cyberpunk", "V", {"life": 40})
+    session.put("cyberpunk", "Jackie", {"life": 55})
+    session.compact()
+    return session
+
+
+def test_rename_then_recreate_old_name(tmp_path):
+    for compact in (True, False):  # compactado na sessão ou refeito do diário ao abrir
+        path = tmp_path / str(compact)
+        session = saved_session(path)
+        session.rename("cyberpunk", "V", "Valerie")
+        session.put("cyberpunk", "V", {"life": 1})
+        if compact:
+            session.compact()
+        session.close()
+
+        sheets, shards = reopen(path)
+        assert sheets["cyberpunk"] == {"Valerie": {"life": 40}, "V": {"life": 1}, "Jackie": {"life": 55}}
+        assert len(shards) == 3
+
+
+def test_delete_then_rename_onto_the_deleted_name(tmp_path):
+    for compact in (True, False):
+        path = tmp_path / str(compact)
+        session = saved_session(path)
+        session.delete("cyberpunk", "V")
+        session.rename("cyberpunk", "Jackie", "V")
+        if compact:
+            session.compact()
+        session.close()
+
+        sheets, shards = reopen(path)
+        assert sheets["cyberpunk"] == {"V": {"life": 55}}
+        assert len(shards) == 1  # o shard da ficha excluída foi apagado
+
+
+def test_rename_onto_existing_sheet_replaces_it(tmp_path):
+    session = saved_session(tmp_path)
+    session.rename("cyberpunk", "Jackie", "V")
+    session.compact()
+    session.close()
+
+    sheets, shards = reopen(tmp_path)
+    assert sheets["cyberpunk"] == {"V": {"life": 55}}
+    assert len(shards) == 1
+
+
+def test_migration_from_legacy_single_file(tmp_path):
+    legacy = {"demi": {"Nahobino": {"level": 5, "skills": ["Agi"]}},
+              "cyberpunk": {"V": {"attributes": {"dex": 8}}}}
+    legacy_path = tmp_path / "character_data.json"
+    legacy_path.write_text(json.dumps(legacy))
+    with open(f"{legacy_path}.journal", "wb") as f:  # diário do formato antigo
+        f.write(encode_edit(["cyberpunk", "V", "attributes", "dex"], 9))
+        f.write(encode_edit(["demi", "Nahobino", "level"], 6)[:-4])
+
+    sheets, shards = reopen(tmp_path)
+    assert sheets["demi"] == {"Nahobino": {"level": 5, "skills": ["Agi"]}}
+    assert sheets["cyberpunk"] == {"V": {"attributes": {"dex": 9}}}
+    assert len(shards) == 2
+    assert json.loads(legacy_path.read_text()) == legacy  # arquivo antigo fica intacto
+
+    # Já migrado: editar e reabrir não importa o arquivo antigo de novo
+    session = Session(tmp_path)
+    session.delete("cyberpunk", "V")
+    session.close()
+    sheets, shards = reopen(tmp_path)
+    assert sheets["cyberpunk"] == {}
+    assert len(shards) == 1
+
+
+def test_migration_from_single_json_index(tmp_path):
+    session = saved_session(tmp_path)
+    session.close()
+    store = session.store
+    names = store.system_index("cyberpunk")
+    os.remove(store.index_path)
+    with open(os.path.join(store.directory, "index.json"), "w") as f:
+        json.dump({"cyberpunk": names}, f)
+
+    sheets, _ = reopen(tmp_path)
+    assert sheets["cyberpunk"] == {"V": {"life": 40}, "Jackie": {"life": 55}}
+    assert os.path.exists(store.index_path)
+    assert not os.path.exists(os.path.join(store.directory, "index.json"))
@@ -0,0 +1,60 @@
+import threading
+
+from character_store import encode_edit
+from save_worker import SaveWorker
+from sqlite_store import SqliteCharacterStore
+
+NO_CHANGES = {"renames": [], "sheets": []}
+
+
+class SlowFirstWrite(SqliteCharacterStore):
+    """Segura a primeira gravação até `release`, para as próximas chegarem em um lote só"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def append(self, lines):
+        if not self.started.is_set():
+            self.started.set()
+            self.release.wait(5)
+        super().append(lines)
+
+
+def life(tmp_path):
+    store = SqliteCharacterStore(str(tmp_path / "fichas.sqlite3"))
+    data = store.load()
+    value = data["cyberpunk"]["V"]["life"]
+    store.close()
+    return value
+
+
+def test_sync_edits_then_compaction_reach_sqlite(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # a migração procura fichas em JSON no diretório atual
+    store = SqliteCharacterStore(str(tmp_path / "fichas.sqlite3"))
+    store.load()
+    worker = SaveWorker(store, sync=True)
+    worker.submit_edit(encode_edit(["cyberpunk", "V"], {"life": 10}))
+    worker.submit_edit(encode_edit(["cyberpunk", "V", "life"], 7))
+    worker.submit(NO_CHANGES)
+    worker.close()
+    assert worker.poll_errors() == []
+    assert store.reader is None and store.writer is None
+    assert life(tmp_path) == 7
+
+
+def test_edits_batched_with_a_compaction_reach_sqlite(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = SlowFirstWrite(str(tmp_path / "fichas.sqlite3"))
+    store.load()
+    worker = SaveWorker(store)
+    worker.submit_edit(encode_edit(["cyberpunk", "V"], {"life": 10}))
+    assert store.started.wait(5)
+    # Chegam juntas enquanto a primeira gravação está presa: edição e depois compactação
+    worker.submit_edit(encode_edit(["cyberpunk", "V", "life"], 7))
+    worker.submit(NO_CHANGES)
+    store.release.set()
+    worker.close()
+    assert worker.poll_errors() == []
+    assert life(tmp_path) == 7
@@ -0,0 +1,67 @@
+from tkinter import ttk
+
+from ttkbootstrap.style import Bootstyle
+
+# Estilos da aba de dados que mudam com o tema: cada nome fixo aponta, em
+# cada tema, para o bootstyle usado nele (contorno no escuro, sólido no claro)
+THEME_STYLES = {
+    "darkly": {
+        "Success.App.TButton": "success-outline-button",
+        "Info.App.TButton": "info-outline-button",
+        "Danger.App.TButton": "danger-outline-button",
+        "Secondary.App.TButton": "secondary-outline-button",
+        "Dice.App.Toggle": "info-round-toggle",
+    },
+    "flatly": {
+        "Success.App.TButton": "success-button",
+        "Info.App.TButton": "info-button",
+        "Danger.App.TButton": "danger-button",
+        "Secondary.App.TButton": "secondary-button",
+        "Dice.App.Toggle": "dark-round-toggle",
+    },
+}
+
+
+class ThemeCache:
+    """
+    Estilos ttk dos dois temas montados uma vez. Os widgets usam os nomes
+    de THEME_STYLES, definidos em cada tema como cópia (layout, configure e
+    map) do bootstyle daquele tema, então alternar o tema é só um
+    theme_use: nenhum widget precisa ser reconfigurado, em nenhuma aba.
+    """
+
+    def __init__(self, style, styles=THEME_STYLES):
+        self.style = style
+        self.styles = styles
+        self.built = set()
+
+    def build(self, theme):
+        """Define os nomes de THEME_STYLES no tema em uso (que deve ser `theme`)"""
+        for name, bootstyle in self.styles[theme].items():
+            source = Bootstyle.update_ttk_widget_style(None, bootstyle)
+            ttk.Style.layout(self.style, name, ttk.Style.layout(self.style, source))
+            ttk.Style.configure(self.style, name, **(ttk.Style.configure(self.style, source) or {}))
+            mapping = ttk.Style.map(self.style, source)
+            if mapping:
+                ttk.Style.map(self.style, name, **mapping)
+            # registra no ttkbootstrap para ele não tentar reconstruir o nome como bootstyle
+            self.style._register_ttkstyle(name)
+        self.built.add(theme)
+
+    def prebuild(self):
+        """
+        Monta os temas que faltam (e os estilos do ttkbootstrap já usados
+        neles) e volta ao tema atual, tudo antes do próximo redesenho.
+        """
+        current = self.style.theme_use()
+        for theme in self.styles:
+            if theme not in self.built:
+                self.style.theme_use(theme)
+                self.build(theme)
+        if self.style.theme_use() != current:
+            self.style.theme_use(current)
+
+    def use(self, theme):
+        self.style.theme_use(theme)
+        if theme not in self.built:
+            self.build(theme)